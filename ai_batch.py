@@ -0,0 +1,139 @@
+import json
+import threading
+
+# Estimare grosieră: ~4 caractere pe token (suficient pentru bugetare)
+CHARS_PER_TOKEN = 4
+
+# Schema răspunsului: câte un obiect {id, text} pentru fiecare loc primit
+BATCH_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            "text": {"type": "STRING"}
+        },
+        "required": ["id", "text"]
+    }
+}
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def build_batch_prompt(places, words_per_place):
+    """Un singur prompt pentru mai multe locuri; răspunsul e o listă JSON {id, text}."""
+    lines = [
+        "Ești un ghid turistic expert și istoric de artă. Pentru FIECARE locație din lista de mai jos "
+        f"scrie o prezentare stil enciclopedie de maxim {words_per_place} de cuvinte: scurt istoric, "
+        "semnificație culturală sau arhitecturală și, dacă există, o curiozitate locală.",
+        "Dacă o locație este una comercială obișnuită (farmacie, fast-food etc.) și nu are importanță istorică, "
+        "scrie doar o scurtă descriere a utilității ei, fără să inventezi fapte istorice.",
+        "Răspunde în limba română, ca listă JSON cu câte un obiect {\"id\", \"text\"} pentru fiecare locație, "
+        "folosind exact id-ul primit.",
+        "",
+        "Locații:"
+    ]
+    for p in places:
+        lines.append(f"- id: {p['id']} | nume: {p['name']} | adresă: {p.get('address', '')}")
+    return "\n".join(lines)
+
+
+def parse_batch_response(text):
+    """Transformă răspunsul JSON într-un dicționar id -> text (tolerant la ```json ... ```)."""
+    raw = text.strip()
+    if raw.startswith("```"):
+        raw = raw.strip('`')
+        if raw.lower().startswith("json"):
+            raw = raw[4:]
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        data = data.get('items', data.get('places', []))
+    result = {}
+    for item in data:
+        if isinstance(item, dict) and item.get('id') and item.get('text'):
+            result[str(item['id'])] = item['text'].strip()
+    return result
+
+
+class BatchEnricher:
+    """
+    Îmbogățire AI pentru un traseu întreg: mai multe locuri într-o singură cerere Gemini
+    cu ieșire structurată (JSON), apoi răspunsul se împarte înapoi pe locuri.
+    - Mărimea unui lot e limitată de tokenii de ieșire disponibili (tokens_per_place).
+    - Întregul job are un buget total de tokeni (intrare + ieșire estimate);
+      locurile care nu mai încap rămân pentru cererile individuale.
+    - Erorile (lot eșuat, on_result eșuat) ajung la on_error(mesaj); implicit în consolă.
+    """
+    def __init__(self, client, model, tokens_per_place=450, max_output_tokens=8192,
+                 token_budget=60000, temperature=0.4, on_error=None):
+        self.client = client
+        self.model = model
+        self.tokens_per_place = tokens_per_place
+        self.max_output_tokens = max_output_tokens
+        self.token_budget = token_budget
+        self.temperature = temperature
+        self.tokens_used = 0
+        self.on_error = on_error or print
+
+    def batch_size(self):
+        return max(1, self.max_output_tokens // self.tokens_per_place)
+
+    def plan(self, places):
+        """Împarte locurile în loturi care încap în bugetul total; returnează (loturi, rămase)."""
+        size = self.batch_size()
+        words = int(self.tokens_per_place * 0.6)
+        batches = []
+        budget = self.token_budget
+        for i in range(0, len(places), size):
+            chunk = places[i:i + size]
+            cost = estimate_tokens(build_batch_prompt(chunk, words)) + len(chunk) * self.tokens_per_place
+            if cost > budget:
+                return batches, places[i:]
+            budget -= cost
+            batches.append(chunk)
+        return batches, []
+
+    def run(self, places, on_result=None, cancel_event=None):
+        """
+        Rulează toate loturile (blocant, pe thread-ul apelantului).
+        on_result(loc, text) se apelează pentru fiecare loc primit, pe thread-ul apelantului
+        (trebuie să fie sigur între fire, ex: AiResponseCache.put).
+        Returnează (texte_pe_id, locuri_fără_rezultat).
+        """
+        cancel_event = cancel_event or threading.Event()
+        batches, skipped = self.plan(places)
+        words = int(self.tokens_per_place * 0.6)
+        results = {}
+        missing = list(skipped)
+
+        for chunk in batches:
+            if cancel_event.is_set():
+                missing.extend(chunk)
+                continue
+            prompt = build_batch_prompt(chunk, words)
+            max_tokens = min(self.max_output_tokens, len(chunk) * self.tokens_per_place)
+            try:
+                text = self.client.generate(self.model, prompt, self.temperature, max_tokens,
+                                            cancel_event=cancel_event, response_schema=BATCH_SCHEMA)
+                self.tokens_used += estimate_tokens(prompt) + estimate_tokens(text)
+                texts = parse_batch_response(text)
+            except Exception as e:
+                self.on_error(f"Eroare lot AI ({len(chunk)} locuri): {e}")
+                missing.extend(chunk)
+                continue
+
+            for place in chunk:
+                txt = texts.get(str(place['id']))
+                if not txt:
+                    missing.append(place)
+                    continue
+                results[place['id']] = txt
+                if on_result:
+                    try:
+                        on_result(place, txt)
+                    except Exception as e:
+                        self.on_error(f"Eroare la salvarea textului AI pentru '{place.get('name', place['id'])}': {e}")
+
+        return results, missing
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from atomic_io import write_json_atomic, DebouncedSaver
+
+# Limita cache-ului pe disc (textul răspunsurilor, în octeți UTF-8)
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Scrierile pe disc după put() se comasează: una singură, la SAVE_DELAY secunde după prima modificare
+SAVE_DELAY = 2.0
+
+
+def reviews_fingerprint(reviews):
+    """Amprenta unui set de recenzii, independentă de ordinea în care le trimite Google."""
+    items = sorted(
+        f"{r.get('author_name', '')}|{r.get('time', '')}|{r.get('rating', '')}|{r.get('text', '')}"
+        for r in (reviews or [])
+    )
+    return hashlib.sha256("\n".join(items).encode('utf-8')).hexdigest()
+
+
+def make_key(kind, model, template, place, reviews=None, params=None):
+    """
+    Cheia de conținut a unui răspuns AI: hash peste model, șablonul promptului,
+    identitatea locului, setul de recenzii și parametrii de generare.
+    """
+    parts = {
+        'kind': kind,
+        'model': model,
+        'template': hashlib.sha256(str(template).encode('utf-8')).hexdigest(),
+        'place': place,
+        'reviews': reviews_fingerprint(reviews) if reviews is not None else None,
+        'params': params or {},
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class AiResponseCache:
+    """
+    Cache persistent pentru textele generate de Gemini (rezumate, istoric).
+    - Cheile sunt hash-uri de conținut (vezi make_key), deci orice schimbare de model,
+      prompt sau recenzii produce automat o intrare nouă.
+    - Evacuare LRU când dimensiunea totală depășește max_bytes.
+    - put() nu scrie pe disc: salvarea rulează pe un fir de fundal, comasată (save_delay),
+      iar flush() o face imediat (la închiderea aplicației).
+    """
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, save_delay=SAVE_DELAY):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.saver = DebouncedSaver(self._write, save_delay)
+        self.entries = OrderedDict()  # cheie -> {'text', 'kind', 'place', 'created', 'size'}; ultimul = cel mai recent folosit
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for item in data:
+                key = item.pop('key')
+                self.entries[key] = item
+                self.total_bytes += item.get('size', 0)
+            self._evict()
+        except Exception as e:
+            print(f"Eroare încărcare cache AI: {e}")
+
+    def save(self):
+        """Scriere atomică imediată, în ordinea LRU (cele mai vechi primele)."""
+        if self.path:
+            self.saver.save_now()
+
+    def _write(self):
+        with self.lock:
+            data = [dict(entry, key=key) for key, entry in self.entries.items()]
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            print(f"Eroare salvare cache AI: {e}")
+
+    def schedule_save(self):
+        """Programează o salvare în fundal; modificările până atunci intră în aceeași scriere."""
+        if self.path:
+            self.saver.schedule()
+
+    def flush(self):
+        """Scrie imediat modificările programate (la închiderea aplicației)."""
+        self.saver.flush()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, text, kind="", place=""):
+        size = len(text.encode('utf-8'))
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.total_bytes -= old.get('size', 0)
+            self.entries[key] = {'text': text, 'kind': kind, 'place': place,
+                                 'created': time.strftime("%Y-%m-%d %H:%M"), 'size': size}
+            self.total_bytes += size
+            self._evict()
+        self.schedule_save()
+
+    def _evict(self):
+        # Apelat cu lock-ul luat (sau la încărcare)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.get('size', 0)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+        self.schedule_save()
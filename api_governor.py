@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import datetime
+import threading
+
+from atomic_io import write_json_atomic, DebouncedSaver
+
+# Metodă googlemaps -> (familie API, cost estimat în USD per cerere), după lista de prețuri Google Maps Platform
+API_COSTS = {
+    'places_nearby':       ('places', 0.032),
+    'places':              ('places', 0.032),
+    'place':               ('details', 0.017),
+    'places_autocomplete': ('autocomplete', 0.00283),
+    'geocode':             ('geocoding', 0.005),
+    'reverse_geocode':     ('geocoding', 0.005),
+    'directions':          ('directions', 0.005),
+    'distance_matrix':     ('distance_matrix', 0.005),  # per element (origine x destinație)
+}
+
+# Cereri pe secundă permise pe familie (sub limitele Google, cu rezervă)
+DEFAULT_QPS = {
+    'places': 8,
+    'details': 10,
+    'autocomplete': 10,
+    'geocoding': 20,
+    'directions': 10,
+    'distance_matrix': 5,
+}
+
+DEFAULT_DAILY_CAP_USD = 5.0
+
+# Consumul se scrie pe disc la cel mult SAVE_DELAY secunde după o cerere (o scriere pentru o rafală)
+SAVE_DELAY = 1.0
+
+
+class BudgetExceeded(Exception):
+    """Cererea ar depăși bugetul zilnic configurat."""
+
+
+def request_cost(method, kwargs):
+    """Costul estimat al unui apel; Distance Matrix se taxează pe element."""
+    family, unit = API_COSTS.get(method, (None, 0.0))
+    if method == 'distance_matrix':
+        origins = kwargs.get('origins') or []
+        destinations = kwargs.get('destinations') or []
+        n_o = len(origins) if isinstance(origins, (list, tuple)) else 1
+        n_d = len(destinations) if isinstance(destinations, (list, tuple)) else 1
+        return unit * max(1, n_o * n_d)
+    return unit
+
+
+class TokenBucket:
+    """Token bucket clasic: 'rate' jetoane pe secundă, maxim 'capacity' acumulate."""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1.0, timeout=None):
+        """Blochează până există jetoane (coadă implicită); False dacă expiră timeout-ul."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class QuotaGovernor:
+    """
+    Guvernator de cotă pentru API-urile Google:
+    - un token bucket per familie de API (QPS configurabil), deci scanările paralele
+      așteaptă la coadă în loc să primească OVER_QUERY_LIMIT;
+    - un plafon de cost zilnic (USD): cererile care l-ar depăși sunt respinse cu BudgetExceeded;
+    - consumul zilei se păstrează pe disc (se resetează la schimbarea datei), salvat în fundal
+      după fiecare rafală de cereri, ca o oprire bruscă să nu readucă plafonul la zero.
+    """
+    def __init__(self, path=None, qps=None, daily_cap_usd=None, save_delay=SAVE_DELAY):
+        self.path = path
+        self.saver = DebouncedSaver(self._write, save_delay)
+        self.qps = dict(DEFAULT_QPS)
+        if qps:
+            self.qps.update(qps)
+        self.buckets = {family: TokenBucket(rate) for family, rate in self.qps.items()}
+        self.daily_cap_usd = daily_cap_usd if daily_cap_usd is not None else DEFAULT_DAILY_CAP_USD
+        self.day = datetime.date.today().isoformat()
+        self.spent_usd = 0.0
+        self.calls = {}
+        self.rejected = 0
+        self.lock = threading.Lock()
+        self.load()
+        if daily_cap_usd is not None:
+            self.daily_cap_usd = daily_cap_usd
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.daily_cap_usd = data.get('daily_cap_usd', self.daily_cap_usd)
+            if data.get('day') == self.day:
+                self.spent_usd = data.get('spent_usd', 0.0)
+                self.calls = data.get('calls', {})
+        except Exception as e:
+            print(f"Eroare încărcare consum API: {e}")
+
+    def save(self):
+        if self.path:
+            self.saver.save_now()
+
+    def _write(self):
+        with self.lock:
+            data = {'day': self.day, 'spent_usd': round(self.spent_usd, 4),
+                    'daily_cap_usd': self.daily_cap_usd, 'calls': dict(self.calls)}
+        try:
+            write_json_atomic(self.path, data, indent=2)
+        except Exception as e:
+            print(f"Eroare salvare consum API: {e}")
+
+    def schedule_save(self):
+        """Programează salvarea consumului pe un fir de fundal (cererile din interval intră în aceeași scriere)."""
+        if self.path:
+            self.saver.schedule()
+
+    def flush(self):
+        self.saver.flush()
+
+    def _roll_day(self):
+        # Apelat cu lock-ul luat
+        today = datetime.date.today().isoformat()
+        if today != self.day:
+            self.day = today
+            self.spent_usd = 0.0
+            self.calls = {}
+
+    def set_daily_cap(self, usd):
+        with self.lock:
+            self.daily_cap_usd = max(0.0, float(usd))
+        self.save()
+
+    def remaining(self):
+        with self.lock:
+            self._roll_day()
+            return max(0.0, self.daily_cap_usd - self.spent_usd)
+
+    def can_afford(self, usd):
+        return usd <= self.remaining()
+
+    def acquire(self, method, kwargs=None):
+        """
+        Apelat înaintea fiecărei cereri: rezervă costul în bugetul zilei,
+        apoi așteaptă un jeton în bucket-ul familiei. Ridică BudgetExceeded peste plafon.
+        """
+        family, _ = API_COSTS.get(method, (None, 0.0))
+        cost = request_cost(method, kwargs or {})
+        with self.lock:
+            self._roll_day()
+            if cost and self.spent_usd + cost > self.daily_cap_usd:
+                self.rejected += 1
+                raise BudgetExceeded(
+                    f"Bugetul zilnic de {self.daily_cap_usd:.2f} USD ar fi depășit "
+                    f"(consumat {self.spent_usd:.2f} USD, cererea {method} ~{cost:.3f} USD)."
+                )
+            self.spent_usd += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+        self.schedule_save()
+        bucket = self.buckets.get(family)
+        if bucket:
+            bucket.acquire()
+
+    def stats(self):
+        with self.lock:
+            self._roll_day()
+            return {'day': self.day, 'spent_usd': round(self.spent_usd, 4), 'daily_cap_usd': self.daily_cap_usd,
+                    'calls': dict(self.calls), 'rejected': self.rejected}
@@ -0,0 +1,182 @@
+import os
+import re
+import time
+import queue
+import atexit
+import datetime
+import threading
+
+# Secvențele de culoare ANSI din mesajele de consolă (compilat o singură dată)
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+
+def strip_ansi_codes(text):
+    """Curăță culorile pentru fișierul text."""
+    return ANSI_ESCAPE.sub('', text)
+
+
+class LogWriter:
+    """
+    Scrierea fișierelor de log pe un fir separat, alimentat printr-o coadă:
+    apelantul (bucla de scanare, UI-ul) doar pune mesajul în coadă și merge mai departe.
+    Firul scrie în loturi, prin fișiere ținute deschise (cu buffer), și face flush
+    cel mult o dată la flush_interval secunde; fișierele nefolosite de idle_close secunde se închid.
+    """
+    def __init__(self, flush_interval=0.5, idle_close=10.0, batch_size=500):
+        self.flush_interval = flush_interval
+        self.idle_close = idle_close
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self.files = {}  # cale -> [fișier, ultima folosire]
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.errors = 0
+
+    def _ensure_thread(self):
+        if self.thread is not None: return
+        with self.start_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self.thread.start()
+                atexit.register(self.shutdown)
+
+    def write(self, path, message, tag=None):
+        """Pune un rând în coadă (nu blochează); ora e cea a apelului, nu a scrierii."""
+        self._ensure_thread()
+        self.queue.put(('line', path, time.time(), tag, message))
+
+    def write_raw(self, path, line):
+        """Un rând scris exact cum e dat (ex: un obiect JSONL), fără oră sau etichetă."""
+        self._ensure_thread()
+        self.queue.put(('raw', path, line))
+
+    def close_file(self, path):
+        """Închide fișierul după ce toate rândurile deja puse în coadă au fost scrise."""
+        self._ensure_thread()
+        self.queue.put(('close', path))
+
+    def flush(self, timeout=5.0):
+        """Așteaptă până când tot ce e în coadă a ajuns pe disc."""
+        if self.thread is None: return True
+        done = threading.Event()
+        self.queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def shutdown(self, timeout=5.0):
+        if self.thread is None: return
+        done = threading.Event()
+        self.queue.put(('stop', done))
+        done.wait(timeout)
+
+    # --- Firul de scriere ---
+
+    def _format(self, ts, tag, message):
+        clean_msg = strip_ansi_codes(str(message))
+        stamp = datetime.datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+        if tag:
+            return f"[{stamp}] [{tag}] {clean_msg}\n"
+        return f"[{stamp}] {clean_msg}\n"
+
+    def _file(self, path, now):
+        entry = self.files.get(path)
+        if entry is None:
+            entry = [open(path, "a", encoding="utf-8", buffering=64 * 1024), now]
+            self.files[path] = entry
+        entry[1] = now
+        return entry[0]
+
+    def _close(self, path):
+        entry = self.files.pop(path, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except OSError:
+                self.errors += 1
+
+    def _flush_all(self, now):
+        for path, (f, last_used) in list(self.files.items()):
+            try:
+                f.flush()
+            except OSError:
+                self.errors += 1
+            if now - last_used > self.idle_close:
+                self._close(path)
+
+    def _handle(self, item, now):
+        """Scrie un element din coadă; întoarce False la oprire."""
+        kind = item[0]
+        if kind == 'line':
+            _, path, ts, tag, message = item
+            try:
+                self._file(path, now).write(self._format(ts, tag, message))
+            except OSError as e:
+                self.errors += 1
+                if self.errors == 1:
+                    print(f"Log Error: {e}")
+        elif kind == 'raw':
+            try:
+                self._file(item[1], now).write(item[2] + "\n")
+            except OSError as e:
+                self.errors += 1
+                if self.errors == 1:
+                    print(f"Log Error: {e}")
+        elif kind == 'close':
+            self._close(item[1])
+        elif kind == 'flush':
+            self._flush_all(now)
+            item[1].set()
+        elif kind == 'stop':
+            for path in list(self.files):
+                self._close(path)
+            item[1].set()
+            return False
+        return True
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            now = time.monotonic()
+            running = True
+            handled = 0
+            while item is not None and running:
+                running = self._handle(item, now)
+                handled += 1
+                if handled >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if not running:
+                return
+
+            if now - last_flush >= self.flush_interval:
+                self._flush_all(now)
+                last_flush = now
+
+
+def prune_logs(log_dir, retention_days=14, extensions=('.txt', '.jsonl')):
+    """Șterge logurile mai vechi de retention_days (în loc să golească tot folderul la pornire)."""
+    if not os.path.isdir(log_dir): return 0
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for root, _, names in os.walk(log_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if not name.endswith(extensions): continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+# Scriitorul comun al aplicației (și al CLI-ului)
+log_writer = LogWriter()
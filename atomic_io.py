@@ -0,0 +1,79 @@
+"""
+Scrieri pe disc comune cache-urilor și fișierelor aplicației:
+- write_atomic / write_json_atomic: fișier temporar unic în același director + os.replace,
+  deci cititorii văd fie versiunea veche, fie pe cea nouă, iar două scrieri simultane nu se amestecă;
+- DebouncedSaver: salvarea unui obiect pe un fir de fundal, comasată, fără scrieri suprapuse.
+"""
+import os
+import json
+import atexit
+import tempfile
+import threading
+
+
+def write_atomic(path, data):
+    """Scrie text (UTF-8) sau octeți în path, atomic."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        if isinstance(data, bytes):
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data, indent=None):
+    write_atomic(path, json.dumps(data, ensure_ascii=False, indent=indent, default=str))
+
+
+class DebouncedSaver:
+    """
+    Rulează write() pe un fir de fundal la `delay` secunde după prima cerere (schedule);
+    cererile din interval intră în aceeași scriere. save_now() scrie imediat, flush() scrie
+    ce e programat (la închidere și la ieșirea procesului). Scrierile nu se suprapun niciodată,
+    așa că un instantaneu mai vechi nu poate suprascrie unul mai nou.
+    """
+    def __init__(self, write, delay):
+        self.write = write
+        self.delay = delay
+        self.timer = None
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def schedule(self):
+        with self.lock:
+            if self.timer is not None:
+                return
+            self.timer = threading.Timer(self.delay, self._timed_save)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _timed_save(self):
+        with self.lock:
+            self.timer = None
+        self.save_now()
+
+    def save_now(self):
+        with self.write_lock:
+            self.write()
+
+    def flush(self):
+        """Scrie imediat ce e programat, sau așteaptă scrierea aflată în curs."""
+        with self.lock:
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save_now()
+        else:
+            with self.write_lock:
+                pass
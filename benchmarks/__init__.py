@@ -0,0 +1 @@
+"""Benchmark-uri reproductibile pe date generate / înregistrate (fără rețea). Vezi run_benchmarks.py."""
@@ -0,0 +1,87 @@
+"""
+Înlocuitori fără rețea pentru googlemaps.Client și GeminiClient, alimentați din fixture-uri.
+Au aceeași interfață ca originalele, deci pot sta în spatele MapsGateway / BatchEnricher.
+"""
+import re
+import copy
+import time
+import threading
+from collections import Counter
+
+from benchmarks import fixtures
+
+MAPS_METHODS = ('places_nearby', 'places', 'place', 'places_autocomplete', 'geocode', 'reverse_geocode',
+                'directions', 'distance_matrix')
+
+
+class FakeMapsClient:
+    """
+    Stand-in pentru googlemaps.Client: fiecare metodă servește răspunsul din fixture-uri.
+    Un fixture e fie o listă de răspunsuri (servite pe rând, circular), fie o funcție
+    apelată cu argumentele cererii. 'latency' (secunde) simulează timpul de rețea.
+    """
+    def __init__(self, key=None, fixtures=None, latency=0.0, **kwargs):
+        self.fixtures = dict(fixtures or {})
+        self.latency = latency
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def _serve(self, method, args, kwargs):
+        with self.lock:
+            self.calls[method] += 1
+            n = self.calls[method]
+        if self.latency:
+            time.sleep(self.latency)
+        source = self.fixtures.get(method)
+        if source is None:
+            raise KeyError(f"Niciun fixture pentru '{method}'")
+        if callable(source):
+            return source(*args, **kwargs)
+        return copy.deepcopy(source[(n - 1) % len(source)])
+
+    def __getattr__(self, name):
+        if name in MAPS_METHODS:
+            return lambda *args, **kwargs: self._serve(name, args, kwargs)
+        raise AttributeError(name)
+
+
+def default_maps_fixtures(n_places=60, path=None):
+    """Fixture-uri generate pentru toate metodele folosite de aplicație."""
+    places = fixtures.make_places(n_places)
+    path = path or fixtures.make_path(400)
+    return {
+        'places_nearby': [{'status': 'OK', 'results': places}],
+        'places': [{'status': 'OK', 'results': places}],
+        'place': lambda *a, **kw: {'status': 'OK', 'result': {'website': 'https://example.ro',
+                                                              'opening_hours': {'open_now': True}}},
+        'directions': [fixtures.make_directions(path)],
+        'distance_matrix': fixtures.distance_matrix_response,
+        'geocode': [[{'geometry': {'location': {'lat': fixtures.CENTER[0], 'lng': fixtures.CENTER[1]}},
+                      'formatted_address': 'Brașov, România', 'place_id': 'bench_geocode'}]],
+        'reverse_geocode': [[{'formatted_address': 'Strada Exemplu 1, Brașov', 'address_components': [],
+                              'types': ['street_address']}]],
+        'places_autocomplete': [[{'description': 'Brașov, România', 'place_id': 'bench_geocode'}]],
+    }
+
+
+class FakeGeminiClient:
+    """Stand-in pentru GeminiClient: răspunsul unui lot e lista JSON {id, text} pentru id-urile din prompt."""
+    ID_LINE = re.compile(r"^- id: (\S+) \|", re.MULTILINE)
+
+    def __init__(self, latency=0.0, words=60):
+        self.latency = latency
+        self.words = words
+        self.calls = 0
+
+    def generate(self, model, prompt, temperature=0.7, max_tokens=1024, cancel_event=None, response_schema=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return fixtures.gemini_batch_text(self.ID_LINE.findall(prompt), self.words)
+
+    def stream(self, model, prompt, temperature=0.7, max_tokens=1024, on_chunk=None, cancel_event=None,
+               response_schema=None):
+        text = self.generate(model, prompt, temperature, max_tokens, cancel_event, response_schema)
+        if on_chunk:
+            on_chunk(text)
+        return text
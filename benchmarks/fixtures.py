@@ -0,0 +1,125 @@
+"""
+Date de test pentru benchmark-uri, în formatul răspunsurilor Google Maps / Gemini.
+Generarea e deterministă (seed fix), ca rulările pe versiuni diferite să măsoare aceleași date.
+Un set înregistrat (JSON: metodă -> listă de răspunsuri, sau fixture store-ul .jsonl.gz scris
+cu TURIST_API_MODE=record) se încarcă cu load_fixture_file.
+"""
+import json
+import math
+import zlib
+import random
+
+from geo_utils import encode_polyline
+
+# Centrul Brașovului: punctul în jurul căruia se generează locurile
+CENTER = (45.6427, 25.5887)
+SEED = 20240501
+
+PLACE_TYPES = ['tourist_attraction', 'museum', 'church', 'park', 'restaurant', 'cafe', 'art_gallery',
+               'point_of_interest', 'bar', 'store', 'lodging', 'place_of_worship']
+NAME_WORDS = ['Muzeul', 'Biserica', 'Parcul', 'Cetatea', 'Casa', 'Turnul', 'Piața', 'Bastionul',
+              'Galeria', 'Cafeneaua', 'Restaurantul', 'Grădina', 'Mănăstirea', 'Poarta']
+
+
+def make_places(n, center=CENTER, radius_m=3000, seed=SEED):
+    """n locuri în formatul 'results' din Places Nearby, împrăștiate în jurul centrului."""
+    rnd = random.Random(seed + n)
+    lat0, lng0 = center
+    places = []
+    for i in range(n):
+        dist = radius_m * math.sqrt(rnd.random())
+        angle = rnd.random() * 2 * math.pi
+        lat = lat0 + dist * math.cos(angle) / 111320.0
+        lng = lng0 + dist * math.sin(angle) / (111320.0 * math.cos(math.radians(lat0)))
+        types = rnd.sample(PLACE_TYPES, rnd.randint(1, 3))
+        places.append({
+            'place_id': f"bench_{n}_{i}",
+            'name': f"{rnd.choice(NAME_WORDS)} {rnd.choice(NAME_WORDS)} {i}",
+            'rating': round(rnd.uniform(2.5, 5.0), 1),
+            'user_ratings_total': int(rnd.paretovariate(1.2) * 40),
+            'types': types,
+            'vicinity': f"Strada Exemplu {i}, Brașov",
+            'opening_hours': {'open_now': rnd.random() > 0.3},
+            'geometry': {'location': {'lat': lat, 'lng': lng}},
+        })
+    return places
+
+
+def make_path(n, start=CENTER, seed=SEED):
+    """Un drum de n puncte (~30 m între puncte), cu viraje line."""
+    rnd = random.Random(seed + n)
+    lat, lng = start
+    heading = rnd.random() * 2 * math.pi
+    points = []
+    for _ in range(n):
+        points.append((round(lat, 5), round(lng, 5)))
+        heading += rnd.uniform(-0.15, 0.15)
+        lat += 30 * math.cos(heading) / 111320.0
+        lng += 30 * math.sin(heading) / (111320.0 * math.cos(math.radians(lat)))
+    return points
+
+
+def make_directions(path):
+    """Răspuns Directions cu un singur traseu, având path ca overview_polyline."""
+    return [{'overview_polyline': {'points': encode_polyline(path)},
+             'legs': [{'distance': {'value': 30 * len(path), 'text': f"{30 * len(path) / 1000:.1f} km"},
+                       'duration': {'value': 3 * len(path), 'text': f"{3 * len(path) // 60} min"}}]}]
+
+
+def places_near_path(path, n, max_offset_m=400, seed=SEED):
+    """n locuri aflate la cel mult max_offset_m de drum (o parte trec de filtrul de abatere, o parte nu)."""
+    rnd = random.Random(seed + n + len(path))
+    places = make_places(n, seed=seed + len(path))
+    for p in places:
+        lat, lng = path[rnd.randrange(len(path))]
+        off = rnd.uniform(0, max_offset_m)
+        angle = rnd.random() * 2 * math.pi
+        p['geometry']['location'] = {'lat': lat + off * math.cos(angle) / 111320.0,
+                                     'lng': lng + off * math.sin(angle) / (111320.0 * math.cos(math.radians(lat)))}
+    return places
+
+
+def distance_matrix_response(origins=None, destinations=None, mode="driving", **kwargs):
+    """Răspuns Distance Matrix cu câte un element per destinație (distanțe plauzibile)."""
+    destinations = destinations or []
+    speed = 11.0 if mode == "driving" else 1.3  # m/s
+    elements = []
+    for i, dest in enumerate(destinations):
+        meters = 300 + zlib.crc32(str(dest).encode('utf-8')) % 9000
+        elements.append({'status': 'OK',
+                         'distance': {'value': meters, 'text': f"{meters / 1000:.1f} km"},
+                         'duration': {'value': int(meters / speed), 'text': f"{int(meters / speed) // 60} min"}})
+    return {'status': 'OK', 'rows': [{'elements': elements}] * max(1, len(origins or []))}
+
+
+def gemini_batch_text(place_ids, words=60):
+    """Răspunsul structurat (listă JSON {id, text}) al unui lot de îmbogățire AI."""
+    text = " ".join(["Lorem"] * words)
+    return json.dumps([{'id': pid, 'text': f"{text} ({pid})"} for pid in place_ids], ensure_ascii=False)
+
+
+def make_excel_rows(n, seed=SEED):
+    """Rândurile unui Excel de locuri custom, în coloanele citite de CustomDataManager (C..K)."""
+    rnd = random.Random(seed + n)
+    rows = []
+    for i in range(n):
+        lat = 44.0 + rnd.random() * 3.5
+        lng = 21.0 + rnd.random() * 7.0
+        rows.append([i + 1, "", f"Mănăstirea {rnd.choice(NAME_WORDS)} {i}", rnd.randint(3, 80),
+                     "Sfânta Treime", "Mănăstire", 1500 + rnd.randint(0, 500), f"{lat:.6f}, {lng:.6f}",
+                     "Muntenia", "Arhiepiscopia Bucureștilor", "Mitropolia Munteniei"])
+    return rows
+
+
+def load_fixture_file(path):
+    """Un set înregistrat: {metodă: [răspuns, ...]}, servit pe rând de FakeMapsClient."""
+    if path.endswith('.jsonl.gz'):
+        from replay_transport import FixtureStore
+        data = FixtureStore(path).by_method()
+        data.pop('gemini', None)  # textele Gemini nu sunt fixture-uri Maps
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(v, list) and v for v in data.values()):
+        raise ValueError(f"Fixture invalid (aștept un obiect metodă -> listă nevidă de răspunsuri): {path}")
+    return data
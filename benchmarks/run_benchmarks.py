@@ -0,0 +1,324 @@
+"""
+Benchmark-uri reproductibile, fără rețea: răspunsurile Google / Gemini vin din fixture-uri
+(generate determinist sau înregistrate), servite de FakeMapsClient / FakeGeminiClient.
+
+Rulare (din rădăcina proiectului):
+    python -m benchmarks.run_benchmarks                          # toate, rezultatul în benchmarks/results/
+    python -m benchmarks.run_benchmarks --only decode_polyline corridor_filter --repeat 10
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/bench_vechi.json
+    python -m benchmarks.run_benchmarks --fixtures inregistrare.json   # răspunsuri înregistrate
+    python -m benchmarks.run_benchmarks --fixtures fixtures/api_fixtures.jsonl.gz   # TURIST_API_MODE=record
+
+Grupul 'app' (distanțe, carduri) importă aplicația cu clientul Google înlocuit și are nevoie de
+PySide6 (rulează offscreen); dacă lipsește, benchmark-urile lui apar ca 'skipped' în JSON.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+import tempfile
+import statistics
+import subprocess
+
+from benchmarks import fixtures
+from benchmarks.fake_clients import FakeMapsClient, FakeGeminiClient, default_maps_fixtures
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+RESULT_FORMAT = 1
+
+# Peste acest raport (median nou / median vechi) o măsurătoare e considerată regresie
+REGRESSION_RATIO = 1.25
+
+BENCHMARKS = []  # (nume, grup, dimensiuni, setup)
+
+
+class Skip(Exception):
+    """Benchmark-ul nu poate rula în mediul curent (dependență lipsă)."""
+
+
+def quiet_log():
+    """Un ScanLog care nu afișează nimic (consola ar domina timpul măsurat)."""
+    from scan_engine import ScanLog
+    log = ScanLog()
+    log.info = log.success = log.warning = log.error = lambda message: None
+    return log
+
+
+def benchmark(name, sizes, group="core"):
+    """
+    Înregistrează un benchmark: setup(size, ctx) pregătește datele (nemăsurat)
+    și întoarce funcția fără argumente care se cronometrează.
+    """
+    def decorator(setup):
+        BENCHMARKS.append((name, group, sizes, setup))
+        return setup
+    return decorator
+
+
+# --- Benchmark-uri ---
+
+@benchmark("decode_polyline", sizes=(1000, 10000, 100000))
+def bench_decode_polyline(size, ctx):
+    from geo_utils import decode_polyline, encode_polyline
+    encoded = encode_polyline(fixtures.make_path(size))
+    return lambda: decode_polyline(encoded)
+
+
+@benchmark("corridor_filter", sizes=(1000, 5000, 20000))
+def bench_corridor_filter(size, ctx):
+    """Filtrul de abatere față de drum pentru un punct de scanare (60 de rezultate, drum de 'size' puncte)."""
+    from geo_utils import encode_polyline
+    from categories import CATEGORIES_MAP, CategoryIndex
+    from scan_engine import ScanEngine, CorridorScanParams, CorridorPlan, CorridorScanResult
+    path = fixtures.make_path(size)
+    plan = CorridorPlan(encode_polyline(path), path, path[::300] or [path[0]])
+    params = CorridorScanParams("A", "B", ["muzeu"], max_deviation_m=150)
+    results = fixtures.places_near_path(path, 60)
+    engine = ScanEngine(FakeMapsClient(fixtures=ctx['maps']), CategoryIndex(CATEGORIES_MAP), log=quiet_log())
+    return lambda: engine._classify_corridor_results(params, plan, CorridorScanResult(plan), 0, "muzeu", results)
+
+
+@benchmark("area_selection", sizes=(60, 300, 1500))
+def bench_area_selection(size, ctx):
+    """Scanarea circulară fără detalii: filtrarea candidaților + scor + selecția pe urne (V1/V2/V3)."""
+    from categories import CATEGORIES_MAP, CategoryIndex
+    from ranking import ScoreFormula
+    from scan_engine import ScanEngine, AreaScanParams, AreaScanResult
+    maps = dict(ctx['maps'], places_nearby=[{'status': 'OK', 'results': fixtures.make_places(size)}])
+    engine = ScanEngine(FakeMapsClient(fixtures=maps), CategoryIndex(CATEGORIES_MAP), log=quiet_log())
+    params = AreaScanParams(fixtures.CENTER, radius_m=3000, min_reviews=100, limit_v1=15, limit_v3=3)
+
+    def run():
+        result = AreaScanResult()
+        engine.collect_area_candidates(params, result)
+        engine.select_area(params, result, ScoreFormula(params.ranking_weights, params.center, params.radius_m))
+        return result
+    return run
+
+
+@benchmark("ai_batch", sizes=(10, 50, 200))
+def bench_ai_batch(size, ctx):
+    """Îmbogățirea AI în loturi: promptul fiecărui lot + parsarea răspunsului JSON înregistrat."""
+    from ai_batch import BatchEnricher
+    places = [{'id': p['place_id'], 'name': p['name'], 'address': p['vicinity']} for p in fixtures.make_places(size)]
+    client = FakeGeminiClient()
+    return lambda: BatchEnricher(client, "bench-model", token_budget=10 ** 7).run(places)
+
+
+@benchmark("excel_load", sizes=(100, 1000, 5000))
+def bench_excel_load(size, ctx):
+    try:
+        import openpyxl
+        from custom_data_manager import CustomDataManager
+    except ImportError as e:
+        raise Skip(f"lipsește {e.name}")
+    path = os.path.join(ctx['tmp'], f"custom_{size}.xlsx")
+    if not os.path.exists(path):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["Nr", "", "Nume", "Viețuitori", "Hram", "Tip", "An", "Coordonate", "Regiune", "Arhiepiscopie", "Mitropolie"])
+        for row in fixtures.make_excel_rows(size):
+            ws.append(row)
+        wb.save(path)
+    manager = CustomDataManager()
+    return lambda: manager.load_from_excel(path)
+
+
+@benchmark("details_fanout", sizes=(1, 4, 8))
+def bench_details_fanout(size, ctx):
+    """
+    Detaliile pentru 40 de locuri prin MapsGateway cu 'size' workeri: răspunsurile se înregistrează
+    o dată (RecordingClient) și se redau cu 20 ms latență (ReplayClient), deci se vede câștigul fan-out-ului.
+    """
+    from api_governor import QuotaGovernor, DEFAULT_QPS
+    from categories import CATEGORIES_MAP, CategoryIndex
+    from maps_gateway import MapsGateway
+    from scan_engine import ScanEngine
+    try:
+        from replay_transport import FixtureStore, RecordingClient, ReplayClient
+    except ImportError as e:
+        raise Skip(f"lipsește {e.name}")
+    place_ids = [p['place_id'] for p in fixtures.make_places(40)]
+    store = ctx.get('details_store')
+    if store is None:
+        store = ctx['details_store'] = FixtureStore(os.path.join(ctx['tmp'], "details.jsonl.gz"))
+        recorder = RecordingClient(FakeMapsClient(fixtures=ctx['maps']), store)
+        ScanEngine(MapsGateway(recorder, QuotaGovernor(None, qps={k: 10 ** 6 for k in DEFAULT_QPS}, daily_cap_usd=10 ** 9)),
+                   CategoryIndex(CATEGORIES_MAP), log=quiet_log()).fetch_details(place_ids)
+    gateway = MapsGateway(ReplayClient(store, latency=(0.02, 0.02)),
+                          QuotaGovernor(None, qps={k: 10 ** 6 for k in DEFAULT_QPS}, daily_cap_usd=10 ** 9),
+                          max_workers=size)
+    engine = ScanEngine(gateway, CategoryIndex(CATEGORIES_MAP), log=quiet_log())
+    return lambda: engine.fetch_details(place_ids)
+
+
+@benchmark("distance_info", sizes=(25, 100, 400), group="app")
+def bench_distance_info(size, ctx):
+    """get_distance_info: loturi de câte 25 de destinații, driving + walking pentru fiecare."""
+    app = load_app(ctx)
+    destinations = fixtures.make_places(size)
+    return lambda: app.get_distance_info(fixtures.CENTER, destinations)
+
+
+@benchmark("result_cards", sizes=(20, 60, 200), group="app")
+def bench_result_cards(size, ctx):
+    """Construirea cardurilor de rezultat (widget-uri Qt) pentru o listă de căutare."""
+    app = load_app(ctx)
+    window = ctx.get('window')
+    if window is None:
+        window = ctx['window'] = app.MainWindow()
+    places = fixtures.make_places(size)
+    distance_info = {p['place_id']: {'distance_text': '1.2 km', 'driving_duration': '3 min',
+                                     'distance_km': 1.2, 'walking_duration': '15 min'} for p in places}
+
+    def run():
+        window.clear_results()
+        for place in places:
+            window.create_place_card(place, distance_info)
+        ctx['qt_app'].processEvents()
+    return run
+
+
+def load_app(ctx):
+    """
+    Importă aplicația o singură dată, cu googlemaps.Client înlocuit de FakeMapsClient
+    și fără efecte pe fișierele utilizatorului (stare în directorul temporar, fără jurnale de profil/cotă).
+    """
+    if 'app' in ctx:
+        return ctx['app']
+    try:
+        import googlemaps
+        from PySide6.QtWidgets import QApplication
+    except ImportError as e:
+        raise Skip(f"lipsește {e.name}")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("GOOGLE_API_KEY", "bench-key")
+    maps = ctx['maps']
+    googlemaps.Client = lambda *args, **kwargs: FakeMapsClient(fixtures=maps)
+    ctx['qt_app'] = QApplication.instance() or QApplication([])
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.chdir(ctx['tmp'])  # app_state.json e relativ la directorul curent
+    import turist_pro_v05 as app
+    app.profiler.on_finish = None
+    app.api_governor.path = None
+    # Fără limite de QPS / buget: se măsoară codul, nu guvernatorul
+    from api_governor import QuotaGovernor, DEFAULT_QPS
+    from maps_gateway import MapsGateway
+    app.gmaps_client = MapsGateway(FakeMapsClient(fixtures=maps),
+                                   QuotaGovernor(None, qps={k: 10 ** 6 for k in DEFAULT_QPS}, daily_cap_usd=10 ** 9))
+    ctx['app'] = app
+    return app
+
+
+# --- Rulare și raport ---
+
+def time_call(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_all(only=None, repeat=5, fixture_file=None, log=print):
+    ctx = {'tmp': tempfile.mkdtemp(prefix="turist_bench_"),
+           'maps': default_maps_fixtures()}
+    if fixture_file:
+        ctx['maps'].update(fixtures.load_fixture_file(fixture_file))
+    cwd = os.getcwd()
+    report = {'format': RESULT_FORMAT, 'created': datetime.datetime.now().isoformat(timespec='seconds'),
+              'git': git_revision(), 'python': platform.python_version(), 'platform': platform.platform(),
+              'repeat': repeat, 'fixtures': os.path.basename(fixture_file) if fixture_file else "generated",
+              'results': [], 'skipped': {}}
+    try:
+        for name, group, sizes, setup in BENCHMARKS:
+            if only and name not in only and group not in only:
+                continue
+            for size in sizes:
+                try:
+                    fn = setup(size, ctx)
+                    runs = time_call(fn, repeat)
+                except Skip as e:
+                    report['skipped'][name] = str(e)
+                    log(f"{name:<18} {'':>8}  sărit ({e})")
+                    break
+                entry = {'name': name, 'group': group, 'size': size,
+                         'min_s': min(runs), 'median_s': statistics.median(runs),
+                         'mean_s': statistics.fmean(runs),
+                         'stdev_s': statistics.stdev(runs) if len(runs) > 1 else 0.0}
+                report['results'].append(entry)
+                log(f"{name:<18} {size:>8}  median {entry['median_s'] * 1000:9.3f} ms  min {entry['min_s'] * 1000:9.3f} ms")
+    finally:
+        os.chdir(cwd)
+    return report
+
+
+def compare(report, baseline, ratio=REGRESSION_RATIO, log=print):
+    """Compară medianele cu un raport anterior; întoarce lista regresiilor (nume, dimensiune, raport)."""
+    old = {(r['name'], r['size']): r for r in baseline.get('results', [])}
+    regressions = []
+    log(f"\nComparație cu {baseline.get('git') or '?'} ({baseline.get('created', '?')}):")
+    for r in report['results']:
+        prev = old.get((r['name'], r['size']))
+        if prev is None or not prev['median_s']:
+            continue
+        change = r['median_s'] / prev['median_s']
+        flag = "  ⚠️ REGRESIE" if change > ratio else ("  ✅ mai rapid" if change < 1 / ratio else "")
+        log(f"{r['name']:<18} {r['size']:>8}  {prev['median_s'] * 1000:9.3f} -> {r['median_s'] * 1000:9.3f} ms  x{change:.2f}{flag}")
+        if change > ratio:
+            regressions.append((r['name'], r['size'], round(change, 2)))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="run_benchmarks", description="Benchmark-uri Turist Pro pe fixture-uri.")
+    parser.add_argument("--only", nargs="+", help="doar aceste benchmark-uri sau grupuri (core, app)")
+    parser.add_argument("--repeat", type=int, default=5, help="rulări măsurate per dimensiune (implicit 5)")
+    parser.add_argument("--fixtures", help="răspunsuri înregistrate: JSON (metodă -> listă) sau fixture store .jsonl.gz")
+    parser.add_argument("--out", help="fișierul JSON de rezultat (implicit benchmarks/results/bench_<dată>_<git>.json)")
+    parser.add_argument("--compare", help="raport anterior; codul de ieșire e 1 dacă apar regresii")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO, help="pragul de regresie (implicit 1.25)")
+    parser.add_argument("--list", action="store_true", help="afișează benchmark-urile și iese")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, group, sizes, setup in BENCHMARKS:
+            print(f"{name:<18} [{group}] dimensiuni {list(sizes)}")
+        return 0
+
+    report = run_all(args.only, max(1, args.repeat), args.fixtures)
+    out = args.out
+    if not out:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = os.path.join(RESULTS_DIR, f"bench_{stamp}_{report['git'] or 'local'}.json")
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nRezultate: {out}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.ratio):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
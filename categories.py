@@ -0,0 +1,143 @@
+# --- Configurare Categorii Diversitate (Granularitate Maximă) ---
+CATEGORIES_MAP = {
+    # --- MÂNCARE & BĂUTURĂ ---
+    'restaurant': {
+        'label': '🍴 Restaurante',
+        'keywords': ['restaurant', 'meal_takeaway', 'meal_delivery']
+    },
+    'cafe': {
+        'label': '☕ Cafenele/Patiserii',
+        'keywords': ['cafe', 'bakery', 'coffee_shop']
+    },
+    'bar': {
+        'label': '🍻 Bar/Club/Viață de noapte',
+        'keywords': ['bar', 'night_club', 'casino', 'liquor_store']
+    },
+    
+    # --- CULTURĂ & TURISM ---
+    'museum': {
+        'label': '🏛️ Muzee & Artă',
+        'keywords': ['museum', 'art_gallery']
+    },
+    'religion': {
+        'label': '⛪ Religie/Spiritual',
+        'keywords': ['church', 'place_of_worship', 'synagogue', 'mosque', 'hindu_temple']
+    },
+    'tourist': {
+        'label': '📸 Atracții Turistice',
+        'keywords': ['tourist_attraction', 'city_hall', 'stadium', 'landmark']
+    },
+    
+    # --- NATURĂ & DISTRACȚIE ---
+    'park': {
+        'label': '🌳 Parcuri & Natură',
+        'keywords': ['park', 'natural_feature', 'campground', 'rv_park']
+    },
+    'fun': {
+        'label': '🎡 Zoo/Distracție/Film',
+        'keywords': ['amusement_park', 'zoo', 'aquarium', 'bowling_alley', 'movie_theater']
+    },
+    
+    # --- SHOPPING ---
+    'mall': {
+        'label': '🛍️ Mall/Fashion',
+        'keywords': ['shopping_mall', 'clothing_store', 'department_store', 'jewelry_store', 'shoe_store', 'electronics_store']
+    },
+    'market': {
+        'label': '🛒 Supermarket/Băcănie',
+        'keywords': ['supermarket', 'grocery_or_supermarket', 'convenience_store']
+    },
+    'books': {
+        'label': '📖 Librării/Biblioteci',
+        'keywords': ['book_store', 'library']
+    },
+    
+    # --- UTILITĂȚI & URGENȚE ---
+    'pharmacy': {
+        'label': '💊 Farmacii/Sănătate',
+        'keywords': ['pharmacy', 'drugstore', 'hospital', 'doctor']
+    },
+    'bank': {
+        'label': '🏧 Bănci/ATM',
+        'keywords': ['bank', 'atm']
+    },
+    'fuel': {
+        'label': '⛽ Benzinării',
+        'keywords': ['gas_station']
+    },
+    'transport': {
+        'label': '🚆 Transport (Gară/Bus)',
+        'keywords': ['train_station', 'bus_station', 'subway_station', 'transit_station', 'airport']
+    }
+}
+
+# Setări implicite extinse (Min/Max)
+DEFAULT_DIVERSITY_SETTINGS = {
+    'restaurant': {'min': 2, 'max': 5, 'min_rating': 4},
+    'cafe':       {'min': 2, 'max': 4, 'min_rating': 4},
+    'bar':        {'min': 0, 'max': 3, 'min_rating': 4},
+    'museum':     {'min': 2, 'max': 5, 'min_rating': 4},
+    'religion':   {'min': 3, 'max': 5, 'min_rating': 0}, # Prioritate Biserici
+    'park':       {'min': 2, 'max': 4, 'min_rating': 4},
+    'mall':       {'min': 1, 'max': 2, 'min_rating': 4},
+    'pharmacy':   {'min': 1, 'max': 2, 'min_rating': 0}, 
+    'bank':       {'min': 0, 'max': 2, 'min_rating': 0},
+    'market':     {'min': 0, 'max': 2, 'min_rating': 0}
+}
+
+
+class CategoryIndex:
+    """
+    Index compilat tip Google -> categorie, construit o singură dată din CATEGORIES_MAP.
+    Păstrează prioritatea din CATEGORIES_MAP: dacă tipurile unui loc se potrivesc în mai multe
+    categorii, câștigă cea definită prima (ca la parcurgerea directă a hărții).
+    """
+    def __init__(self, categories_map=None):
+        self.categories_map = categories_map if categories_map is not None else CATEGORIES_MAP
+        self.type_rank = {}  # tip Google -> (ordinea categoriei, cheie categorie)
+        for order, (cat_key, data) in enumerate(self.categories_map.items()):
+            for t in data['keywords']:
+                if t not in self.type_rank:
+                    self.type_rank[t] = (order, cat_key)
+        self.cache = {}  # tuple(tipuri) -> categorie
+
+    def classify(self, types):
+        """Categoria unui loc după lista de tipuri Google ('other' dacă nu se potrivește nimic)."""
+        key = tuple(types or ())
+        cat = self.cache.get(key)
+        if cat is None:
+            best = min((self.type_rank[t] for t in key if t in self.type_rank), default=None)
+            cat = best[1] if best else 'other'
+            self.cache[key] = cat
+        return cat
+
+    def category_of(self, cand):
+        """Categoria unui candidat de scanare, calculată o dată și păstrată în cand['category']."""
+        cat = cand.get('category')
+        if cat is None:
+            cat = self.classify(cand.get('types', []))
+            cand['category'] = cat
+        return cat
+
+    def label(self, types):
+        cat = self.classify(types)
+        return self.categories_map[cat]['label'] if cat in self.categories_map else None
+
+
+class CategoryInventory:
+    """Numărul de locuri pe categorie, actualizat incremental la fiecare selecție."""
+    def __init__(self, index, categories_map=None):
+        self.index = index
+        self.counts = {k: 0 for k in (categories_map if categories_map is not None else index.categories_map)}
+        self.counts['other'] = 0
+
+    def add_types(self, types):
+        cat = self.index.classify(types)
+        self.counts[cat if cat in self.counts else 'other'] += 1
+        return cat
+
+    def add(self, cat):
+        self.counts[cat if cat in self.counts else 'other'] += 1
+
+    def get(self, cat):
+        return self.counts.get(cat, 0)
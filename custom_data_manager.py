@@ -1,4 +1,3 @@
-import openpyxl
 import os
 import hashlib
 
@@ -23,9 +22,13 @@ class CustomDataManager:
         if not os.path.exists(path): return 0
         
         try:
+            # openpyxl doar când există un Excel de citit (importul costă la pornire)
+            import openpyxl
             wb = openpyxl.load_workbook(path, data_only=False)
             ws = wb.active
-            self.places.clear()
+            # Dicționarul nou înlocuiește pe cel vechi la final: citirea poate rula în fundal
+            # cât timp interfața folosește încă locurile anterioare
+            places = {}
             count = 0
             
             for row in ws.iter_rows(min_row=2, values_only=False):
@@ -53,7 +56,7 @@ class CustomDataManager:
                     val_arh = str(row[self.COL_ARH].value or "-") if len(row) > self.COL_ARH else "-"
                     val_mit = str(row[self.COL_MIT].value or "-") if len(row) > self.COL_MIT else "-"
 
-                    self.places[pid] = {
+                    places[pid] = {
                         'id': pid,
                         'name': str(c_name.value).strip(),
                         'inhabitants': str(row[self.COL_VIET].value or "?"),
@@ -71,6 +74,7 @@ class CustomDataManager:
                     count += 1
                 except: continue
             
+            self.places = places
             self.file_path = path
             self.is_enabled = True
             return count
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from metrics import gemini_cost
+
+# Poate fi suprascris (ex: server local de test) prin variabila de mediu GEMINI_BASE_URL
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# (conectare, citire între două fragmente) în secunde
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class GeminiError(Exception):
+    """Răspuns de eroare de la Gemini (status HTTP != 200 sau răspuns fără text)."""
+
+
+class GeminiCancelled(Exception):
+    """Generarea a fost oprită de utilizator (ex: dialogul a fost închis)."""
+
+
+def extract_text(chunk):
+    """Textul dintr-un răspuns (sau fragment de stream) generateContent ("" fără candidați)."""
+    candidates = chunk.get('candidates') or [{}]
+    parts = candidates[0].get('content', {}).get('parts', [])
+    return "".join(p.get('text', '') for p in parts)
+
+
+def block_reason(chunk):
+    """Motivul blocării promptului (ex: 'SAFETY'), dacă modelul a refuzat să răspundă; altfel None."""
+    return (chunk.get('promptFeedback') or {}).get('blockReason')
+
+
+class GeminiJob:
+    """O generare pornită în fundal: 'future' cu textul complet + oprire cooperativă."""
+    def __init__(self, future, cancel_event):
+        self.future = future
+        self.cancel_event = cancel_event
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class GeminiClient:
+    """
+    Client Gemini cu streaming (streamGenerateContent, format SSE).
+    - Fragmentele de text se livrează prin on_chunk(text) pe măsură ce sosesc.
+    - Cererile au timeout; generarea se poate opri între fragmente prin cancel_event.
+    - stream_async() rulează pe un thread de lucru și întoarce un GeminiJob.
+    - opțional, fiecare generare ajunge în MetricsRegistry (latență, cost estimat din lungimea textelor).
+    """
+    def __init__(self, api_key, base_url=None, timeout=DEFAULT_TIMEOUT, max_workers=2, session=None, metrics=None):
+        self.api_key = api_key
+        self.metrics = metrics
+        self.base_url = (base_url or os.getenv("GEMINI_BASE_URL") or DEFAULT_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+
+    def build_payload(self, prompt, temperature=0.7, max_tokens=1024, response_schema=None):
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens
+            }
+        }
+        if response_schema:
+            # Ieșire structurată: modelul răspunde cu JSON conform schemei
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+        return payload
+
+    def stream(self, model, prompt, temperature=0.7, max_tokens=1024, on_chunk=None, cancel_event=None,
+               response_schema=None):
+        """Generează textul fragment cu fragment; returnează textul complet."""
+        if self.metrics is None:
+            return self._stream(model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema)
+        start = time.perf_counter()
+        try:
+            text = self._stream(model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema)
+        except GeminiCancelled:
+            self.metrics.record_call('gemini', model, time.perf_counter() - start, gemini_cost(prompt, ""))
+            raise
+        except Exception:
+            self.metrics.record_call('gemini', model, time.perf_counter() - start, gemini_cost(prompt, ""), error=True)
+            raise
+        self.metrics.record_call('gemini', model, time.perf_counter() - start, gemini_cost(prompt, text))
+        return text
+
+    def _stream(self, model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema):
+        url = f"{self.base_url}/models/{model}:streamGenerateContent"
+        params = {"alt": "sse", "key": self.api_key}
+        payload = self.build_payload(prompt, temperature, max_tokens, response_schema)
+
+        response = self.session.post(url, params=params, json=payload, stream=True,
+                                     headers={"Content-Type": "application/json"}, timeout=self.timeout)
+        try:
+            if response.status_code != 200:
+                raise GeminiError(f"{response.status_code} - {response.text[:500]}")
+
+            pieces = []
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise GeminiCancelled()
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if not data:
+                    continue
+                chunk = json.loads(data)
+                if 'error' in chunk:
+                    raise GeminiError(chunk['error'].get('message', str(chunk['error'])))
+                reason = block_reason(chunk)
+                if reason:
+                    raise GeminiError(f"Prompt blocat de model: {reason}")
+                text = extract_text(chunk)
+                if text:
+                    pieces.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+
+            if cancel_event is not None and cancel_event.is_set():
+                raise GeminiCancelled()
+            if not pieces:
+                raise GeminiError("Răspuns gol de la model.")
+            return "".join(pieces)
+        finally:
+            response.close()
+
+    def generate(self, model, prompt, temperature=0.7, max_tokens=1024, cancel_event=None, response_schema=None):
+        """Varianta blocantă (textul complet, fără callback)."""
+        return self.stream(model, prompt, temperature, max_tokens, None, cancel_event, response_schema)
+
+    def stream_async(self, model, prompt, temperature=0.7, max_tokens=1024, on_chunk=None):
+        cancel_event = threading.Event()
+        future = self.executor.submit(self.stream, model, prompt, temperature, max_tokens, on_chunk, cancel_event)
+        return GeminiJob(future, cancel_event)
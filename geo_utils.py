@@ -0,0 +1,93 @@
+import math
+
+
+# --- FUNCȚII GEOMETRICE ---
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """Calculează distanța în metri între două coordonate GPS."""
+    try:
+        R = 6371000  # Raza Pământului în metri
+        phi1 = math.radians(lat1)
+        phi2 = math.radians(lat2)
+        dphi = math.radians(lat2 - lat1)
+        dlambda = math.radians(lon2 - lon1)
+
+        a = math.sin(dphi / 2)**2 + \
+            math.cos(phi1) * math.cos(phi2) * \
+            math.sin(dlambda / 2)**2
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return R * c
+    except:
+        return 0.0
+
+def decode_polyline(polyline_str):
+    """Decodifică string-ul polyline de la Google într-o listă de (lat, lng)."""
+    index, lat, lng = 0, 0, 0
+    coordinates = []
+    changes = {'latitude': 0, 'longitude': 0}
+    while index < len(polyline_str):
+        for unit in ['latitude', 'longitude']:
+            shift, result = 0, 0
+            while True:
+                byte = ord(polyline_str[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if not byte >= 0x20:
+                    break
+            if (result & 1):
+                changes[unit] = ~(result >> 1)
+            else:
+                changes[unit] = (result >> 1)
+        lat += changes['latitude']
+        lng += changes['longitude']
+        coordinates.append((lat / 100000.0, lng / 100000.0))
+    return coordinates
+
+def encode_polyline(coordinates):
+    """Operația inversă lui decode_polyline: listă de (lat, lng) -> string polyline Google."""
+    output = []
+    prev_lat, prev_lng = 0, 0
+    for lat, lng in coordinates:
+        i_lat = int(round(lat * 100000))
+        i_lng = int(round(lng * 100000))
+        for delta in (i_lat - prev_lat, i_lng - prev_lng):
+            value = ~(delta << 1) if delta < 0 else (delta << 1)
+            while value >= 0x20:
+                output.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            output.append(chr(value + 63))
+        prev_lat, prev_lng = i_lat, i_lng
+    return "".join(output)
+
+def point_line_distance(point, start, end):
+    """
+    Calculează distanța minimă (în metri) de la punctul 'point'
+    la segmentul de linie definit de 'start' și 'end'.
+    """
+    lat0, lon0 = math.radians(point[0]), math.radians(point[1])
+    lat1, lon1 = math.radians(start[0]), math.radians(start[1])
+    lat2, lon2 = math.radians(end[0]), math.radians(end[1])
+
+    if lat1 == lat2 and lon1 == lon2:
+        return haversine_distance(point[0], point[1], start[0], start[1])
+
+    x = (lon0 - lon1) * math.cos((lat0 + lat1) / 2)
+    y = lat0 - lat1
+    dx = (lon2 - lon1) * math.cos((lat2 + lat1) / 2)
+    dy = lat2 - lat1
+
+    dot = x * dx + y * dy
+    len_sq = dx * dx + dy * dy
+    param = -1
+    if len_sq != 0:
+        param = dot / len_sq
+
+    if param < 0:
+        xx, yy = lon1, lat1
+    elif param > 1:
+        xx, yy = lon2, lat2
+    else:
+        xx = lon1 + param * dx
+        yy = lat1 + param * dy
+
+    return haversine_distance(point[0], point[1], math.degrees(lat1 + param*dy), math.degrees(lon1 + param*dx))
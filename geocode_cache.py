@@ -0,0 +1,99 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from atomic_io import write_json_atomic, DebouncedSaver
+
+# 4 zecimale ~ 11 m pe latitudine (~8 m pe longitudine la latitudinea României)
+SNAP_DECIMALS = 4
+
+
+class ReverseGeocodeCache:
+    """
+    Cache pentru reverse geocoding, cu coordonatele rotunjite la ~10 m.
+    - Rezultatele se păstrează pe disc între sesiuni (fișier JSON).
+    - Cererile simultane pentru aceeași celulă împart un singur apel în zbor (coalescing).
+    - Apelurile rulează pe un thread de lucru; apelantul primește un Future.
+    'resolver(lat, lng)' trebuie să ridice excepție la eșec, ca erorile să nu ajungă în cache.
+    """
+    def __init__(self, resolver, path=None, decimals=SNAP_DECIMALS, max_workers=2, save_every=10):
+        self.resolver = resolver
+        self.path = path
+        self.decimals = decimals
+        self.save_every = save_every
+        self.entries = {}   # "lat,lng" rotunjit -> adresă
+        self.inflight = {}  # "lat,lng" rotunjit -> Future
+        self.lock = threading.Lock()
+        self.saver = DebouncedSaver(self._write, 0)  # scrieri serializate (workeri + firul UI la închidere)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geocode")
+        self.unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def cell(self, lat, lng):
+        return f"{round(float(lat), self.decimals):.{self.decimals}f},{round(float(lng), self.decimals):.{self.decimals}f}"
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries.update(data)
+        except Exception as e:
+            print(f"Eroare încărcare cache geocoding: {e}")
+
+    def save(self):
+        """Scriere atomică, serializată între fire."""
+        if self.path:
+            self.saver.save_now()
+
+    def _write(self):
+        with self.lock:
+            snapshot = dict(self.entries)
+            self.unsaved = 0
+        try:
+            write_json_atomic(self.path, snapshot)
+        except Exception as e:
+            print(f"Eroare salvare cache geocoding: {e}")
+
+    def get_cached(self, lat, lng):
+        with self.lock:
+            return self.entries.get(self.cell(lat, lng))
+
+    def lookup_async(self, lat, lng):
+        """Returnează un Future cu adresa; refolosește cache-ul sau cererea deja în zbor."""
+        key = self.cell(lat, lng)
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                fut = Future()
+                fut.set_result(self.entries[key])
+                return fut
+            if key in self.inflight:
+                self.hits += 1
+                return self.inflight[key]
+            self.misses += 1
+            fut = self.executor.submit(self._resolve, key, lat, lng)
+            self.inflight[key] = fut
+            return fut
+
+    def lookup(self, lat, lng):
+        """Varianta blocantă (pentru cod care rulează deja în afara UI)."""
+        return self.lookup_async(lat, lng).result()
+
+    def _resolve(self, key, lat, lng):
+        try:
+            address = self.resolver(lat, lng)
+            with self.lock:
+                self.entries[key] = address
+                self.unsaved += 1
+                should_save = self.unsaved >= self.save_every
+            if should_save:
+                self.save()
+            return address
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
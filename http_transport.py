@@ -0,0 +1,243 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statusuri HTTP la care merită reîncercat (limită de rată / erori temporare de server)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Doar metodele idempotente se repetă; un POST (stream Gemini) poate fi deja procesat de server
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Statusuri pe care le reîncearcă deja clientul de deasupra, pe host: googlemaps.Client repetă
+# 500/503/504 în limita retry_timeout, deci adaptorul nu le mai înmulțește
+UPSTREAM_RETRIED = {
+    'maps.googleapis.com': (500, 503, 504),
+}
+
+# Timeout-uri (conectare, citire) în secunde, pe familie de endpoint
+DEFAULT_TIMEOUTS = {
+    'default': (5, 20),
+    'geocode': (5, 10),
+    'place/autocomplete': (3, 5),
+    'place/details': (5, 15),
+    'place/nearbysearch': (5, 20),
+    'place/textsearch': (5, 20),
+    'directions': (5, 30),
+    'distancematrix': (5, 30),
+    'gemini': (10, 60),  # la streaming: timpul maxim între două fragmente
+}
+
+# Limitele intervalelor histogramei de latență (ms); ultimul interval e "peste"
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def endpoint_name(url):
+    """
+    Numele scurt al unui endpoint, folosit pentru timeout-uri și statistici:
+    .../maps/api/place/nearbysearch/json -> 'place/nearbysearch', Gemini -> 'gemini'.
+    """
+    parsed = urlparse(url)
+    path = parsed.path
+    if 'generativelanguage' in parsed.netloc or ':generateContent' in path or ':streamGenerateContent' in path:
+        return 'gemini'
+    if '/maps/api/' in path:
+        name = path.split('/maps/api/', 1)[1]
+        if name.endswith('/json'):
+            name = name[:-5]
+        return name
+    return parsed.netloc or 'default'
+
+
+class LatencyHistogram:
+    """Histogramă simplă: număr de cereri pe intervale de latență + total/max."""
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, ms):
+        i = 0
+        while i < len(self.buckets) and ms > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.count += 1
+
+    def percentile(self, p):
+        """Aproximare: limita superioară a intervalului în care cade percentila p (0-100)."""
+        if not self.count: return 0
+        target = self.count * p / 100.0
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': round(self.total_ms / self.count, 1) if self.count else 0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': round(self.max_ms, 1),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'buckets': dict(zip([f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"], self.counts)),
+        }
+
+
+def response_size(response, stream):
+    """
+    Octeții primiți: corpul e citit aici dacă oricum urma să fie citit integral;
+    la streaming (Gemini) contează doar Content-Length, dacă serverul îl trimite.
+    """
+    if not stream:
+        return len(response.content)
+    try:
+        return int(response.headers.get('Content-Length', 0))
+    except ValueError:
+        return 0
+
+
+class TransportAdapter(HTTPAdapter):
+    """
+    Adaptor requests care aplică politica transportului pentru fiecare cerere:
+    timeout pe endpoint, reîncercări cu backoff exponențial + jitter pentru 429/5xx
+    (doar metode idempotente, fără statusurile reîncercate deja de client),
+    și măsurarea latenței și a volumului transferat.
+    """
+    def __init__(self, transport, **kwargs):
+        self.transport = transport
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        endpoint = endpoint_name(request.url)
+        kwargs['timeout'] = self.transport.timeout_for(endpoint)
+        sent = len(request.body or b'')
+        statuses = self.transport.retry_statuses_for(request)
+        max_retries = self.transport.max_retries if request.method in self.transport.retry_methods else 0
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.transport.record(endpoint, (time.perf_counter() - start) * 1000, error=True)
+                if attempt >= max_retries:
+                    raise
+                self.transport.sleep_before_retry(endpoint, attempt)
+                attempt += 1
+                continue
+
+            received = response_size(response, kwargs.get('stream'))
+            self.transport.record(endpoint, (time.perf_counter() - start) * 1000,
+                                  error=response.status_code >= 400, bytes_in=received, bytes_out=sent)
+            if response.status_code not in statuses or attempt >= max_retries:
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+            response.close()
+            self.transport.sleep_before_retry(endpoint, attempt, retry_after)
+            attempt += 1
+
+
+class HttpTransport:
+    """
+    Strat de transport comun pentru toate apelurile externe (Google Maps, Gemini):
+    o singură sesiune requests cu conexiuni keep-alive refolosite (pool),
+    timeout-uri pe endpoint, reîncercări cu jitter și histograme de latență.
+    Observatorii (add_observer) primesc fiecare cerere încheiată: (endpoint, secunde, octeți).
+    """
+    def __init__(self, timeouts=None, pool_size=16, max_retries=4, base_delay=0.5, max_delay=16.0,
+                 retry_methods=RETRY_METHODS, upstream_retried=None):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.max_retries = max_retries
+        self.retry_methods = retry_methods
+        self.upstream_retried = UPSTREAM_RETRIED if upstream_retried is None else upstream_retried
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.histograms = {}
+        self.observers = []
+        self.lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = TransportAdapter(self, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def timeout_for(self, endpoint):
+        if endpoint in self.timeouts:
+            return self.timeouts[endpoint]
+        family = endpoint.split('/')[0]
+        return self.timeouts.get(family, self.timeouts['default'])
+
+    def retry_statuses_for(self, request):
+        """Statusurile reîncercate de adaptor pentru cerere (niciunul pentru metode neidempotente)."""
+        if request.method not in self.retry_methods:
+            return ()
+        upstream = self.upstream_retried.get(urlparse(request.url).hostname, ())
+        return tuple(s for s in RETRY_STATUSES if s not in upstream)
+
+    def backoff_delay(self, attempt):
+        """Backoff exponențial cu 'full jitter': aleator între 0 și base * 2^attempt (plafonat)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def sleep_before_retry(self, endpoint, attempt, retry_after=None):
+        delay = self.backoff_delay(attempt)
+        if retry_after:
+            try:
+                delay = max(delay, min(self.max_delay, float(retry_after)))
+            except ValueError:
+                pass
+        with self.lock:
+            self.histogram(endpoint).retries += 1
+        time.sleep(delay)
+
+    def histogram(self, endpoint):
+        # Apelat cu lock-ul luat
+        if endpoint not in self.histograms:
+            self.histograms[endpoint] = LatencyHistogram()
+        return self.histograms[endpoint]
+
+    def add_observer(self, fn):
+        self.observers.append(fn)
+
+    def record(self, endpoint, ms, error=False, bytes_in=0, bytes_out=0):
+        with self.lock:
+            h = self.histogram(endpoint)
+            h.record(ms)
+            h.bytes_in += bytes_in
+            h.bytes_out += bytes_out
+            if error:
+                h.errors += 1
+        for fn in self.observers:
+            fn(endpoint, ms / 1000.0, bytes_in + bytes_out)
+
+    def stats(self):
+        with self.lock:
+            return {name: h.snapshot() for name, h in self.histograms.items()}
+
+    def summary(self):
+        """Un rând per endpoint, pentru log."""
+        lines = []
+        for name, s in sorted(self.stats().items()):
+            lines.append(f"{name}: {s['count']} cereri, medie {s['avg_ms']} ms, p50 ≤{s['p50_ms']} ms, "
+                         f"p95 ≤{s['p95_ms']} ms, max {s['max_ms']} ms, {s['bytes_in'] / 1024:.0f} KB primiți, "
+                         f"erori {s['errors']}, reîncercări {s['retries']}")
+        return "\n".join(lines)
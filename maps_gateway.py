@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_governor import API_COSTS, request_cost
+from single_flight import SingleFlight, request_key
+
+# Metode fără efecte secundare: cererile identice simultane pot împărți același răspuns
+COALESCED_METHODS = ('place', 'geocode', 'reverse_geocode', 'directions', 'distance_matrix',
+                     'places_nearby', 'places')
+
+# Câmpurile Place Details ale cardului unui loc (click pe marker / POI). Un click se alătură unei
+# cereri în zbor doar dacă aceasta acoperă toate câmpurile; altfel trimite propria cerere.
+PLACE_CARD_FIELDS = ['name', 'formatted_address', 'geometry', 'rating', 'user_ratings_total',
+                     'opening_hours', 'formatted_phone_number', 'website', 'type', 'price_level', 'vicinity']
+
+
+class MapsGateway:
+    """
+    Punctul unic prin care aplicația apelează Google Maps.
+    Are aceeași interfață ca googlemaps.Client (places_nearby, place, directions, ...):
+    - cererile identice aflate simultan în zbor sunt comasate (single-flight);
+    - metodele taxabile trec prin guvernatorul de cotă (o singură dată per cerere comasată);
+    - opțional, răspunsurile se păstrează într-un ResponseCache pe disc (scanările în lot);
+    - opțional, fiecare apel trimis la Google ajunge în MetricsRegistry (apeluri, latență, cost);
+    - restul atributelor merg direct la client.
+    """
+    def __init__(self, client, governor, max_workers=6, cache=None, metrics=None):
+        self.client = client
+        self.governor = governor
+        self.cache = cache
+        self.metrics = metrics
+        self.flights = SingleFlight()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="maps")
+        # Sarcinile compuse (mai multe cereri la rând) au pool separat: dacă ar aștepta
+        # în 'executor' o cerere comasată pusă la coadă tot acolo, s-ar putea bloca reciproc
+        self.tasks = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="maps-task")
+
+    def _send(self, method, args, kwargs):
+        key = None
+        if self.cache is not None and self.cache.cacheable(method, kwargs):
+            key = request_key(method, args, kwargs)
+            ttl_class = self.cache.ttl_class(method, kwargs)
+            cached = self.cache.get(key, ttl_class)
+            if cached is not None:
+                return cached
+        self.governor.acquire(method, kwargs)
+        start = time.perf_counter()
+        try:
+            response = getattr(self.client, method)(*args, **kwargs)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_call('maps', method, time.perf_counter() - start,
+                                         request_cost(method, kwargs), error=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_call('maps', method, time.perf_counter() - start, request_cost(method, kwargs))
+        if key is not None:
+            self.cache.put(key, ttl_class, response)
+        return response
+
+    def _flight(self, method, args, kwargs):
+        """
+        (cheie, meta, can_join) pentru coalescing, sau None dacă cererea nu se comasează.
+        Place Details se comasează pe place_id: o cerere în zbor al cărei set de câmpuri
+        le include pe cele cerute servește și apelantul nou; altfel acesta trimite propria cerere.
+        """
+        if method not in COALESCED_METHODS:
+            return None
+        if method != 'place':
+            return request_key(method, args, kwargs), None, None
+        if kwargs.get('session_token'):
+            return None  # sesiunile de autocomplete se facturează pe token, nu se amestecă
+        place_id = kwargs.get('place_id') or (args[0] if args else None)
+        rest = {k: v for k, v in kwargs.items() if k not in ('place_id', 'fields')}
+        fields = set(kwargs.get('fields') or [])
+        meta = fields or None  # None = toate câmpurile
+        can_join = lambda have: have is None or (bool(fields) and fields <= have)
+        return request_key('place', [place_id], rest), meta, can_join
+
+    def call(self, method, *args, **kwargs):
+        flight = self._flight(method, args, kwargs)
+        if flight is None:
+            return self._send(method, args, kwargs)
+        key, meta, can_join = flight
+        return self.flights.do(key, self._send, method, args, kwargs, meta=meta, can_join=can_join)
+
+    def call_async(self, method, *args, **kwargs):
+        """Future cu răspunsul; un apel echivalent deja în zbor e refolosit."""
+        flight = self._flight(method, args, kwargs)
+        if flight is None:
+            return self.executor.submit(self._send, method, args, kwargs)
+        key, meta, can_join = flight
+        return self.flights.do_async(self.executor, key, self._send, method, args, kwargs,
+                                     meta=meta, can_join=can_join)
+
+    def submit(self, fn, *args, **kwargs):
+        """Rulează în fundal o sarcină care face ea însăși apeluri prin gateway."""
+        return self.tasks.submit(fn, *args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name in API_COSTS and callable(attr):
+            return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        return attr
@@ -0,0 +1,181 @@
+import io
+import csv
+import time
+import threading
+
+from atomic_io import write_atomic
+from http_transport import LatencyHistogram
+from profiler import profiler
+
+# Estimare grosieră pentru Gemini: ~4 caractere pe token, preț per 1M tokeni (USD)
+CHARS_PER_TOKEN = 4
+GEMINI_USD_PER_1M_TOKENS = {'input': 0.30, 'output': 2.50}
+
+# Funcționalitatea căreia i se atribuie apelurile făcute în afara unei operații profilate
+DEFAULT_FEATURE = "interfață"
+
+
+def prometheus_labels(**labels):
+    """{cheie="valoare",...} cu ghilimelele și backslash-urile escapate."""
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def gemini_cost(prompt, text):
+    """Costul estimat al unei generări, după lungimea promptului și a răspunsului."""
+    tokens_in = len(prompt or "") / CHARS_PER_TOKEN
+    tokens_out = len(text or "") / CHARS_PER_TOKEN
+    return (tokens_in * GEMINI_USD_PER_1M_TOKENS['input'] + tokens_out * GEMINI_USD_PER_1M_TOKENS['output']) / 1e6
+
+
+class MetricsRegistry:
+    """
+    Registrul metricilor de API pentru sesiunea curentă:
+    - apeluri, erori și cost estimat pe (API, metodă, funcționalitate);
+    - histograme de latență pe (API, metodă), cu percentile;
+    - statisticile cache-urilor, citite la cerere din contoarele lor (register_cache).
+    Funcționalitatea (scan_hotspots, send_request, ...) e dată de feature_of(), de regulă
+    numele sesiunii de profilare active, ca să se vadă ce operație consumă cel mai mult.
+    """
+    def __init__(self, feature_of=None):
+        self.feature_of = feature_of
+        self.calls = {}      # (api, metodă, funcționalitate) -> [apeluri, erori, cost_usd]
+        self.latency = {}    # (api, metodă) -> LatencyHistogram
+        self.caches = {}     # nume -> funcție care întoarce {'hits': .., 'misses': ..}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def current_feature(self):
+        if self.feature_of is not None:
+            try:
+                feature = self.feature_of()
+                if feature:
+                    return feature
+            except Exception:
+                pass
+        return DEFAULT_FEATURE
+
+    def record_call(self, api, method, seconds, cost=0.0, error=False, feature=None):
+        feature = feature or self.current_feature()
+        with self.lock:
+            entry = self.calls.get((api, method, feature))
+            if entry is None:
+                entry = self.calls[(api, method, feature)] = [0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += bool(error)
+            entry[2] += cost
+            h = self.latency.get((api, method))
+            if h is None:
+                h = self.latency[(api, method)] = LatencyHistogram()
+            h.record(seconds * 1000)
+            if error:
+                h.errors += 1
+
+    def register_cache(self, name, stats_fn):
+        self.caches[name] = stats_fn
+
+    def cache_stats(self):
+        """nume -> {'hits', 'misses', 'hit_rate'} (hit_rate None dacă nu s-a cerut nimic)."""
+        result = {}
+        for name, stats_fn in list(self.caches.items()):
+            try:
+                s = stats_fn()
+            except Exception:
+                continue
+            hits = s.get('hits', 0); misses = s.get('misses', 0)
+            total = hits + misses
+            result[name] = {'hits': hits, 'misses': misses,
+                            'hit_rate': round(hits / total, 3) if total else None}
+        return result
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.latency.clear()
+            self.started = time.time()
+
+    def rows(self):
+        """Rânduri (api, metodă, funcționalitate, apeluri, erori, cost, p50, p95, medie), cele mai scumpe primele."""
+        with self.lock:
+            items = [(key, list(v)) for key, v in self.calls.items()]
+            lat = {key: h.snapshot() for key, h in self.latency.items()}
+        rows = []
+        for (api, method, feature), (calls, errors, cost) in items:
+            s = lat.get((api, method), {})
+            rows.append((api, method, feature, calls, errors, round(cost, 4),
+                         s.get('p50_ms'), s.get('p95_ms'), s.get('avg_ms')))
+        rows.sort(key=lambda r: (-r[5], -r[3]))
+        return rows
+
+    def totals(self):
+        with self.lock:
+            calls = sum(v[0] for v in self.calls.values())
+            errors = sum(v[1] for v in self.calls.values())
+            cost = sum(v[2] for v in self.calls.values())
+        return {'calls': calls, 'errors': errors, 'cost_usd': round(cost, 4),
+                'uptime_s': round(time.time() - self.started)}
+
+    def cost_by_feature(self):
+        with self.lock:
+            result = {}
+            for (api, method, feature), (calls, errors, cost) in self.calls.items():
+                result[feature] = result.get(feature, 0.0) + cost
+        return dict(sorted(result.items(), key=lambda kv: -kv[1]))
+
+    # --- Export ---
+
+    def to_prometheus(self):
+        """Formatul text Prometheus (exposition format 0.0.4)."""
+        label = prometheus_labels
+        with self.lock:
+            calls = [(key, list(v)) for key, v in self.calls.items()]
+            hists = [(key, list(h.buckets), list(h.counts), h.total_ms, h.count) for key, h in self.latency.items()]
+        lines = ["# HELP turist_api_calls_total Apeluri API pe metodă și funcționalitate.",
+                 "# TYPE turist_api_calls_total counter"]
+        lines += [f"turist_api_calls_total{label(api=a, method=m, feature=f)} {v[0]}" for (a, m, f), v in calls]
+        lines += ["# HELP turist_api_errors_total Apeluri API eșuate.",
+                  "# TYPE turist_api_errors_total counter"]
+        lines += [f"turist_api_errors_total{label(api=a, method=m, feature=f)} {v[1]}" for (a, m, f), v in calls]
+        lines += ["# HELP turist_api_cost_usd_total Cost estimat (USD).",
+                  "# TYPE turist_api_cost_usd_total counter"]
+        lines += [f"turist_api_cost_usd_total{label(api=a, method=m, feature=f)} {v[2]:.6f}" for (a, m, f), v in calls]
+        lines += ["# HELP turist_api_latency_seconds Latența apelurilor API.",
+                  "# TYPE turist_api_latency_seconds histogram"]
+        for (api, method), buckets, counts, total_ms, count in hists:
+            cumulative = 0
+            for bound, n in zip(buckets, counts):
+                cumulative += n
+                lines.append(f"turist_api_latency_seconds_bucket{label(api=api, method=method, le=bound / 1000)} {cumulative}")
+            lines.append(f"turist_api_latency_seconds_bucket{label(api=api, method=method, le='+Inf')} {count}")
+            lines.append(f"turist_api_latency_seconds_sum{label(api=api, method=method)} {total_ms / 1000:.6f}")
+            lines.append(f"turist_api_latency_seconds_count{label(api=api, method=method)} {count}")
+        caches = self.cache_stats()
+        lines += ["# HELP turist_cache_requests_total Cereri la cache, pe rezultat.",
+                  "# TYPE turist_cache_requests_total counter"]
+        for name, s in caches.items():
+            lines.append(f"turist_cache_requests_total{label(cache=name, result='hit')} {s['hits']}")
+            lines.append(f"turist_cache_requests_total{label(cache=name, result='miss')} {s['misses']}")
+        return "\n".join(lines) + "\n"
+
+    def to_csv(self):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(["api", "method", "feature", "calls", "errors", "cost_usd", "p50_ms", "p95_ms", "avg_ms"])
+        writer.writerows(self.rows())
+        writer.writerow([])
+        writer.writerow(["cache", "hits", "misses", "hit_rate"])
+        for name, s in self.cache_stats().items():
+            writer.writerow([name, s['hits'], s['misses'], s['hit_rate'] if s['hit_rate'] is not None else ""])
+        return buf.getvalue()
+
+    def export(self, path):
+        """Scrie în format Prometheus (.prom/.txt) sau CSV (.csv), după extensie."""
+        text = self.to_csv() if path.lower().endswith('.csv') else self.to_prometheus()
+        write_atomic(path, text)
+
+
+# Registrul comun al aplicației: apelurile se atribuie operației profilate în curs
+metrics = MetricsRegistry(feature_of=lambda: profiler.active.name if profiler.active else None)
@@ -0,0 +1,177 @@
+import os
+import json
+import uuid
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from atomic_io import write_json_atomic, DebouncedSaver
+
+# Cheia de final de nume din nodurile trie-ului (un obiect, ca să nu se confunde cu niciun caracter)
+TERMINAL = object()
+
+
+def normalize_name(text):
+    """Litere mici, fără diacritice și spații duble (pentru căutarea după prefix)."""
+    txt = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return " ".join(txt.lower().split())
+
+
+class PrefixTrie:
+    """Trie pe numele deja rezolvate: prefix -> locuri cunoscute (nume, coordonate, utilizări)."""
+    def __init__(self):
+        self.root = {}
+        self.entries = {}  # nume normalizat -> {'name', 'lat', 'lng', 'place_id', 'uses'}
+
+    def insert(self, name, lat, lng, place_id=None, uses=1):
+        key = normalize_name(name)
+        if not key: return
+        entry = self.entries.get(key)
+        if entry:
+            entry.update({'name': name, 'lat': lat, 'lng': lng})
+            if place_id: entry['place_id'] = place_id
+            entry['uses'] += uses
+            return
+        self.entries[key] = {'name': name, 'lat': lat, 'lng': lng, 'place_id': place_id, 'uses': uses}
+        node = self.root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[TERMINAL] = key
+
+    def exact(self, name):
+        return self.entries.get(normalize_name(name))
+
+    def search(self, prefix, limit=8):
+        """Locurile al căror nume începe cu prefixul, cele mai folosite primele."""
+        node = self.root
+        for ch in normalize_name(prefix):
+            node = node.get(ch)
+            if node is None: return []
+        found = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            for ch, child in n.items():
+                if ch is TERMINAL: found.append(self.entries[child])
+                else: stack.append(child)
+        found.sort(key=lambda e: e['uses'], reverse=True)
+        return found[:limit]
+
+    def to_list(self):
+        return list(self.entries.values())
+
+    def load_list(self, items):
+        for e in items:
+            try:
+                self.insert(e['name'], e['lat'], e['lng'], e.get('place_id'), e.get('uses', 1))
+            except (KeyError, TypeError):
+                continue
+
+
+class PlaceLookup:
+    """
+    Geocodare directă pentru câmpurile de start/destinație și căutarea pe hartă.
+    - Sugestiile vin întâi din trie-ul local (nume rezolvate anterior), apoi din Places Autocomplete.
+    - O sesiune de autocomplete (session token) ține de la prima tastare până la selecție,
+      ca Google să factureze sesiunea, nu fiecare tastă.
+    - Originile folosite des se rezolvă offline, direct din trie.
+    """
+    def __init__(self, client, path=None, language='ro', max_workers=2):
+        self.client = client
+        self.path = path
+        self.language = language
+        self.trie = PrefixTrie()
+        self.lock = threading.Lock()
+        self.saver = DebouncedSaver(self._write, 0)  # scrieri serializate între fire
+        self.session_token = None
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="autocomplete")
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.trie.load_list(json.load(f))
+        except Exception as e:
+            print(f"Eroare încărcare cache nume locuri: {e}")
+
+    def save(self):
+        if self.path:
+            self.saver.save_now()
+
+    def _write(self):
+        with self.lock:
+            data = self.trie.to_list()
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            print(f"Eroare salvare cache nume locuri: {e}")
+
+    def local_suggestions(self, prefix, limit=8):
+        with self.lock:
+            return [{'description': e['name'], 'place_id': e.get('place_id'), 'local': True}
+                    for e in self.trie.search(prefix, limit)]
+
+    def known(self, name):
+        """Locul rezolvat anterior cu exact acest nume (fără rețea) sau None."""
+        with self.lock:
+            return self.trie.exact(name)
+
+    def _session(self):
+        with self.lock:
+            if not self.session_token:
+                self.session_token = uuid.uuid4().hex
+            return self.session_token
+
+    def end_session(self):
+        with self.lock:
+            self.session_token = None
+
+    def _remote_suggestions(self, text, bias=None):
+        kwargs = {'input_text': text, 'session_token': self._session(), 'language': self.language}
+        if bias:
+            kwargs['location'] = bias
+            kwargs['radius'] = 50000
+        preds = self.client.places_autocomplete(**kwargs)
+        return [{'description': p.get('description', ''), 'place_id': p.get('place_id'), 'local': False}
+                for p in preds]
+
+    def suggest_async(self, text, bias=None):
+        """Future cu sugestiile de la Google pentru textul dat (în sesiunea curentă)."""
+        return self.executor.submit(self._remote_suggestions, text, bias)
+
+    def _remember(self, name, lat, lng, place_id=None):
+        with self.lock:
+            self.trie.insert(name, lat, lng, place_id)
+        self.save()
+
+    def _resolve(self, description, place_id=None):
+        with self.lock:
+            known = self.trie.exact(description)
+        if known:
+            # Rezolvare offline; închidem sesiunea fără cerere Place Details
+            self.end_session()
+            self._remember(known['name'], known['lat'], known['lng'], known.get('place_id'))
+            return known['lat'], known['lng'], known['name']
+
+        if place_id:
+            details = self.client.place(place_id=place_id, session_token=self._session(),
+                                        fields=['name', 'geometry', 'formatted_address'], language=self.language)
+            self.end_session()
+            res = details.get('result', {})
+            loc = res.get('geometry', {}).get('location', {})
+            if 'lat' not in loc: return None
+            self._remember(description, loc['lat'], loc['lng'], place_id)
+            return loc['lat'], loc['lng'], description
+
+        # Text liber (fără sugestie aleasă): geocodare clasică
+        self.end_session()
+        result = self.client.geocode(description, language=self.language)
+        if not result: return None
+        loc = result[0]['geometry']['location']
+        self._remember(description, loc['lat'], loc['lng'], result[0].get('place_id'))
+        return loc['lat'], loc['lng'], result[0].get('formatted_address', description)
+
+    def resolve_async(self, description, place_id=None):
+        """Future cu (lat, lng, nume) sau None dacă locul nu a fost găsit."""
+        return self.executor.submit(self._resolve, description, place_id)
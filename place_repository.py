@@ -0,0 +1,212 @@
+import threading
+from collections import OrderedDict
+
+MODES = ('circular', 'linear')
+
+
+class PlaceRecord:
+    """
+    Un loc (Google, custom sau waypoint), o singură copie pentru toată aplicația:
+    datele cardului din traseu, coordonatele și informațiile de distanță din ultima căutare.
+    """
+    __slots__ = ('place_id', 'name', 'address', 'lat', 'lng', 'rating', 'reviews_count', 'is_open_status',
+                 'types', 'website', 'route_info', 'initial_color', 'distance')
+
+    FIELDS = ('name', 'address', 'lat', 'lng', 'rating', 'reviews_count', 'is_open_status',
+              'types', 'website', 'route_info', 'initial_color', 'distance')
+
+    def __init__(self, place_id, name="", address="", lat=None, lng=None, rating='N/A', reviews_count=0,
+                 is_open_status='Program necunoscut', types=None, website=None, route_info=None,
+                 initial_color=None, distance=None):
+        self.place_id = place_id
+        self.name = name
+        self.address = address
+        self.lat = lat
+        self.lng = lng
+        self.rating = rating
+        self.reviews_count = reviews_count
+        self.is_open_status = is_open_status
+        self.types = types or []
+        self.website = website
+        self.route_info = route_info
+        self.initial_color = initial_color
+        self.distance = distance  # {'distance_text', 'driving_duration', ...} din get_distance_info
+
+    @property
+    def coords(self):
+        """(lat, lng) sau None dacă locul nu are coordonate cunoscute."""
+        if self.lat is None or self.lng is None:
+            return None
+        return (self.lat, self.lng)
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __repr__(self):
+        return f"PlaceRecord({self.place_id!r}, {self.name!r})"
+
+
+class PlaceRepository:
+    """
+    Depozitul locurilor din memorie, cheiate după place_id, cu indexuri secundare:
+    - traseul fiecărui mod ('circular', 'linear'): place_id-urile în ordinea traseului;
+    - rezultatele ultimei căutări (răspunsurile Google, în ordinea afișării).
+    Toate căutările sunt O(1); un loc prezent în ambele trasee și în căutare are o singură înregistrare.
+    Înregistrările rămase fără traseu și fără căutare se scot doar când cardurile afișate sunt
+    înlocuite (o căutare nouă, prune() la o scanare nouă): un card încă afișat poate fi scos din
+    traseu și readăugat fără să-și piardă coordonatele.
+    Ascultătorii (subscribe) primesc (eveniment, place_id): 'updated', 'route_added', 'route_removed',
+    'route_order', 'route_cleared', 'search' (place_id None pentru evenimentele pe tot indexul).
+    Se folosește de pe firul interfeței; lock-ul protejează doar structurile, nu ordinea notificărilor.
+    """
+    def __init__(self):
+        self.records = {}
+        self.routes = {mode: OrderedDict() for mode in MODES}  # mod -> place_id -> None (ordonat)
+        self.search = OrderedDict()                            # place_id -> rezultatul Google
+        self.listeners = []
+        self.lock = threading.RLock()
+
+    # --- Notificări ---
+
+    def subscribe(self, fn):
+        self.listeners.append(fn)
+
+    def _notify(self, event, place_id=None):
+        for fn in list(self.listeners):
+            try:
+                fn(event, place_id)
+            except Exception as e:
+                print(f"Eroare ascultător depozit locuri: {e}")
+
+    # --- Înregistrări ---
+
+    def get(self, place_id):
+        return self.records.get(place_id)
+
+    def __contains__(self, place_id):
+        return place_id in self.records
+
+    def upsert(self, place_id, **fields):
+        """Creează sau actualizează înregistrarea; se scriu doar câmpurile date explicit."""
+        with self.lock:
+            record = self.records.get(place_id)
+            if record is None:
+                record = self.records[place_id] = PlaceRecord(place_id)
+            for name, value in fields.items():
+                if name not in PlaceRecord.FIELDS:
+                    raise AttributeError(f"PlaceRecord nu are câmpul '{name}'")
+                setattr(record, name, value)
+        self._notify('updated', place_id)
+        return record
+
+    def remember_coords(self, place_id, lat, lng, name=None):
+        """Coordonatele unui loc văzut pe hartă / în scanare; numele se pune doar la o înregistrare nouă
+        (cel din traseu, ex: cu prefixul '[..] ', rămâne neschimbat)."""
+        if place_id in self.records or not name:
+            return self.upsert(place_id, lat=lat, lng=lng)
+        return self.upsert(place_id, name=name, lat=lat, lng=lng)
+
+    def coords(self, place_id):
+        record = self.records.get(place_id)
+        return record.coords if record is not None else None
+
+    def name(self, place_id, default=None):
+        record = self.records.get(place_id)
+        return record.name if record is not None else default
+
+    def _prune(self, place_ids):
+        """Scoate înregistrările nereferite de niciun traseu și de căutare."""
+        for pid in place_ids:
+            if pid not in self.search and not any(pid in route for route in self.routes.values()):
+                self.records.pop(pid, None)
+
+    def prune(self):
+        """
+        Scoate toate înregistrările care nu sunt în niciun traseu și nici în căutarea curentă
+        (ex: doar coordonate din scanări, click-uri pe POI, carduri afișate anterior).
+        Se apelează când o operație nouă înlocuiește cardurile afișate; întoarce numărul lor.
+        """
+        with self.lock:
+            before = len(self.records)
+            self._prune(list(self.records))
+            return before - len(self.records)
+
+    # --- Trasee (index pe mod) ---
+
+    def route(self, mode):
+        """place_id-urile traseului, în ordine."""
+        return list(self.routes[mode])
+
+    def route_records(self, mode):
+        return [self.records[pid] for pid in self.routes[mode] if pid in self.records]
+
+    def in_route(self, place_id, mode):
+        return place_id in self.routes[mode]
+
+    def route_size(self, mode):
+        return len(self.routes[mode])
+
+    def add_to_route(self, place_id, mode, **fields):
+        """Adaugă locul la finalul traseului (dacă nu e deja), actualizând câmpurile date."""
+        self.upsert(place_id, **fields)
+        with self.lock:
+            added = place_id not in self.routes[mode]
+            self.routes[mode][place_id] = None
+        if added:
+            self._notify('route_added', place_id)
+
+    def remove_from_route(self, place_id, mode):
+        with self.lock:
+            removed = self.routes[mode].pop(place_id, False) is not False
+        if removed:
+            self._notify('route_removed', place_id)
+        return removed
+
+    def set_route_order(self, mode, place_ids):
+        """Reordonează traseul; id-urile necunoscute traseului sunt ignorate, cele lipsă rămân la final."""
+        with self.lock:
+            route = self.routes[mode]
+            ordered = OrderedDict((pid, None) for pid in place_ids if pid in route)
+            for pid in route:
+                ordered.setdefault(pid, None)
+            self.routes[mode] = ordered
+        self._notify('route_order')
+
+    def clear_route(self, mode):
+        with self.lock:
+            self.routes[mode].clear()
+        self._notify('route_cleared')
+
+    # --- Rezultatele căutării ---
+
+    def set_search_results(self, results, distance_info=None):
+        """Înlocuiește rezultatele ultimei căutări; coordonatele și distanțele intră în înregistrări."""
+        distance_info = distance_info or {}
+        with self.lock:
+            previous = list(self.search)
+            self.search = OrderedDict()
+            for place in results:
+                pid = place.get('place_id')
+                if not pid: continue
+                self.search[pid] = place
+                loc = place.get('geometry', {}).get('location', {})
+                record = self.records.get(pid)
+                if record is None:
+                    record = self.records[pid] = PlaceRecord(pid, name=place.get('name', ''))
+                if loc.get('lat') is not None and loc.get('lng') is not None:
+                    record.lat, record.lng = loc['lat'], loc['lng']
+                if pid in distance_info:
+                    record.distance = distance_info[pid]
+            self._prune(previous)
+        self._notify('search')
+
+    def search_results(self):
+        return list(self.search.values())
+
+    def search_result(self, place_id):
+        return self.search.get(place_id)
+
+    def distance_info(self):
+        """{place_id: distanță} pentru rezultatele căutării curente (formatul create_place_card)."""
+        return {pid: self.records[pid].distance for pid in self.search
+                if pid in self.records and self.records[pid].distance}
@@ -0,0 +1,156 @@
+import time
+import datetime
+import threading
+import functools
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class Profile:
+    """
+    Profilul unei operații (o scanare, o căutare, un traseu): pentru fiecare fază
+    (cale de span-uri imbricate, ex: 'scan_area/collect/places_nearby') numărul de apeluri,
+    timpul total și maxim, și octeții transferați. Cererile HTTP apar separat sub 'http/<endpoint>':
+    rulează pe firele pool-urilor, deci se pot suprapune între ele și cu fazele.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.datetime.now()
+        self.t0 = time.perf_counter()
+        self.wall = None
+        self.nodes = OrderedDict()  # cale -> [apeluri, total_s, max_s, octeți]
+        self.lock = threading.Lock()
+
+    def add(self, path, seconds, nbytes=0):
+        with self.lock:
+            node = self.nodes.get(path)
+            if node is None:
+                node = self.nodes[path] = [0, 0.0, 0.0, 0]
+            node[0] += 1
+            node[1] += seconds
+            node[2] = max(node[2], seconds)
+            node[3] += nbytes
+
+    def finish(self):
+        if self.wall is None:
+            self.wall = time.perf_counter() - self.t0
+
+    def title(self):
+        wall = self.wall if self.wall is not None else time.perf_counter() - self.t0
+        return f"{self.started_at.strftime('%H:%M:%S')} {self.name} ({wall:.2f}s)"
+
+    def summary(self):
+        """Tabel text: o fază pe rând, indentată după nivel, cu procentul din timpul total."""
+        with self.lock:
+            nodes = list(self.nodes.items())
+        wall = self.wall if self.wall is not None else time.perf_counter() - self.t0
+        lines = [f"⏱️ PROFIL {self.name} - total {wall * 1000:.0f} ms",
+                 f"{'FAZĂ':<44} | {'APELURI':>7} | {'TOTAL ms':>9} | {'MAX ms':>8} | {'%':>5} | {'KB':>8}",
+                 "-" * 96]
+        # Fazele în ordinea ierarhiei, cererile HTTP la final
+        nodes.sort(key=lambda kv: (kv[0].startswith('http/'), kv[0]))
+        for path, (calls, total, peak, nbytes) in nodes:
+            depth = path.count('/')
+            label = ("  " * depth + path.rsplit('/', 1)[-1]) if not path.startswith('http/') else path
+            pct = 100.0 * total / wall if wall else 0.0
+            kb = f"{nbytes / 1024:.1f}" if nbytes else ""
+            lines.append(f"{label[:44]:<44} | {calls:>7} | {total * 1000:>9.1f} | {peak * 1000:>8.1f} | {pct:>5.1f} | {kb:>8}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        with self.lock:
+            return {'name': self.name, 'started_at': self.started_at.isoformat(timespec='seconds'),
+                    'wall_s': self.wall,
+                    'phases': {p: {'calls': n[0], 'total_s': round(n[1], 4), 'max_s': round(n[2], 4), 'bytes': n[3]}
+                               for p, n in self.nodes.items()}}
+
+
+class Profiler:
+    """
+    Instrumentare ușoară pe faze (span-uri imbricate), activă doar cât rulează o sesiune:
+    în afara unei sesiuni, span() nu măsoară nimic, deci poate rămâne în codul de producție.
+    Ultimele profiluri se păstrează pentru panoul de diagnostic; on_finish(profile) le scrie în log.
+    """
+    def __init__(self, keep=20):
+        self.active = None
+        self.local = threading.local()
+        self.history = deque(maxlen=keep)
+        self.lock = threading.Lock()
+        self.on_finish = None
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def start(self, name):
+        """Pornește o sesiune (dacă nu e deja una activă); întoarce profilul sau None."""
+        with self.lock:
+            if self.active is not None:
+                return None
+            self.active = Profile(name)
+        self._stack().clear()
+        return self.active
+
+    def finish(self, profile):
+        """Încheie sesiunea pornită cu start(); None (sesiune imbricată) e ignorat."""
+        if profile is None: return
+        profile.finish()
+        with self.lock:
+            if self.active is profile:
+                self.active = None
+            self.history.append(profile)
+        if self.on_finish:
+            try:
+                self.on_finish(profile)
+            except Exception as e:
+                print(f"Eroare la raportarea profilului: {e}")
+
+    @contextmanager
+    def session(self, name):
+        profile = self.start(name)
+        try:
+            yield profile
+        finally:
+            self.finish(profile)
+
+    @contextmanager
+    def span(self, name):
+        profile = self.active
+        if profile is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(name)
+        path = "/".join(stack)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.add(path, time.perf_counter() - t0)
+            stack.pop()
+
+    def record_io(self, endpoint, seconds, nbytes=0):
+        """O cerere HTTP încheiată (apelată de transport, de pe orice fir)."""
+        profile = self.active
+        if profile is not None:
+            profile.add(f"http/{endpoint}", seconds, nbytes)
+
+
+def profiled(name):
+    """Decorator: funcția devine o fază a sesiunii curente, sau își deschide propria sesiune."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if profiler.active is not None:
+                with profiler.span(name):
+                    return fn(*args, **kwargs)
+            with profiler.session(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Profilerul comun al aplicației
+profiler = Profiler()
@@ -0,0 +1,89 @@
+import math
+import heapq
+
+from geo_utils import haversine_distance
+
+# Ponderile formulei de scor (configurabile din starea aplicației)
+DEFAULT_RANKING_WEIGHTS = {
+    'reviews': 1.0,    # popularitate: log(voturi), normalizat la REVIEWS_REF
+    'rating': 0.4,     # nota: 3.0 -> 0, 5.0 -> 1
+    'distance': 0.2,   # apropierea de centru: 1 în centru, 0 la marginea razei
+    'diversity': 0.3,  # penalizare pentru fiecare loc deja ales din aceeași categorie
+}
+
+# Numărul de voturi la care termenul de popularitate ajunge la 1
+REVIEWS_REF = 20000
+
+# Prioritate pentru categoriile sub minimul cerut (le umple înaintea oricărui alt loc)
+MIN_QUOTA_BOOST = 1000.0
+
+
+class ScoreFormula:
+    """
+    Scorul unui candidat de scanare: sumă ponderată de termeni normalizați în [0, 1],
+    minus o penalizare de diversitate care crește cu numărul de locuri deja alese din categorie.
+    """
+    def __init__(self, weights=None, center=None, radius_m=1500):
+        self.weights = dict(DEFAULT_RANKING_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.center = center
+        self.radius_m = max(1, radius_m)
+
+    def base(self, cand):
+        w = self.weights
+        reviews = cand.get('reviews', 0) or 0
+        rating = cand.get('rating', 0) or 0
+        score = w['reviews'] * min(1.0, math.log1p(reviews) / math.log1p(REVIEWS_REF))
+        score += w['rating'] * max(0.0, min(1.0, (rating - 3.0) / 2.0))
+        if self.center and 'lat' in cand:
+            dist = haversine_distance(self.center[0], self.center[1], cand['lat'], cand['lng'])
+            score += w['distance'] * max(0.0, 1.0 - dist / self.radius_m)
+        return score
+
+    def score(self, cand, picked_in_category=0):
+        # 0 pentru primul loc din categorie, apoi tinde spre -w (1/2, 2/3, ...)
+        return self.base(cand) - self.weights['diversity'] * (1.0 - 1.0 / (1 + picked_in_category))
+
+
+def select_top_k(candidates, k, formula, category_of, caps=None, counts=None, exempt=None):
+    """
+    Alege cei mai buni k candidați într-o singură trecere cu heap (lazy greedy):
+    - caps: {categorie: {'min': n, 'max': m}}; categoriile sub 'min' au prioritate,
+      cele ajunse la 'max' nu mai primesc locuri;
+    - counts: câte locuri are deja fiecare categorie (inventarul de pornire);
+    - exempt(cand) -> True pentru candidații care ignoră plafoanele (ex: locurile custom).
+    Scorul depinde de câte locuri s-au ales deja din categorie, așa că la extragere
+    candidatul e re-evaluat și, dacă a scăzut, e pus înapoi în heap.
+    Returnează (aleși, respinși_de_plafon), aleșii în ordinea selecției.
+    """
+    caps = caps or {}
+    counts = dict(counts or {})
+
+    def key(cand, cat):
+        n = counts.get(cat, 0)
+        boost = MIN_QUOTA_BOOST if n < caps.get(cat, {}).get('min', 0) else 0.0
+        return boost + formula.score(cand, n)
+
+    heap = []
+    for seq, cand in enumerate(candidates):
+        heap.append((-key(cand, category_of(cand)), seq, cand))
+    heapq.heapify(heap)
+
+    chosen = []
+    rejected = []
+    while heap and len(chosen) < k:
+        neg_key, seq, cand = heapq.heappop(heap)
+        cat = category_of(cand)
+        free = exempt is not None and exempt(cand)
+        if not free and counts.get(cat, 0) >= caps.get(cat, {}).get('max', float('inf')):
+            rejected.append(cand)
+            continue
+        current = key(cand, cat)
+        if current < -neg_key - 1e-9:
+            heapq.heappush(heap, (-current, seq, cand))
+            continue
+        chosen.append(cand)
+        if not free:
+            counts[cat] = counts.get(cat, 0) + 1
+    return chosen, rejected
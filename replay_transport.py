@@ -0,0 +1,239 @@
+"""
+Înregistrare / redare a apelurilor Google Maps și Gemini, pentru dezvoltare offline și teste de încărcare.
+
+Modul se alege din mediu (sau din .env):
+    TURIST_API_MODE=live      # implicit: apeluri reale
+    TURIST_API_MODE=record    # apeluri reale, perechile cerere/răspuns se salvează în fixture store
+    TURIST_API_MODE=replay    # fără rețea: răspunsurile vin din fixture store
+    TURIST_FIXTURES=cale      # implicit fixtures/api_fixtures.jsonl.gz lângă aplicație
+    TURIST_REPLAY_LATENCY_MS=120        # latență artificială la redare (fixă)
+    TURIST_REPLAY_LATENCY_MS=50-300     # ... sau uniformă într-un interval
+
+Stratul stă sub MapsGateway, deci guvernatorul, single-flight, metricile și fan-out-ul
+paralel (detalii, tronsoane) rulează exact ca în producție.
+"""
+import os
+import gzip
+import json
+import time
+import atexit
+import random
+import threading
+
+from atomic_io import write_atomic
+from single_flight import request_key
+from gemini_client import GeminiClient, GeminiCancelled
+
+MODES = ('live', 'record', 'replay')
+DEFAULT_FIXTURES = os.path.join("fixtures", "api_fixtures.jsonl.gz")
+
+# Argumente care diferă la fiecare rulare și nu trebuie să intre în cheia cererii
+VOLATILE_ARGS = ('session_token',)
+
+
+class ReplayMiss(KeyError):
+    """Cererea nu există în fixture store (în modul replay nu se iese în rețea)."""
+
+
+def fixture_key(method, args, kwargs):
+    stable = {k: v for k, v in kwargs.items() if k not in VOLATILE_ARGS}
+    return request_key(method, args, stable)
+
+
+def parse_latency(value):
+    """'120' -> (0.12, 0.12); '50-300' -> (0.05, 0.3); gol -> (0, 0)."""
+    if not value:
+        return (0.0, 0.0)
+    lo, _, hi = str(value).partition('-')
+    lo = float(lo) / 1000.0
+    hi = float(hi) / 1000.0 if hi else lo
+    return (min(lo, hi), max(lo, hi))
+
+
+class FixtureStore:
+    """
+    Perechi cerere/răspuns într-un fișier JSON Lines comprimat gzip: un rând {"k", "m", "r"} per răspuns.
+    Aceeași cerere poate avea mai multe răspunsuri înregistrate (ex: paginare); la redare
+    se servesc în ordine, iar după ultimul se repetă ultimul.
+    Înregistrările noi se adaugă în loturi (un membru gzip per lot), fără rescrierea fișierului.
+    """
+    def __init__(self, path, flush_every=20):
+        self.path = path
+        self.flush_every = flush_every
+        self.entries = {}   # cheie -> [răspunsuri]
+        self.methods = {}   # cheie -> metodă
+        self.cursors = {}   # cheie -> următorul index la redare
+        self.pending = []
+        self.lock = threading.Lock()
+        self.load()
+        atexit.register(self.flush)
+
+    def load(self):
+        if not os.path.exists(self.path): return
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue  # rând trunchiat (oprire în timpul scrierii)
+                    self.entries.setdefault(item['k'], []).append(item['r'])
+                    self.methods[item['k']] = item['m']
+        except (EOFError, gzip.BadGzipFile) as e:
+            # Ultimul membru gzip rupt (oprire în timpul scrierii): rămân răspunsurile citite până acolo;
+            # fișierul se rescrie, altfel înregistrările adăugate după partea ruptă nu s-ar mai putea citi
+            print(f"Fixture store trunchiat ({self.path}): {e}; păstrez {len(self)} răspunsuri")
+            self.rewrite()
+
+    def rewrite(self):
+        """Rescrie fișierul (atomic) cu răspunsurile din memorie, în ordinea fiecărei cereri."""
+        lines = [json.dumps({'k': key, 'm': self.methods.get(key, '?'), 'r': response}, ensure_ascii=False, default=str)
+                 for key, responses in self.entries.items() for response in responses]
+        text = "".join(line + "\n" for line in lines)
+        write_atomic(self.path, gzip.compress(text.encode('utf-8')))
+
+    def __len__(self):
+        return sum(len(v) for v in self.entries.values())
+
+    def record(self, key, method, response):
+        with self.lock:
+            self.entries.setdefault(key, []).append(response)
+            self.methods[key] = method
+            self.pending.append(json.dumps({'k': key, 'm': method, 'r': response}, ensure_ascii=False, default=str))
+            should_flush = len(self.pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+            if not lines: return
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+
+    def next_response(self, key):
+        with self.lock:
+            responses = self.entries.get(key)
+            if not responses:
+                raise ReplayMiss(key)
+            i = self.cursors.get(key, 0)
+            self.cursors[key] = i + 1
+            return json.loads(json.dumps(responses[min(i, len(responses) - 1)]))  # copie independentă
+
+    def by_method(self):
+        """{metodă: [răspunsuri]} - formatul fixture-urilor din benchmarks/."""
+        with self.lock:
+            result = {}
+            for key, responses in self.entries.items():
+                result.setdefault(self.methods.get(key, '?'), []).extend(responses)
+            return result
+
+
+class RecordingClient:
+    """Înfășoară googlemaps.Client: fiecare apel reușit se salvează în store."""
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+        def call(*args, **kwargs):
+            response = attr(*args, **kwargs)
+            self.store.record(fixture_key(name, args, kwargs), name, response)
+            return response
+        return call
+
+
+class ReplayClient:
+    """Înlocuiește googlemaps.Client: răspunsurile vin din store, cu latență artificială."""
+    def __init__(self, store, latency=(0.0, 0.0), seed=None):
+        self.store = store
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def _sleep(self):
+        lo, hi = self.latency
+        if hi <= 0: return
+        with self.lock:
+            delay = self.random.uniform(lo, hi)
+        time.sleep(delay)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        def call(*args, **kwargs):
+            self._sleep()
+            return self.store.next_response(fixture_key(name, args, kwargs))
+        return call
+
+
+class RecordingGeminiClient(GeminiClient):
+    """GeminiClient care păstrează textul fiecărei generări reușite."""
+    def __init__(self, api_key, store, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.store = store
+
+    def _stream(self, model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema):
+        text = super()._stream(model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema)
+        self.store.record(fixture_key('gemini', [model, prompt], {'schema': response_schema}), 'gemini', text)
+        return text
+
+
+class ReplayGeminiClient(GeminiClient):
+    """GeminiClient fără rețea: textul înregistrat, livrat în câteva fragmente (ca la streaming)."""
+    def __init__(self, api_key, store, latency=(0.0, 0.0), chunks=8, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.store = store
+        self.latency = latency
+        self.chunks = chunks
+
+    def _stream(self, model, prompt, temperature, max_tokens, on_chunk, cancel_event, response_schema):
+        text = self.store.next_response(fixture_key('gemini', [model, prompt], {'schema': response_schema}))
+        step = max(1, len(text) // self.chunks)
+        delay = random.uniform(*self.latency) / self.chunks if self.latency[1] > 0 else 0
+        for i in range(0, len(text), step):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GeminiCancelled()
+            if delay:
+                time.sleep(delay)
+            if on_chunk:
+                on_chunk(text[i:i + step])
+        return text
+
+
+class ApiMode:
+    """Configurația din mediu: modul, fixture store-ul comun și latența de redare."""
+    def __init__(self, base_path="."):
+        self.mode = (os.getenv("TURIST_API_MODE") or "live").strip().lower()
+        if self.mode not in MODES:
+            raise ValueError(f"TURIST_API_MODE necunoscut: '{self.mode}' (live, record, replay)")
+        path = os.getenv("TURIST_FIXTURES") or DEFAULT_FIXTURES
+        self.path = path if os.path.isabs(path) else os.path.join(base_path, path)
+        self.latency = parse_latency(os.getenv("TURIST_REPLAY_LATENCY_MS"))
+        self.store = FixtureStore(self.path) if self.mode != 'live' else None
+
+    def describe(self):
+        if self.mode == 'live':
+            return "live"
+        extra = f", latență {self.latency[0] * 1000:.0f}-{self.latency[1] * 1000:.0f} ms" if self.mode == 'replay' else ""
+        return f"{self.mode} ({self.path}, {len(self.store)} răspunsuri{extra})"
+
+    def maps_client(self, make_client):
+        """make_client() construiește googlemaps.Client; în replay nu se mai apelează deloc."""
+        if self.mode == 'replay':
+            return ReplayClient(self.store, self.latency)
+        client = make_client()
+        return RecordingClient(client, self.store) if self.mode == 'record' else client
+
+    def gemini_client(self, api_key, **kwargs):
+        if self.mode == 'replay':
+            return ReplayGeminiClient(api_key, self.store, self.latency, **kwargs)
+        if self.mode == 'record':
+            return RecordingGeminiClient(api_key, self.store, **kwargs)
+        return GeminiClient(api_key, **kwargs)
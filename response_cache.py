@@ -0,0 +1,84 @@
+import json
+import time
+import sqlite3
+import threading
+
+# Durata de viață a răspunsurilor păstrate (secunde), pe metodă googlemaps.
+# 'place_hours': Place Details cu program — open_now se schimbă în cursul zilei
+DEFAULT_TTL = {
+    'places_nearby': 7 * 86400,
+    'place': 7 * 86400,
+    'place_hours': 15 * 60,
+    'geocode': 30 * 86400,
+    'directions': 86400,
+}
+
+
+class ResponseCache:
+    """
+    Cache de răspunsuri Google Maps pe disc (SQLite), comun mai multor procese:
+    scanările în lot pentru orașe învecinate sau reluate nu mai plătesc aceleași cereri.
+    Fiecare fir are conexiunea lui; modul WAL permite citiri simultane cu o scriere.
+    Paginarea nu se păstrează: cererile cu page_token, dar nici răspunsurile care au
+    next_page_token (un token din cache ar fi deja expirat când pagina următoare e cerută).
+    """
+    def __init__(self, path, ttl=None):
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL)
+        if ttl:
+            self.ttl.update(ttl)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                     "key TEXT PRIMARY KEY, method TEXT, body TEXT, stored_at REAL)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self.local.conn = conn
+        return conn
+
+    def cacheable(self, method, kwargs):
+        return method in self.ttl and not kwargs.get('page_token')
+
+    def ttl_class(self, method, kwargs):
+        """Clasa de TTL a cererii: Place Details care întoarce opening_hours (cerut sau toate câmpurile) expiră repede."""
+        if method == 'place':
+            fields = kwargs.get('fields')
+            if not fields or 'opening_hours' in fields:
+                return 'place_hours'
+        return method
+
+    def get(self, key, method):
+        row = self._conn().execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        fresh = row is not None and time.time() - row[1] <= self.ttl.get(method, 0)
+        with self.lock:
+            if fresh: self.hits += 1
+            else: self.misses += 1
+        return json.loads(row[0]) if fresh else None
+
+    def put(self, key, method, response):
+        if isinstance(response, dict) and response.get('next_page_token'):
+            return
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO responses (key, method, body, stored_at) VALUES (?, ?, ?, ?)",
+                     (key, method, json.dumps(response, ensure_ascii=False, default=str), time.time()))
+        conn.commit()
+
+    def purge(self):
+        """Șterge răspunsurile expirate."""
+        conn = self._conn()
+        now = time.time()
+        for method, ttl in self.ttl.items():
+            conn.execute("DELETE FROM responses WHERE method = ? AND stored_at < ?", (method, now - ttl))
+        conn.commit()
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
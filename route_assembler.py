@@ -0,0 +1,210 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from geo_utils import decode_polyline, encode_polyline
+
+# Limita Google Directions: maxim 25 puncte intermediare pe cerere (+ origine + destinație)
+MAX_WAYPOINTS = 25
+
+
+def point_key(point):
+    """
+    Normalizează un punct ('lat,lng', 'place_id:...', text) pentru cheia de cache.
+    Doar adresele text se trec în litere mici: place_id-urile diferă și prin majuscule.
+    """
+    txt = str(point).strip()
+    if txt.startswith('place_id:'):
+        return txt
+    parts = txt.split(',')
+    if len(parts) == 2:
+        try:
+            return f"{float(parts[0]):.6f},{float(parts[1]):.6f}"
+        except ValueError:
+            pass
+    return txt.lower()
+
+
+def leg_path(leg):
+    """Geometria unui 'leg' Directions, reconstruită din polilinia fiecărui pas."""
+    path = []
+    for step in leg.get('steps', []):
+        pts = decode_polyline(step.get('polyline', {}).get('points', ''))
+        if path and pts and pts[0] == path[-1]:
+            pts = pts[1:]
+        path.extend(pts)
+    if not path:
+        start = leg.get('start_location')
+        end = leg.get('end_location')
+        if start and end:
+            path = [(start['lat'], start['lng']), (end['lat'], end['lng'])]
+    return path
+
+
+class RouteAssembler:
+    """
+    Asamblează trasee din tronsoane A->B ținute în cache.
+    Cheia unui tronson e (capăt A, capăt B, mod, limbă). La reasamblarea unui traseu
+    reordonat se refolosesc tronsoanele cunoscute și se cer doar adiacențele noi,
+    grupate în cereri Directions de maxim 25 puncte intermediare, trimise în paralel.
+    """
+    def __init__(self, client, max_waypoints=MAX_WAYPOINTS, max_workers=4):
+        self.client = client
+        self.max_waypoints = max_waypoints
+        self.max_workers = max_workers
+        self.leg_cache = {}        # (A, B, mod, limbă) -> {'leg': ..., 'path': [(lat, lng), ...]}
+        self.optimized_cache = {}  # (puncte, mod, limbă) -> route cu 'waypoint_order'
+        self.lock = threading.Lock()
+        self.last_stats = {'chunks': 0, 'fetched': 0, 'legs': 0, 'cached_legs': 0, 'optimized': False}
+        self.hits = 0    # tronsoane servite din cache (cumulat)
+        self.misses = 0  # tronsoane cerute de la Google (cumulat)
+
+    def split_chunks(self, points):
+        """Împarte [A, p1, ..., B] în tronsoane de maxim max_waypoints intermediare."""
+        step = self.max_waypoints + 1
+        chunks = []
+        i = 0
+        while i < len(points) - 1:
+            chunks.append(points[i:i + step + 1])
+            i += step
+        return chunks
+
+    def fits_single_request(self, points):
+        return len(points) <= self.max_waypoints + 2
+
+    def clear(self):
+        with self.lock:
+            self.leg_cache.clear()
+            self.optimized_cache.clear()
+
+    def _leg_key(self, a, b, mode, language):
+        return (point_key(a), point_key(b), mode, language)
+
+    def _store_legs(self, seq, route, mode, language):
+        """Pune în cache fiecare 'leg' al unui răspuns, pe adiacența (seq[i], seq[i+1])."""
+        legs = route.get('legs', [])
+        with self.lock:
+            for (a, b), leg in zip(zip(seq, seq[1:]), legs):
+                self.leg_cache[self._leg_key(a, b, mode, language)] = {'leg': leg, 'path': leg_path(leg)}
+
+    def _fetch_chunk(self, chunk, mode, language, optimize=False):
+        res = self.client.directions(
+            origin=chunk[0],
+            destination=chunk[-1],
+            waypoints=list(chunk[1:-1]),
+            optimize_waypoints=optimize,
+            mode=mode,
+            language=language
+        )
+        if not res:
+            return None
+        route = res[0]
+        seq = list(chunk)
+        if optimize and 'waypoint_order' in route:
+            middle = chunk[1:-1]
+            seq = [chunk[0]] + [middle[i] for i in route['waypoint_order']] + [chunk[-1]]
+        self._store_legs(seq, route, mode, language)
+        return route
+
+    def cached_leg(self, a, b, mode="driving", language="ro"):
+        with self.lock:
+            return self.leg_cache.get(self._leg_key(a, b, mode, language))
+
+    def estimate(self, points, mode="driving", language="ro"):
+        """
+        Totaluri calculate doar din cache, fără rețea.
+        Returnează (metri, secunde, tronsoane_cunoscute, total_tronsoane).
+        """
+        meters = 0; seconds = 0; known = 0
+        pairs = list(zip(points, points[1:]))
+        for a, b in pairs:
+            entry = self.cached_leg(a, b, mode, language)
+            if entry:
+                meters += entry['leg'].get('distance', {}).get('value', 0)
+                seconds += entry['leg'].get('duration', {}).get('value', 0)
+                known += 1
+        return meters, seconds, known, len(pairs)
+
+    def _missing_runs(self, points, mode, language):
+        """Grupează adiacențele lipsă din cache în secvențe consecutive de puncte."""
+        runs = []
+        current = None
+        for i in range(len(points) - 1):
+            if self.cached_leg(points[i], points[i + 1], mode, language):
+                current = None
+                continue
+            if current is None:
+                current = [points[i]]
+                runs.append(current)
+            current.append(points[i + 1])
+        return runs
+
+    def _count(self, stats):
+        with self.lock:
+            self.hits += stats['cached_legs']
+            self.misses += stats['legs'] - stats['cached_legs']
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def assemble(self, points, mode="driving", language="ro", optimize=False):
+        """
+        Returnează un dicționar în formatul unui 'route' Directions
+        ('legs', 'overview_polyline', opțional 'waypoint_order') sau None dacă o cerere eșuează.
+        Optimizarea ordinii (optimize_waypoints) e posibilă doar când traseul încape într-o singură cerere.
+        """
+        points = list(points)
+        if len(points) < 2:
+            return None
+
+        use_optimize = bool(optimize) and self.fits_single_request(points) and len(points) > 3
+
+        if use_optimize:
+            key = (tuple(point_key(p) for p in points), mode, language)
+            with self.lock:
+                route = self.optimized_cache.get(key)
+            fetched = 0
+            if route is None:
+                route = self._fetch_chunk(points, mode, language, optimize=True)
+                fetched = 1
+                if route is None:
+                    return None
+                with self.lock:
+                    self.optimized_cache[key] = route
+            n_legs = len(route.get('legs', []))
+            self.last_stats = {'chunks': 1, 'fetched': fetched, 'legs': n_legs,
+                               'cached_legs': 0 if fetched else n_legs, 'optimized': True}
+            self._count(self.last_stats)
+            return route
+
+        # Ordine fixă: cerem doar adiacențele care nu sunt deja în cache
+        runs = self._missing_runs(points, mode, language)
+        chunks = [c for run in runs for c in self.split_chunks(run)]
+        missing_legs = sum(len(c) - 1 for c in chunks)
+
+        if len(chunks) == 1:
+            self._fetch_chunk(chunks[0], mode, language)
+        elif chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                list(pool.map(lambda c: self._fetch_chunk(c, mode, language), chunks))
+
+        legs = []
+        path = []
+        for a, b in zip(points, points[1:]):
+            entry = self.cached_leg(a, b, mode, language)
+            if entry is None:
+                return None
+            legs.append(entry['leg'])
+            pts = entry['path']
+            if path and pts and pts[0] == path[-1]:
+                pts = pts[1:]
+            path.extend(pts)
+
+        self.last_stats = {'chunks': len(chunks), 'fetched': len(chunks), 'legs': len(legs),
+                           'cached_legs': len(legs) - missing_legs, 'optimized': False}
+        self._count(self.last_stats)
+
+        return {
+            'legs': legs,
+            'overview_polyline': {'points': encode_polyline(path)}
+        }
@@ -0,0 +1,46 @@
+import json
+import time
+
+from atomic_io import write_json_atomic
+
+# Versiunea formatului fișierelor de traseu (saved_routes/*.json)
+ROUTE_FILE_VERSION = "1.2"
+
+
+def place_entry(place_id, name, address="", locked=False, initial_color=None, website=None, lat=None, lng=None):
+    """Un loc din fișierul de traseu; coordonatele se scriu doar dacă sunt cunoscute."""
+    entry = {
+        "place_id": place_id,
+        "name": name,
+        "address": address,
+        "locked": locked,
+        "initial_color": initial_color,
+        "website": website
+    }
+    if lat is not None and lng is not None:
+        entry["lat"] = lat
+        entry["lng"] = lng
+    return entry
+
+
+def route_payload(mode, places):
+    """Conținutul unui fișier de traseu: mode e 'circular' sau 'linear', places în ordinea traseului."""
+    return {
+        "version": ROUTE_FILE_VERSION,
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "mode": mode,
+        "places": list(places)
+    }
+
+
+def write_route_file(path, payload):
+    """Scriere atomică, ca un traseu să nu rămână pe jumătate scris."""
+    write_json_atomic(path, payload, indent=2)
+
+
+def read_route_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or "places" not in payload:
+        raise ValueError("Fișier invalid")
+    return payload
@@ -0,0 +1,501 @@
+import time
+import concurrent.futures
+
+from api_governor import API_COSTS, BudgetExceeded
+from categories import DEFAULT_DIVERSITY_SETTINGS, CategoryInventory
+from geo_utils import haversine_distance, decode_polyline
+from ranking import DEFAULT_RANKING_WEIGHTS, ScoreFormula, select_top_k
+from profiler import profiler
+
+# Tipurile Google scanate în modul circular și numărul maxim de pagini (20 rezultate/pagină)
+HOTSPOT_SCAN_TARGETS = [
+    ('tourist_attraction', 3), ('park', 2), ('museum', 2), ('church', 2),
+    ('restaurant', 3), ('cafe', 2), ('shopping_mall', 2), ('store', 2)
+]
+
+# Tipuri care nu sunt obiective turistice (excluse din scanarea circulară)
+EXCLUDED_TYPES = ('lodging', 'parking', 'gas_station', 'atm', 'funeral_home', 'car_repair')
+
+# Pe coridor, localurile sub această notă sunt ignorate
+FOOD_TYPES = ('restaurant', 'cafe', 'bar', 'bakery', 'meal_takeaway', 'meal_delivery', 'food')
+FOOD_MIN_RATING = 4.0
+
+# Google cere o pauză înainte ca next_page_token să devină valid
+PAGE_TOKEN_DELAY = 2.0
+
+
+class ScanLog:
+    """
+    Destinația mesajelor motorului de scanare. Implicit scrie în consolă;
+    aplicația și CLI-ul o înlocuiesc (fișier de log, culori etc.).
+    detail() e pentru mesajele care nu au loc în consolă;
+    begin()/event()/end() sunt evenimentele structurate (o decizie per candidat), vezi scan_log.py.
+    """
+    def info(self, message): print(f"[INFO] {message}")
+    def success(self, message): print(f"[SUCCESS] {message}")
+    def warning(self, message): print(f"[WARNING] {message}")
+    def error(self, message): print(f"[ERROR] {message}")
+    def detail(self, message): pass
+    def begin(self, mode, **fields): pass
+    def event(self, event, **fields): pass
+    def end(self, **fields): pass
+
+
+class AreaScanParams:
+    """Parametrii unei scanări circulare (echivalentul câmpurilor din interfață)."""
+    def __init__(self, center, radius_m=1500, min_reviews=500, limit_v1=15, limit_v3=3,
+                 use_v1=True, use_v2=True, use_v3=True, diversity_settings=None, ranking_weights=None,
+                 custom_places=None, existing_types=None, language='ro', targets=None):
+        self.center = center
+        self.radius_m = radius_m
+        self.min_reviews = min_reviews
+        self.limit_v1 = limit_v1
+        self.limit_v3 = limit_v3
+        self.use_v1 = use_v1                  # V1: vedetele (rating >= 4, voturi >= min_reviews)
+        self.use_v2 = use_v2                  # V2: completează minimele pe categorii
+        self.use_v3 = use_v3                  # V3: populare cu rating 3-4
+        self.diversity_settings = diversity_settings if diversity_settings is not None else DEFAULT_DIVERSITY_SETTINGS
+        self.ranking_weights = ranking_weights or DEFAULT_RANKING_WEIGHTS
+        self.custom_places = custom_places    # {id: {'name', 'lat', 'lng'}} sau None (strat custom oprit)
+        self.existing_types = existing_types or []  # tipurile locurilor deja în traseu (pentru minime)
+        self.language = language
+        self.targets = targets or HOTSPOT_SCAN_TARGETS
+
+
+class AreaScanResult:
+    def __init__(self):
+        self.candidates_v1 = []
+        self.candidates_v2 = []
+        self.candidates_v3 = []
+        self.picks = []       # [(eticheta 'V1'/'V2'/'V3'/'Custom', candidat)], în ordinea selecției
+        self.details = {}     # place_id -> (website, status program)
+        self.coords = {}      # place_id -> {'lat', 'lng', 'name'} pentru toți candidații
+        self.counts = {'V1': 0, 'V2': 0, 'V3': 0}
+        self.budget_hit = False
+
+    def all_candidates(self):
+        return self.candidates_v1 + self.candidates_v2 + self.candidates_v3
+
+    def to_dict(self):
+        return {
+            'counts': dict(self.counts),
+            'budget_hit': self.budget_hit,
+            'picks': [dict(cand, tag=tag, website=self.details.get(cand['place_id'], ("", ""))[0],
+                           status=self.details.get(cand['place_id'], ("", ""))[1])
+                      for tag, cand in self.picks],
+            'candidates': {'v1': self.candidates_v1, 'v2': self.candidates_v2, 'v3': self.candidates_v3},
+        }
+
+
+class CorridorScanParams:
+    """Parametrii unei scanări pe coridor (traseu A -> B)."""
+    def __init__(self, start, end, keywords, step_km=10.0, radius_km=7.0, max_deviation_m=100.0,
+                 custom_deviation_km=5.0, custom_places=None, language='ro'):
+        self.start = start
+        self.end = end
+        self.keywords = keywords
+        self.step_km = step_km
+        self.radius_km = radius_km
+        self.max_deviation_m = max_deviation_m
+        self.custom_deviation_km = custom_deviation_km
+        self.custom_places = custom_places
+        self.language = language
+
+
+class CorridorPlan:
+    """Traseul cerut de la Google și punctele în care se va scana."""
+    def __init__(self, overview_polyline, path_points, scan_points):
+        self.overview_polyline = overview_polyline
+        self.path_points = path_points
+        self.scan_points = scan_points
+
+
+class CorridorScanResult:
+    def __init__(self, plan):
+        self.plan = plan
+        self.places = {}      # place_id -> loc acceptat (format compatibil cu cardurile de rezultat)
+        self.budget_hit = False
+
+    def ordered_places(self):
+        """Locurile acceptate în ordinea de pe drum (după cel mai apropiat punct al traseului)."""
+        path = self.plan.path_points
+
+        def position(place):
+            return min(range(len(path)), key=lambda i: haversine_distance(path[i][0], path[i][1], place['lat'], place['lng']))
+        return sorted(self.places.values(), key=position)
+
+    def to_dict(self):
+        return {
+            'overview_polyline': self.plan.overview_polyline,
+            'scan_points': self.plan.scan_points,
+            'budget_hit': self.budget_hit,
+            'places': list(self.places.values()),
+        }
+
+
+class ScanEngine:
+    """
+    Logica de scanare (circulară și pe coridor), fără interfață grafică:
+    primește parametrii, face cererile prin gateway și întoarce rezultate structurate.
+    MainWindow doar citește câmpurile, apelează motorul și afișează rezultatul;
+    turist_scan.py îl folosește din linia de comandă.
+    """
+    def __init__(self, gmaps, category_index, log=None, wait=None):
+        self.gmaps = gmaps
+        self.category_index = category_index
+        self.log = log or ScanLog()
+        # wait(pending) -> pending rămase; aplicația o folosește ca să proceseze evenimentele Qt între așteptări
+        self.wait = wait or (lambda pending: concurrent.futures.wait(pending)[1])
+
+    # --- SCANARE CIRCULARĂ ---
+
+    def estimate_area_cost(self, params):
+        """Costul maxim estimat (USD) al unei scanări circulare: toate paginile + detaliile selecțiilor."""
+        pages = sum(max_pages for _, max_pages in params.targets)
+        picks = params.limit_v1 + params.limit_v3 + sum(rules.get('min', 0) for rules in params.diversity_settings.values())
+        return pages * API_COSTS['places_nearby'][1] + picks * API_COSTS['place'][1]
+
+    def _nearby_pages(self, params, p_type, max_pages):
+        with profiler.span("places_nearby"):
+            res = self.gmaps.places_nearby(location=params.center, radius=params.radius_m, type=p_type, language=params.language)
+        results = res.get('results', [])
+        token = res.get('next_page_token')
+        pages = 1
+        while token and pages < max_pages:
+            with profiler.span("page_token_sleep"):
+                time.sleep(PAGE_TOKEN_DELAY)
+            try:
+                with profiler.span("places_nearby"):
+                    res_next = self.gmaps.places_nearby(page_token=token, language=params.language)
+            except BudgetExceeded:
+                raise
+            except Exception:
+                break
+            results.extend(res_next.get('results', []))
+            token = res_next.get('next_page_token')
+            pages += 1
+        return results
+
+    def collect_area_candidates(self, params, result):
+        """Umple cele trei urne (V1/V2/V3) cu locurile custom și rezultatele Google din rază."""
+        seen_ids = set()
+        custom = params.custom_places
+        lat0, lng0 = params.center
+
+        # PAS 0: Custom
+        if custom is not None:
+            for cid, cdata in custom.items():
+                if haversine_distance(lat0, lng0, cdata['lat'], cdata['lng']) <= params.radius_m:
+                    result.candidates_v1.append({
+                        'place_id': cid, 'name': f"[Custom] {cdata['name']}",
+                        'lat': cdata['lat'], 'lng': cdata['lng'],
+                        'rating': 5.0, 'reviews': 99999, 'types': ['custom_place', 'church'], 'is_custom': True
+                    })
+                    seen_ids.add(cid)
+                    result.coords[cid] = {'lat': cdata['lat'], 'lng': cdata['lng'], 'name': cdata['name']}
+
+        # PAS 1: Google
+        for p_type, max_pages in params.targets:
+            try:
+                results = self._nearby_pages(params, p_type, max_pages)
+            except BudgetExceeded as e:
+                self.log.error(f"Scanare oprită: {e}")
+                result.budget_hit = True
+                break
+            except Exception as e:
+                self.log.detail(f"   ⚠️ Eroare la tipul '{p_type}': {e}")
+                continue
+            with profiler.span("filter"):
+                self._classify_area_results(params, result, p_type, results, seen_ids)
+
+    def _classify_area_results(self, params, result, p_type, results, seen_ids):
+        """Filtrează rezultatele unui tip și le împarte în urne (V1/V2/V3)."""
+        custom = params.custom_places
+        for p in results:
+            pid = p.get('place_id')
+            if pid in seen_ids: continue
+            seen_ids.add(pid)
+            rating = p.get('rating', 0); reviews = p.get('user_ratings_total', 0); types = p.get('types', [])
+            name = p.get('name', 'N/A')
+            loc = p['geometry']['location']
+
+            reason = None
+            if rating < 3.0:
+                reason = 'low_rating'
+            elif any(t in EXCLUDED_TYPES for t in types):
+                reason = 'excluded_type'
+            elif rating < 4.0 and reviews < params.min_reviews:
+                reason = 'few_reviews'
+            elif custom is not None and any(haversine_distance(loc['lat'], loc['lng'], c['lat'], c['lng']) < 50
+                                            for c in custom.values()):
+                # Un loc Google aflat lângă unul custom e considerat duplicat
+                reason = 'custom_duplicate'
+            if reason:
+                self.log.event('candidate', place_id=pid, name=name, search_type=p_type, decision='rejected',
+                               reason=reason, rating=rating, reviews=reviews, types=types)
+                continue
+
+            cand = {
+                'place_id': pid, 'name': name, 'lat': loc['lat'], 'lng': loc['lng'],
+                'rating': rating, 'reviews': reviews, 'types': types, 'is_custom': False
+            }
+            if pid and loc['lat']: result.coords[pid] = {'lat': loc['lat'], 'lng': loc['lng'], 'name': name}
+
+            cand['search_type'] = p_type
+            if rating >= 4.0:
+                if reviews >= params.min_reviews: result.candidates_v1.append(cand)
+                else: result.candidates_v2.append(cand)
+            else:
+                result.candidates_v3.append(cand)
+
+    def report_decisions(self, params, result, formula, reasons):
+        """Câte un eveniment per candidat din urne: acceptat (cu eticheta) sau motivul respingerii."""
+        get_cat = self.category_index.category_of
+        picked = {cand['place_id']: tag for tag, cand in result.picks}
+        enabled = {'V1': params.use_v1, 'V2': params.use_v2, 'V3': params.use_v3}
+        for bucket, lst in (('V1', result.candidates_v1), ('V2', result.candidates_v2), ('V3', result.candidates_v3)):
+            for c in lst:
+                pid = c['place_id']
+                fields = dict(place_id=pid, name=c['name'], bucket=bucket, category=get_cat(c),
+                              rating=c['rating'], reviews=c['reviews'], score=round(formula.base(c), 4),
+                              distance_m=int(haversine_distance(params.center[0], params.center[1], c['lat'], c['lng'])),
+                              search_type=c.get('search_type'), custom=c['is_custom'])
+                if pid in picked:
+                    self.log.event('candidate', decision='accepted', tag=picked[pid], **fields)
+                else:
+                    reason = reasons.get(pid) or ('outranked' if enabled[bucket] else 'bucket_disabled')
+                    self.log.event('candidate', decision='rejected', reason=reason, **fields)
+
+    def select_area(self, params, result, formula):
+        """
+        Selecția pe urne: fiecare printr-o singură trecere cu heap (top-k cu plafoane pe categorie).
+        Întoarce motivele respingerilor decise explicit ({place_id: motiv}).
+        """
+        get_cat = self.category_index.category_of
+        settings = params.diversity_settings
+        reasons = {}
+
+        # Inventarul pe categorii: pornește de la ce e deja în traseu și crește la fiecare selecție
+        inventory = CategoryInventory(self.category_index)
+        for types in params.existing_types:
+            inventory.add_types(types)
+
+        taken_ids = set()
+
+        def pick(tag, cand):
+            result.picks.append((tag, cand))
+            result.counts[tag if tag != 'Custom' else 'V1'] += 1
+            inventory.add(get_cat(cand))
+            taken_ids.add(cand['place_id'])
+
+        if params.use_v1:
+            self.log.info("🌊 [V1] Selecție Vedete")
+            caps = {cat: {'max': rules.get('max', 99)} for cat, rules in settings.items()}
+            chosen, rejected = select_top_k(result.candidates_v1, params.limit_v1, formula, get_cat, caps,
+                                            exempt=lambda c: c['is_custom'])
+            for cand in rejected:
+                reasons[cand['place_id']] = 'category_cap'
+            for cand in chosen:
+                if cand['is_custom']:
+                    pick("Custom", cand)
+                    self.log.success(f"   ✅ [Custom] {cand['name']}")
+                else:
+                    pick("V1", cand)
+
+        if params.use_v2:
+            self.log.info("🌊 [V2] Selecție Diversitate")
+            # Fiecare categorie primește exact cât îi lipsește până la minim
+            needed = {cat: max(0, rules.get('min', 0) - inventory.get(cat)) for cat, rules in settings.items()}
+            pool = []
+            for c in result.candidates_v2:
+                if needed.get(get_cat(c), 0) > 0: pool.append(c)
+                else: reasons[c['place_id']] = 'category_full'
+            caps = {cat: {'min': n, 'max': n} for cat, n in needed.items()}
+            chosen, _ = select_top_k(pool, sum(needed.values()), formula, get_cat, caps)
+            for cand in chosen:
+                pick("V2", cand)
+
+        if params.use_v3:
+            self.log.info("🌊 [V3] Selecție Populare")
+            pool = [c for c in result.candidates_v3 if c['place_id'] not in taken_ids]
+            chosen, _ = select_top_k(pool, params.limit_v3, formula, get_cat)
+            for cand in chosen:
+                pick("V3", cand)
+        return reasons
+
+    def fetch_details(self, place_ids, language='ro'):
+        """
+        Website + program pentru mai multe locuri, cerute concurent.
+        Returnează {place_id: (website, status)}.
+        """
+        futures = {pid: self.gmaps.call_async('place', place_id=pid, fields=['opening_hours', 'website'], language=language)
+                   for pid in place_ids}
+        pending = set(futures.values())
+        while pending:
+            pending = self.wait(pending)
+
+        details = {}
+        for pid, fut in futures.items():
+            try:
+                res = fut.result().get('result', {})
+            except Exception as e:
+                self.log.detail(f"   ⚠️ Detalii indisponibile pentru {pid}: {e}")
+                res = {}
+            web = res.get('website', "")
+            oh = res.get('opening_hours', {})
+            stat = "Program necunoscut"
+            if 'open_now' in oh:
+                stat = "Deschis acum" if oh['open_now'] else "Închis acum"
+            details[pid] = (web, stat)
+        return details
+
+    def scan_area(self, params):
+        """Scanarea circulară completă: candidați, raport, selecție, detaliile selecțiilor."""
+        result = AreaScanResult()
+        self.log.begin('area', center=params.center, radius_m=params.radius_m, min_reviews=params.min_reviews,
+                       limit_v1=params.limit_v1, limit_v3=params.limit_v3)
+        self.log.info(f"📍 Centru: {params.center} | Rază: {params.radius_m}m")
+        self.log.info("📡 Încep scanarea API (deciziile pe candidați în jurnalul de evenimente)...")
+        with profiler.span("collect"):
+            self.collect_area_candidates(params, result)
+
+        # Scorul candidaților (popularitate, notă, distanță, diversitate) - vezi ranking.py
+        formula = ScoreFormula(params.ranking_weights, params.center, params.radius_m)
+        with profiler.span("select"):
+            reasons = self.select_area(params, result, formula)
+        with profiler.span("events"):
+            self.report_decisions(params, result, formula, reasons)
+        self.log.detail(f"Urne: V1={len(result.candidates_v1)}, V2={len(result.candidates_v2)}, "
+                        f"V3={len(result.candidates_v3)} | Selectate: {result.counts}")
+
+        # Detaliile (website, program) pentru toate selecțiile Google, cerute în paralel
+        google_ids = [cand['place_id'] for tag, cand in result.picks if not cand['is_custom']]
+        if google_ids:
+            self.log.info(f"📡 Detalii pentru {len(google_ids)} locuri selectate (în paralel)...")
+            with profiler.span("details"):
+                result.details = self.fetch_details(google_ids, params.language)
+        self.log.end(counts=result.counts, budget_hit=result.budget_hit)
+        return result
+
+    # --- SCANARE PE CORIDOR ---
+
+    def plan_corridor(self, params):
+        """Cere traseul A -> B și alege punctele de scanare la fiecare step_km. None dacă nu există traseu."""
+        self.log.info("📡 Solicit traseul de la Google...")
+        with profiler.span("directions"):
+            directions = self.gmaps.directions(params.start, params.end, mode="driving", language=params.language)
+        if not directions:
+            return None
+
+        overview_poly = directions[0]['overview_polyline']['points']
+        with profiler.span("decode"):
+            path_points = decode_polyline(overview_poly)
+        self.log.info(f"Traseu decodat: {len(path_points)} puncte de formă.")
+
+        scan_points = [path_points[0]]
+        last_scan_dist = 0
+        total_dist = 0
+        for i in range(1, len(path_points)):
+            p1 = path_points[i-1]; p2 = path_points[i]
+            total_dist += haversine_distance(p1[0], p1[1], p2[0], p2[1]) / 1000
+            if total_dist - last_scan_dist >= params.step_km:
+                scan_points.append(p2)
+                last_scan_dist = total_dist
+        scan_points.append(path_points[-1])
+        self.log.info(f"📍 Puncte de scanare (Pioneze): {len(scan_points)}")
+        return CorridorPlan(overview_poly, path_points, scan_points)
+
+    def estimate_corridor_cost(self, params, plan):
+        return len(plan.scan_points) * len(params.keywords) * API_COSTS['places_nearby'][1]
+
+    def _collect_corridor_custom(self, params, plan, result):
+        self.log.info("\n--- SCANARE CUSTOM LAYER ---")
+        limit_m = params.custom_deviation_km * 1000
+        for cid, cdata in params.custom_places.items():
+            in_corridor = any(haversine_distance(sp[0], sp[1], cdata['lat'], cdata['lng']) < (params.radius_km + 20)
+                              for sp in plan.scan_points)
+            if not in_corridor: continue
+            min_dist = min([haversine_distance(pp[0], pp[1], cdata['lat'], cdata['lng']) for pp in plan.path_points[::5]] + [99999])
+            accepted = min_dist <= limit_m
+            self.log.event('candidate', place_id=cid, name=cdata['name'], custom=True, deviation_m=int(min_dist),
+                           decision='accepted' if accepted else 'rejected', reason=None if accepted else 'too_far')
+            if accepted:
+                result.places[cid] = {
+                    'place_id': cid, 'name': f"[Custom] {cdata['name']}",
+                    'lat': cdata['lat'], 'lng': cdata['lng'],
+                    'rating': 5.0, 'reviews': 99999,
+                    'types': ['custom_place'], 'is_custom': True,
+                    'vicinity': f"Abatere: {int(min_dist)}m",
+                    'opening_hours': {}, 'user_ratings_total': 99999,
+                    'geometry': {'location': {'lat': cdata['lat'], 'lng': cdata['lng']}}
+                }
+                self.log.success(f"   ✅ Găsit Custom: {cdata['name']} (Abatere {int(min_dist)}m)")
+
+    def _scan_corridor_keyword(self, params, plan, result, sp_idx, sp, kw):
+        with profiler.span("places_nearby"):
+            res = self.gmaps.places_nearby(location=sp, radius=int(params.radius_km * 1000), keyword=kw, language=params.language)
+        results = res.get('results', [])
+        self.log.event('query', point=sp_idx, location=sp, keyword=kw, results=len(results))
+        with profiler.span("filter"):
+            self._classify_corridor_results(params, plan, result, sp_idx, kw, results)
+
+    def _classify_corridor_results(self, params, plan, result, sp_idx, kw, results):
+        """Păstrează rezultatele aflate aproape de drum (și, la mâncare, cu notă bună)."""
+        for p in results:
+            pid = p['place_id']
+            if pid in result.places: continue
+
+            lat = p['geometry']['location']['lat']; lng = p['geometry']['location']['lng']
+            rating = p.get('rating', 0)
+            reviews = p.get('user_ratings_total', 0)
+            types = p.get('types', [])
+
+            # Abaterea față de drum
+            min_dev = min([haversine_distance(pp[0], pp[1], lat, lng) for pp in plan.path_points[::10]] + [99999])
+
+            # 1. Filtru Calitate, 2. Filtru Distanță
+            reason = None
+            if any(t in FOOD_TYPES for t in types) and rating < FOOD_MIN_RATING:
+                reason = 'low_rating_food'
+            elif min_dev > params.max_deviation_m:
+                reason = 'too_far'
+            self.log.event('candidate', place_id=pid, name=p['name'], keyword=kw, point=sp_idx,
+                           decision='rejected' if reason else 'accepted', reason=reason,
+                           rating=rating, reviews=reviews, deviation_m=int(min_dev), types=types)
+            if reason is None:
+                result.places[pid] = {
+                    'place_id': pid, 'name': p['name'], 'lat': lat, 'lng': lng,
+                    'rating': rating, 'user_ratings_total': reviews,
+                    'types': types, 'is_custom': False,
+                    'vicinity': p.get('vicinity', ''),
+                    'opening_hours': p.get('opening_hours', {}),
+                    'geometry': p['geometry']
+                }
+
+    def scan_corridor(self, params, plan):
+        """Scanarea pe coridor: locurile custom și rezultatele Google aflate aproape de drum."""
+        result = CorridorScanResult(plan)
+        self.log.begin('corridor', start=params.start, end=params.end, keywords=params.keywords,
+                       step_km=params.step_km, radius_km=params.radius_km, max_deviation_m=params.max_deviation_m,
+                       scan_points=len(plan.scan_points))
+        if params.custom_places is not None:
+            with profiler.span("custom_layer"):
+                self._collect_corridor_custom(params, plan, result)
+
+        # Ritmul cererilor e dat de guvernatorul de cotă, nu de pauze fixe
+        self.log.info(f"📡 Scanez Google în {len(plan.scan_points)} puncte (deciziile pe candidați în jurnalul de evenimente)...")
+        for sp_idx, sp in enumerate(plan.scan_points):
+            if result.budget_hit: break
+            for kw in params.keywords:
+                try:
+                    self._scan_corridor_keyword(params, plan, result, sp_idx, sp, kw)
+                except BudgetExceeded as e:
+                    self.log.error(f"Scanare oprită: {e}")
+                    result.budget_hit = True
+                    break
+                except Exception as e:
+                    self.log.error(f"Err scan '{kw}': {e}")
+
+        self.log.info(f"\n📊 TOTAL ACCEPTATE: {len(result.places)}")
+        self.log.end(accepted=len(result.places), budget_hit=result.budget_hit)
+        return result
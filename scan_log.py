@@ -0,0 +1,67 @@
+import os
+import json
+import uuid
+import datetime
+
+from app_logging import log_writer
+
+EVENTS_FILE = "scan_events.jsonl"
+
+
+class ScanEventLog:
+    """
+    Jurnal structurat al scanărilor (JSONL): un obiect per eveniment, în special
+    câte unul per decizie asupra unui candidat (acceptat / respins și de ce).
+    Fișierul curent se rotește când trece de max_bytes (scan_events.1.jsonl, .2, ...),
+    iar copiile peste 'backups' se șterg. Scrierea trece prin log_writer (nu blochează scanarea).
+    Interogare: scan_query.py.
+    """
+    def __init__(self, directory, max_bytes=10 * 1024 * 1024, backups=5, filename=EVENTS_FILE):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.scan_id = None
+        self.mode = None
+
+    def _rotated(self, n):
+        base, ext = os.path.splitext(self.path)
+        return f"{base}.{n}{ext}"
+
+    def rotate_if_needed(self):
+        # Înainte de redenumire, scriitorul trebuie să fi golit și închis fișierul
+        log_writer.close_file(self.path)
+        log_writer.flush()
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        oldest = self._rotated(self.backups)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(self._rotated(n)):
+                os.replace(self._rotated(n), self._rotated(n + 1))
+        os.replace(self.path, self._rotated(1))
+
+    def begin(self, mode, **fields):
+        """Începutul unei scanări: id nou, rotație dacă e cazul, evenimentul 'scan_start'."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.rotate_if_needed()
+        self.scan_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        self.mode = mode
+        self.record('scan_start', **fields)
+        return self.scan_id
+
+    def record(self, event, **fields):
+        entry = {'ts': datetime.datetime.now().isoformat(timespec='milliseconds'),
+                 'scan_id': self.scan_id, 'mode': self.mode, 'event': event}
+        entry.update(fields)
+        log_writer.write_raw(self.path, json.dumps(entry, ensure_ascii=False, default=str))
+
+    def end(self, **fields):
+        self.record('scan_end', **fields)
+        log_writer.close_file(self.path)
+        self.scan_id = None
+        self.mode = None
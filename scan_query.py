@@ -0,0 +1,141 @@
+"""
+Interogări peste jurnalele de evenimente ale scanărilor (JSONL, scrise de scan_log.py).
+
+Exemple:
+    python scan_query.py scans                      # scanările înregistrate
+    python scan_query.py why "Muzeul de Artă"       # de ce a fost (sau nu) ales un loc
+    python scan_query.py rate --by keyword          # rata de acceptare per cuvânt cheie
+    python scan_query.py rate --by reason --mode area
+    python scan_query.py rate --by category --logs Scans/
+
+Implicit se citesc Logs/events/*.jsonl; --logs primește directoare sau fișiere (se pot repeta).
+"""
+import os
+import sys
+import json
+import argparse
+from collections import OrderedDict
+
+from place_lookup import normalize_name
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_EVENTS_DIR = os.path.join(APP_DIR, "Logs", "events")
+
+
+def event_files(paths):
+    """Fișierele .jsonl din căile date (directoarele se parcurg recursiv), în ordine cronologică."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.endswith('.jsonl'))
+        elif os.path.exists(path):
+            files.append(path)
+    return sorted(files, key=os.path.getmtime)
+
+
+def read_events(paths, scan_id=None, mode=None, event=None):
+    """Generator peste evenimente, cu filtrele de bază aplicate; rândurile stricate se sar."""
+    for path in event_files(paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if scan_id and scan_id not in line: continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if scan_id and entry.get('scan_id') != scan_id: continue
+                if mode and entry.get('mode') != mode: continue
+                if event and entry.get('event') != event: continue
+                yield entry
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) if rows else len(str(h)) for i, h in enumerate(headers)]
+    print(" | ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for r in rows:
+        print(" | ".join(str(v).ljust(w) for v, w in zip(r, widths)))
+
+
+def cmd_scans(args):
+    scans = OrderedDict()
+    for e in read_events(args.logs, mode=args.mode):
+        sid = e.get('scan_id')
+        if not sid: continue
+        s = scans.setdefault(sid, {'ts': e.get('ts', ''), 'mode': e.get('mode'), 'what': '', 'candidates': 0, 'accepted': 0, 'end': ''})
+        if e['event'] == 'scan_start':
+            s['what'] = e.get('target') or (f"{e.get('start')} -> {e.get('end')}" if e.get('mode') == 'corridor' else e.get('center'))
+        elif e['event'] == 'candidate':
+            s['candidates'] += 1
+            s['accepted'] += e.get('decision') == 'accepted'
+        elif e['event'] == 'scan_end':
+            s['end'] = "buget depășit" if e.get('budget_hit') else "ok"
+    rows = [(sid, s['ts'][:19], s['mode'], s['what'], s['candidates'], s['accepted'], s['end'] or "întreruptă")
+            for sid, s in list(scans.items())[-args.last:]]
+    print_table(("SCAN", "DATA", "MOD", "ȚINTĂ", "CANDIDAȚI", "ACCEPTAȚI", "FINAL"), rows)
+
+
+def cmd_why(args):
+    query = normalize_name(args.place)
+    rows = []
+    for e in read_events(args.logs, scan_id=args.scan, mode=args.mode, event='candidate'):
+        if e.get('place_id') != args.place and query not in normalize_name(e.get('name', '')):
+            continue
+        if e.get('keyword'):
+            where = f"'{e['keyword']}' @ {e.get('point')}"
+        else:
+            where = e.get('bucket') or e.get('search_type') or ("custom" if e.get('custom') else "-")
+        detail = f"scor {e['score']}" if 'score' in e else (f"abatere {e['deviation_m']}m" if 'deviation_m' in e else "")
+        verdict = f"✅ {e.get('tag') or 'acceptat'}" if e.get('decision') == 'accepted' else f"❌ {e.get('reason')}"
+        rows.append((e.get('scan_id'), e.get('name'), where, verdict, e.get('rating'), e.get('reviews'), detail))
+    if not rows:
+        print(f"Niciun candidat găsit pentru '{args.place}'.")
+        return 1
+    print_table(("SCAN", "NUME", "URNĂ/KEYWORD", "DECIZIE", "RATING", "VOTURI", "DETALII"), rows[-args.last:])
+    return 0
+
+
+def cmd_rate(args):
+    groups = {}
+    for e in read_events(args.logs, scan_id=args.scan, mode=args.mode, event='candidate'):
+        key = e.get(args.by)
+        if isinstance(key, list): key = ",".join(key)
+        g = groups.setdefault(key, [0, 0])
+        g[0] += 1
+        g[1] += e.get('decision') == 'accepted'
+    rows = [(k if k is not None else "-", total, acc, f"{100.0 * acc / total:.1f}%")
+            for k, (total, acc) in sorted(groups.items(), key=lambda kv: -kv[1][0])]
+    print_table((args.by.upper(), "CANDIDAȚI", "ACCEPTAȚI", "RATĂ"), rows)
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--logs", action="append", help="director sau fișier .jsonl (implicit Logs/events)")
+    common.add_argument("--mode", choices=("area", "corridor"), help="doar scanările circulare / pe coridor")
+    common.add_argument("--scan", help="doar o anumită scanare (scan_id)")
+    common.add_argument("--last", type=int, default=50, help="câte rânduri să afișeze (cele mai recente)")
+
+    parser = argparse.ArgumentParser(prog="scan-query", description="Interogări peste jurnalele de scanare.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("scans", parents=[common], help="scanările înregistrate")
+    why = sub.add_parser("why", parents=[common], help="deciziile pentru un loc (nume parțial sau place_id)")
+    why.add_argument("place")
+    rate = sub.add_parser("rate", parents=[common], help="rata de acceptare grupată după un câmp")
+    rate.add_argument("--by", default="keyword",
+                      help="keyword, reason, bucket, category, search_type, mode, point... (implicit keyword)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.logs = args.logs or [DEFAULT_EVENTS_DIR]
+    if not event_files(args.logs):
+        print("Nu am găsit jurnale de evenimente (.jsonl).", file=sys.stderr)
+        return 2
+    handler = {'scans': cmd_scans, 'why': cmd_why, 'rate': cmd_rate}[args.command]
+    return handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import copy
+import json
+import threading
+from concurrent.futures import Future
+
+
+def request_key(method, args, kwargs):
+    """Semnătura unei cereri: metoda + argumentele, în formă canonică (ordinea kwargs nu contează)."""
+    return json.dumps([method, list(args), kwargs], sort_keys=True, default=str, ensure_ascii=False)
+
+
+class SingleFlight:
+    """
+    Coalescing pentru cererile identice aflate în zbor: primul apelant execută cererea,
+    ceilalți așteaptă același Future și primesc o copie a rezultatului.
+    Nu e cache: după ce cererea se termină, următorul apel pleacă din nou.
+    """
+    def __init__(self):
+        self.calls = {}  # cheie -> (Future, meta)
+        self.lock = threading.Lock()
+        self.shared = 0
+
+    def _join(self, key, meta=None, can_join=None):
+        """
+        (Future, rol) unde rol e 'leader' (execută și publică), 'follower' (așteaptă)
+        sau 'solo' (există o cerere în zbor, dar can_join(meta_ei) a refuzat-o).
+        """
+        with self.lock:
+            entry = self.calls.get(key)
+            if entry is not None:
+                fut, current_meta = entry
+                if can_join is None or can_join(current_meta):
+                    self.shared += 1
+                    return fut, 'follower'
+                return None, 'solo'
+            fut = Future()
+            self.calls[key] = (fut, meta)
+            return fut, 'leader'
+
+    def _run(self, key, fut, fn, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+
+    def do(self, key, fn, *args, meta=None, can_join=None, **kwargs):
+        """Execută fn o singură dată pentru toți apelanții simultani cu aceeași cheie (blocant)."""
+        fut, role = self._join(key, meta, can_join)
+        if role == 'leader':
+            self._run(key, fut, fn, args, kwargs)
+        elif role == 'solo':
+            return fn(*args, **kwargs)
+        # Fiecare apelant (inclusiv cel care a executat) primește o copie,
+        # ca unul care modifică răspunsul să nu-l strice pentru ceilalți
+        return copy.deepcopy(fut.result())
+
+    def do_async(self, executor, key, fn, *args, meta=None, can_join=None, **kwargs):
+        """
+        Varianta ne-blocantă: fiecare apelant primește propriul Future, rezolvat cu o copie
+        a rezultatului comun (cererea pornește pe executor dacă e nouă).
+        """
+        fut, role = self._join(key, meta, can_join)
+        if role == 'solo':
+            return executor.submit(fn, *args, **kwargs)
+        if role == 'leader':
+            def run():
+                try:
+                    self._run(key, fut, fn, args, kwargs)
+                except BaseException:
+                    pass  # excepția e deja în Future
+            executor.submit(run)
+        return copied_future(fut)
+
+
+def copied_future(source):
+    """Future care se rezolvă cu o copie a rezultatului lui source (sau cu aceeași excepție)."""
+    target = Future()
+
+    def done(fut):
+        try:
+            target.set_result(copy.deepcopy(fut.result()))
+        except BaseException as e:
+            target.set_exception(e)
+
+    source.add_done_callback(done)
+    return target
@@ -0,0 +1,156 @@
+"""
+Pornirea aplicației: cronometrarea etapelor și obiectele construite la primul acces.
+
+Fereastra se afișează cât mai devreme; harta, clienții API și stratul custom se inițializează
+după afișare (în fundal sau asincron). StartupTimer adună durata fiecărei etape, pe firul
+principal și în fundal, și raportează defalcarea o singură dată, când s-a terminat tot.
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+# Momentul importului acestui modul (primul import al aplicației): originea cronometrului
+PROCESS_T0 = time.perf_counter()
+
+
+class LazyClient:
+    """
+    Obiect construit la primul acces la un atribut (sau explicit cu get(), ex: dintr-un fir
+    de fundal la pornire). Construcția rulează o singură dată, și la acces concurent.
+    """
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+                target = self._target
+        return target
+
+    @property
+    def ready(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+
+class StartupTimer:
+    """
+    Etapele pornirii, fiecare cu momentul de început (față de PROCESS_T0), durata și firul:
+    - checkpoint(nume): etapă pe firul principal, de la checkpoint-ul anterior până acum;
+    - begin/end(nume): etapă asincronă (ex: încărcarea hărții, terminată de un semnal Qt);
+    - background(nume, fn): fn rulează pe un fir separat.
+    După arm(), când nu mai e nicio etapă în curs, se apelează o dată on_complete(timer).
+    """
+    def __init__(self, t0=PROCESS_T0):
+        self.t0 = t0
+        self.last_checkpoint = t0
+        self.phases = []     # [nume, început_s, durată_s, fir]
+        self.running = {}    # nume -> (început, fir), etapele începute și neîncheiate
+        self.window_shown = None
+        self.armed = False
+        self.completed = False
+        self.on_complete = None
+        self.lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter() - self.t0
+
+    def checkpoint(self, name):
+        t = time.perf_counter()
+        with self.lock:
+            self.phases.append([name, self.last_checkpoint - self.t0, t - self.last_checkpoint, "principal"])
+            self.last_checkpoint = t
+
+    def window_visible(self):
+        """Primul cadru al ferestrei a fost desenat: momentul pe care îl vede utilizatorul."""
+        self.window_shown = self.now()
+
+    def begin(self, name, thread="asincron"):
+        with self.lock:
+            self.running[name] = (time.perf_counter(), thread)
+
+    def end(self, name, note=None):
+        t = time.perf_counter()
+        with self.lock:
+            started = self.running.pop(name, None)
+            if started is None:
+                return  # etapă deja încheiată (ex: harta reîncărcată mai târziu)
+            label = f"{name} ({note})" if note else name
+            self.phases.append([label, started[0] - self.t0, t - started[0], started[1]])
+        self._check_complete()
+
+    @contextmanager
+    def phase(self, name, thread="fundal"):
+        self.begin(name, thread)
+        note = None
+        try:
+            yield
+        except Exception as e:
+            note = f"eșuat: {e}"
+            raise
+        finally:
+            self.end(name, note)
+
+    def background(self, name, fn, on_done=None):
+        """Rulează fn() pe un fir daemon; on_done(rezultat) se apelează pe același fir, dacă fn a reușit."""
+        self.begin(name, "fundal")
+
+        def run():
+            note = None
+            try:
+                result = fn()
+                if on_done is not None:
+                    on_done(result)
+            except Exception as e:
+                note = f"eșuat: {e}"
+            finally:
+                self.end(name, note)
+
+        thread = threading.Thread(target=run, name=f"startup-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def arm(self):
+        """Toate etapele amânate au fost pornite: raportul se poate emite când se termină ultima."""
+        self.armed = True
+        self._check_complete()
+
+    def _check_complete(self):
+        with self.lock:
+            if not self.armed or self.completed or self.running:
+                return
+            self.completed = True
+        if self.on_complete:
+            try:
+                self.on_complete(self)
+            except Exception as e:
+                print(f"Eroare la raportarea pornirii: {e}")
+
+    def total(self):
+        with self.lock:
+            return max((start + dur for _, start, dur, _ in self.phases), default=0.0)
+
+    def summary(self):
+        """Tabel text: etapele în ordinea începerii, cu firul pe care au rulat."""
+        with self.lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        shown = f"fereastra vizibilă după {self.window_shown * 1000:.0f} ms, " if self.window_shown is not None else ""
+        lines = [f"🚀 PORNIRE - {shown}totul gata după {self.total() * 1000:.0f} ms",
+                 f"{'ETAPĂ':<48} | {'FIR':<9} | {'ÎNCEPUT ms':>10} | {'DURATĂ ms':>9}",
+                 "-" * 86]
+        for name, start, dur, thread in phases:
+            lines.append(f"{name[:48]:<48} | {thread:<9} | {start * 1000:>10.0f} | {dur * 1000:>9.0f}")
+        return "\n".join(lines)
+
+
+# Cronometrul comun al aplicației
+startup = StartupTimer()
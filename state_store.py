@@ -0,0 +1,68 @@
+import os
+import json
+import time
+import sqlite3
+
+
+class StateStore:
+    """
+    Starea aplicației pe secțiuni (cheile de nivel superior: 'saved_route', 'saved_locations',
+    'map_state', ...), într-o bază SQLite cu o linie per secțiune.
+    - save(state) scrie doar secțiunile schimbate de la ultima salvare, într-o singură tranzacție:
+      salvarea frecventă (la fiecare modificare) costă milisecunde și la sesiuni mari, iar o oprire
+      bruscă lasă fie starea anterioară, fie pe cea nouă, niciodată un fișier pe jumătate scris.
+    - La prima pornire importă vechiul app_state.json (legacy_json), dacă există.
+    Conexiunea e folosită doar de pe firul interfeței.
+    """
+    def __init__(self, path, legacy_json=None):
+        self.path = path
+        self.saved = {}  # secțiune -> JSON-ul scris ultima dată
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS state ("
+                          "section TEXT PRIMARY KEY, body TEXT, updated_at REAL)")
+        self.conn.commit()
+        if legacy_json and os.path.exists(legacy_json) and self.is_empty():
+            self.import_json(legacy_json)
+
+    def is_empty(self):
+        return self.conn.execute("SELECT COUNT(*) FROM state").fetchone()[0] == 0
+
+    def import_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Eroare import stare din {path}: {e}")
+            return 0
+        return self.save(state) if isinstance(state, dict) else 0
+
+    def load(self):
+        """Starea completă (dict gol dacă nu s-a salvat încă nimic)."""
+        state = {}
+        for section, body in self.conn.execute("SELECT section, body FROM state"):
+            try:
+                state[section] = json.loads(body)
+            except ValueError:
+                continue
+            self.saved[section] = body
+        return state
+
+    def save(self, state):
+        """Scrie secțiunile care diferă de ultima salvare; întoarce numărul lor."""
+        changed = []
+        for section, value in state.items():
+            body = json.dumps(value, ensure_ascii=False, sort_keys=True)
+            if self.saved.get(section) != body:
+                changed.append((section, body))
+        if not changed:
+            return 0
+        now = time.time()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO state (section, body, updated_at) VALUES (?, ?, ?)",
+                                  [(section, body, now) for section, body in changed])
+        self.saved.update(changed)
+        return len(changed)
+
+    def close(self):
+        self.conn.close()
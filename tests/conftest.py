@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modulele aplicației stau în rădăcina proiectului (fără pachet instalabil)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
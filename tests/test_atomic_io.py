@@ -0,0 +1,45 @@
+"""Scrierile atomice și salvarea comasată (fără Qt, fără rețea)."""
+import json
+import os
+import threading
+
+from atomic_io import write_atomic, write_json_atomic, DebouncedSaver
+
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json_atomic(path, {"a": 1})
+    write_json_atomic(path, {"ă": 2}, indent=2)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {"ă": 2}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_write_atomic_bytes(tmp_path):
+    path = str(tmp_path / "data.bin")
+    write_atomic(path, b"\x00\x01")
+    with open(path, 'rb') as f:
+        assert f.read() == b"\x00\x01"
+
+
+def test_debounced_saver_coalesces_and_flushes():
+    writes = []
+    saver = DebouncedSaver(lambda: writes.append(1), delay=60)
+    for _ in range(5):
+        saver.schedule()
+    assert writes == []
+    saver.flush()
+    assert writes == [1]
+    saver.flush()
+    assert writes == [1]
+
+
+def test_debounced_saver_timer_writes_once():
+    done = threading.Event()
+    writes = []
+    saver = DebouncedSaver(lambda: (writes.append(1), done.set()), delay=0.01)
+    saver.schedule()
+    saver.schedule()
+    assert done.wait(5)
+    saver.flush()
+    assert writes == [1]
@@ -0,0 +1,116 @@
+"""GeminiClient față de un server HTTP local care servește răspunsuri SSE pregătite (fără rețea)."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from gemini_client import GeminiClient, GeminiError, GeminiCancelled, extract_text
+
+# model -> (status HTTP, fragmentele SSE trimise)
+RESPONSES = {
+    "ok": (200, [
+        {"candidates": [{"content": {"parts": [{"text": "Bună "}]}}]},
+        {"candidates": [{"content": {"parts": [{"text": "ziua"}]}}]},
+    ]),
+    "blocked": (200, [
+        {"candidates": [], "promptFeedback": {"blockReason": "SAFETY"}},
+    ]),
+    "error": (200, [
+        {"error": {"code": 400, "message": "API key invalid"}},
+    ]),
+    "empty": (200, [
+        {"candidates": [{"content": {"parts": []}}]},
+    ]),
+    "http500": (500, []),
+}
+
+
+class GeminiHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.server.requests.append(json.loads(self.rfile.read(length)))
+        model = self.path.split('/models/')[1].split(':')[0]
+        status, chunks = RESPONSES[model]
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode('utf-8'))
+        if status != 200:
+            self.wfile.write(b"eroare server")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), GeminiHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    c = GeminiClient("test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1beta")
+    yield c
+    c.executor.shutdown(wait=False)
+
+
+def test_stream_delivers_chunks_in_order(client, server):
+    chunks = []
+    text = client.stream("ok", "Salut", on_chunk=chunks.append)
+    assert text == "Bună ziua"
+    assert chunks == ["Bună ", "ziua"]
+    assert server.requests[0]["contents"][0]["parts"][0]["text"] == "Salut"
+
+
+def test_response_schema_requests_json(client, server):
+    client.generate("ok", "Salut", response_schema={"type": "object"})
+    config = server.requests[0]["generationConfig"]
+    assert config["responseMimeType"] == "application/json"
+    assert config["responseSchema"] == {"type": "object"}
+
+
+def test_blocked_prompt_reports_reason(client):
+    with pytest.raises(GeminiError, match="SAFETY"):
+        client.generate("blocked", "Salut")
+
+
+def test_error_chunk_raises(client):
+    with pytest.raises(GeminiError, match="API key invalid"):
+        client.generate("error", "Salut")
+
+
+def test_empty_response_raises(client):
+    with pytest.raises(GeminiError, match="gol"):
+        client.generate("empty", "Salut")
+
+
+def test_http_error_status(client):
+    with pytest.raises(GeminiError, match="500"):
+        client.generate("http500", "Salut")
+
+
+def test_cancel_before_first_chunk(client):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(GeminiCancelled):
+        client.generate("ok", "Salut", cancel_event=cancel)
+
+
+def test_stream_async_job(client):
+    job = client.stream_async("ok", "Salut")
+    assert job.future.result(timeout=10) == "Bună ziua"
+
+
+def test_extract_text_without_candidates():
+    assert extract_text({"candidates": []}) == ""
+    assert extract_text({}) == ""
@@ -0,0 +1,32 @@
+"""Depozitul locurilor: trasee, căutare, curățarea înregistrărilor (fără Qt)."""
+from place_repository import PlaceRepository
+
+
+def test_remove_then_readd_keeps_coords():
+    repo = PlaceRepository()
+    repo.remember_coords('scan_pick', 45.1, 25.2, name="Muzeu")
+    repo.add_to_route('scan_pick', 'circular', name="Muzeu")
+    assert repo.remove_from_route('scan_pick', 'circular')
+    # Cardul scanării e încă afișat: bifat din nou, locul își păstrează coordonatele
+    repo.add_to_route('scan_pick', 'circular', name="Muzeu")
+    assert repo.coords('scan_pick') == (45.1, 25.2)
+
+
+def test_clear_route_keeps_records_until_prune():
+    repo = PlaceRepository()
+    repo.remember_coords('a', 45.0, 25.0)
+    repo.add_to_route('a', 'circular')
+    repo.clear_route('circular')
+    assert repo.coords('a') == (45.0, 25.0)
+    assert repo.prune() == 1
+    assert repo.coords('a') is None
+
+
+def test_prune_keeps_referenced_records():
+    repo = PlaceRepository()
+    repo.add_to_route('in_route', 'linear')
+    repo.set_search_results([{'place_id': 'found', 'name': 'X',
+                              'geometry': {'location': {'lat': 1.0, 'lng': 2.0}}}])
+    repo.remember_coords('poi', 3.0, 4.0)
+    assert repo.prune() == 1
+    assert 'in_route' in repo and 'found' in repo and 'poi' not in repo
@@ -0,0 +1,107 @@
+"""Scorul candidaților și selecția top-k (fără Qt, fără rețea)."""
+import pytest
+
+from ranking import ScoreFormula, select_top_k, REVIEWS_REF
+
+
+def cand(pid, cat, reviews=100, rating=4.5, **extra):
+    return dict(place_id=pid, cat=cat, reviews=reviews, rating=rating, **extra)
+
+
+def ids(cands):
+    return [c['place_id'] for c in cands]
+
+
+def category_of(c):
+    return c['cat']
+
+
+def test_base_score_terms():
+    f = ScoreFormula(weights={'reviews': 1.0, 'rating': 1.0, 'distance': 0.0})
+    assert f.base(cand('a', 'x', reviews=0, rating=3.0)) == 0.0
+    assert f.base(cand('a', 'x', reviews=REVIEWS_REF, rating=5.0)) == pytest.approx(2.0)
+    # Popularitatea și nota sunt plafonate la 1
+    assert f.base(cand('a', 'x', reviews=REVIEWS_REF * 10, rating=5.0)) == pytest.approx(2.0)
+
+
+def test_distance_term_decreases_from_center():
+    f = ScoreFormula(weights={'reviews': 0.0, 'rating': 0.0, 'distance': 1.0}, center=(45.0, 25.0), radius_m=1000)
+    at_center = f.base(cand('a', 'x', lat=45.0, lng=25.0))
+    farther = f.base(cand('b', 'x', lat=45.005, lng=25.0))
+    outside = f.base(cand('c', 'x', lat=45.1, lng=25.0))
+    assert at_center == pytest.approx(1.0)
+    assert 0.0 < farther < at_center
+    assert outside == 0.0
+
+
+def test_diversity_penalty_grows_with_category_count():
+    f = ScoreFormula(weights={'diversity': 0.3})
+    c = cand('a', 'x')
+    assert f.score(c, 0) == pytest.approx(f.base(c))
+    assert f.score(c, 1) == pytest.approx(f.base(c) - 0.15)
+    assert f.score(c, 2) < f.score(c, 1)
+
+
+def test_top_k_prefers_higher_scores():
+    pool = [cand('low', 'a', reviews=10), cand('high', 'b', reviews=10000), cand('mid', 'c', reviews=500)]
+    chosen, rejected = select_top_k(pool, 2, ScoreFormula(), category_of)
+    assert ids(chosen) == ['high', 'mid']
+    assert rejected == []
+
+
+def test_min_quota_boost_fills_category_first():
+    pool = [cand('popular', 'museum', reviews=15000), cand('small_park', 'park', reviews=20)]
+    caps = {'park': {'min': 1}}
+    chosen, _ = select_top_k(pool, 1, ScoreFormula(), category_of, caps=caps)
+    assert ids(chosen) == ['small_park']
+
+
+def test_min_quota_counts_existing_inventory():
+    pool = [cand('popular', 'museum', reviews=15000), cand('small_park', 'park', reviews=20)]
+    caps = {'park': {'min': 1}}
+    chosen, _ = select_top_k(pool, 1, ScoreFormula(), category_of, caps=caps, counts={'park': 1})
+    assert ids(chosen) == ['popular']
+
+
+def test_max_cap_rejects_extra_candidates():
+    pool = [cand('m1', 'museum', reviews=9000), cand('m2', 'museum', reviews=8000), cand('p1', 'park', reviews=50)]
+    caps = {'museum': {'max': 1}}
+    chosen, rejected = select_top_k(pool, 3, ScoreFormula(), category_of, caps=caps)
+    assert ids(chosen) == ['m1', 'p1']
+    assert ids(rejected) == ['m2']
+
+
+def test_exempt_candidates_ignore_cap():
+    pool = [cand('m1', 'museum', reviews=9000), cand('custom', 'museum', reviews=8000, custom=True)]
+    caps = {'museum': {'max': 1}}
+    chosen, rejected = select_top_k(pool, 2, ScoreFormula(), category_of, caps=caps,
+                                    exempt=lambda c: c.get('custom', False))
+    assert ids(chosen) == ['m1', 'custom']
+    assert rejected == []
+
+
+def test_diversity_reorders_after_pick():
+    # Fără diversitate s-ar alege doi muzee; penalizarea aduce parcul înaintea celui de-al doilea muzeu
+    pool = [cand('m1', 'museum', reviews=5000), cand('m2', 'museum', reviews=4800), cand('p1', 'park', reviews=4000)]
+    chosen, _ = select_top_k(pool, 2, ScoreFormula(weights={'diversity': 0.5}), category_of)
+    assert ids(chosen) == ['m1', 'p1']
+    chosen, _ = select_top_k(pool, 2, ScoreFormula(weights={'diversity': 0.0}), category_of)
+    assert ids(chosen) == ['m1', 'm2']
+
+
+def test_ties_keep_input_order():
+    pool = [cand(f"p{i}", f"c{i}") for i in range(5)]
+    chosen, _ = select_top_k(pool, 3, ScoreFormula(), category_of)
+    assert ids(chosen) == ['p0', 'p1', 'p2']
+
+
+def test_ties_within_category_keep_input_order():
+    pool = [cand('a', 'x'), cand('b', 'x'), cand('c', 'x')]
+    chosen, _ = select_top_k(pool, 3, ScoreFormula(), category_of)
+    assert ids(chosen) == ['a', 'b', 'c']
+
+
+def test_k_larger_than_pool_and_empty_pool():
+    pool = [cand('a', 'x')]
+    assert ids(select_top_k(pool, 5, ScoreFormula(), category_of)[0]) == ['a']
+    assert select_top_k([], 5, ScoreFormula(), category_of) == ([], [])
@@ -0,0 +1,22 @@
+"""Cache-ul SQLite de răspunsuri Google: clase de TTL (fără rețea)."""
+import time
+
+from response_cache import ResponseCache
+
+
+def test_place_details_with_hours_expire_quickly(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    hours = cache.ttl_class('place', {'place_id': 'p', 'fields': ['opening_hours', 'website']})
+    assert hours == 'place_hours'
+    assert cache.ttl_class('place', {'place_id': 'p'}) == 'place_hours'
+    assert cache.ttl_class('place', {'place_id': 'p', 'fields': ['name', 'geometry']}) == 'place'
+    assert cache.ttl_class('places_nearby', {}) == 'places_nearby'
+
+    cache.put('k_hours', hours, {'result': {'opening_hours': {'open_now': True}}})
+    cache.put('k_name', 'place', {'result': {'name': 'X'}})
+    assert cache.get('k_hours', hours) is not None
+    # O oră mai târziu programul nu mai e valabil, numele încă da
+    stale = time.time() - 3600
+    cache._conn().execute("UPDATE responses SET stored_at = ?", (stale,))
+    assert cache.get('k_hours', hours) is None
+    assert cache.get('k_name', 'place') == {'result': {'name': 'X'}}
@@ -0,0 +1,17 @@
+"""Cheile de cache ale tronsoanelor."""
+from route_assembler import point_key
+
+
+def test_coordinates_are_rounded():
+    assert point_key(" 45.1234567, 25.5 ") == "45.123457,25.500000"
+
+
+def test_addresses_are_case_insensitive():
+    assert point_key("Piața Sfatului, Brașov") == point_key("piața sfatului, BRAȘOV")
+
+
+def test_place_ids_keep_their_case():
+    a = "place_id:ChIJx8bD4TKt2kARlUbVgi0EXMs"
+    b = "place_id:ChIJx8bD4TKt2kARlubVgi0EXMs"
+    assert point_key(a) == a
+    assert point_key(a) != point_key(b)
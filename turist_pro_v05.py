@@ -1,15 +1,17 @@
+# Primul import: de aici se cronometrează pornirea (vezi startup.py)
+from startup import startup, LazyClient
 import sys
 import os
-import shutil
+import time
 import datetime
-import re
 from dotenv import load_dotenv
 import traceback
-import googlemaps
-import requests
 import json
 import webbrowser
-import math
+import threading
+import copy
+import concurrent.futures
+from contextlib import contextmanager
 
 # --- IMPORT MANAGER DATE CUSTOM ---
 try:
@@ -17,6 +19,27 @@ try:
 except ImportError:
     print("EROARE CRITICĂ: Lipsește fișierul 'custom_data_manager.py'!")
 
+from app_logging import log_writer, prune_logs
+from http_transport import HttpTransport
+from route_assembler import RouteAssembler
+from api_governor import QuotaGovernor
+from maps_gateway import MapsGateway, PLACE_CARD_FIELDS
+from geocode_cache import ReverseGeocodeCache
+from place_lookup import PlaceLookup
+from gemini_client import GeminiCancelled
+from ai_cache import AiResponseCache, make_key
+from ai_batch import BatchEnricher
+from categories import CATEGORIES_MAP, DEFAULT_DIVERSITY_SETTINGS, CategoryIndex
+from ranking import DEFAULT_RANKING_WEIGHTS
+from scan_engine import ScanEngine, ScanLog, AreaScanParams, CorridorScanParams
+from scan_log import ScanEventLog
+from route_io import route_payload, place_entry, write_route_file, read_route_file
+from profiler import profiler, profiled
+from metrics import metrics
+from state_store import StateStore
+from place_repository import PlaceRepository
+from replay_transport import ApiMode
+
 # --- CONFIGURARE CĂI PENTRU EXE ȘI LOGS ---
 # Această secțiune asigură că fișierele sunt citite/scrise unde trebuie (lângă exe sau în temp)
 if getattr(sys, 'frozen', False):
@@ -44,22 +67,18 @@ class Colors:
     BOLD = '\033[1m'
     ENDC = '\033[0m'
 
-def strip_ansi_codes(text):
-    """Curăță culorile pentru fișierul text."""
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
-
 def write_to_file(message, tag="INFO"):
-    """Funcția supremă de scriere: Deschide -> Scrie -> Închide."""
+    """Pune rândul în coada scriitorului de log (fișierul e scris pe firul lui, în loturi)."""
+    if current_log_filename:
+        log_writer.write(current_log_filename, message, tag)
+
+def end_log_file():
+    """Închide logul scanării curente (după ce rândurile din coadă au fost scrise)."""
     global current_log_filename
     if current_log_filename:
-        try:
-            clean_msg = strip_ansi_codes(str(message))
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            with open(current_log_filename, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] [{tag}] {clean_msg}\n")
-        except Exception as e:
-            print(f"Log Error: {e}")
+        write_to_file("LOG ENDED.")
+        log_writer.close_file(current_log_filename)
+        current_log_filename = None
 
 # --- FUNCȚIILE DE LOGARE ---
 
@@ -88,80 +107,18 @@ def log_file_only(message, tag="DATA"):
     write_to_file(message, tag)
 
 
-# --- FUNCȚII GEOMETRICE ---
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculează distanța în metri între două coordonate GPS."""
-    try:
-        R = 6371000  # Raza Pământului în metri
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        dphi = math.radians(lat2 - lat1)
-        dlambda = math.radians(lon2 - lon1)
-        
-        a = math.sin(dphi / 2)**2 + \
-            math.cos(phi1) * math.cos(phi2) * \
-            math.sin(dlambda / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
-    except:
-        return 0.0
-
-def decode_polyline(polyline_str):
-    """Decodifică string-ul polyline de la Google într-o listă de (lat, lng)."""
-    index, lat, lng = 0, 0, 0
-    coordinates = []
-    changes = {'latitude': 0, 'longitude': 0}
-    while index < len(polyline_str):
-        for unit in ['latitude', 'longitude']: 
-            shift, result = 0, 0
-            while True:
-                byte = ord(polyline_str[index]) - 63
-                index += 1
-                result |= (byte & 0x1f) << shift
-                shift += 5
-                if not byte >= 0x20:
-                    break
-            if (result & 1):
-                changes[unit] = ~(result >> 1)
-            else:
-                changes[unit] = (result >> 1)
-        lat += changes['latitude']
-        lng += changes['longitude']
-        coordinates.append((lat / 100000.0, lng / 100000.0))
-    return coordinates
-
-def point_line_distance(point, start, end):
-    """
-    Calculează distanța minimă (în metri) de la punctul 'point' 
-    la segmentul de linie definit de 'start' și 'end'.
-    """
-    lat0, lon0 = math.radians(point[0]), math.radians(point[1])
-    lat1, lon1 = math.radians(start[0]), math.radians(start[1])
-    lat2, lon2 = math.radians(end[0]), math.radians(end[1])
-
-    if lat1 == lat2 and lon1 == lon2:
-        return haversine_distance(point[0], point[1], start[0], start[1])
+def report_startup(timer):
+    """Defalcarea pornirii: în consolă și în Logs/profiles.txt."""
+    summary = timer.summary()
+    log_info("\n" + summary)
+    log_writer.write(os.path.join(application_path, "Logs", "profiles.txt"), "\n" + summary, "STARTUP")
 
-    x = (lon0 - lon1) * math.cos((lat0 + lat1) / 2)
-    y = lat0 - lat1
-    dx = (lon2 - lon1) * math.cos((lat2 + lat1) / 2)
-    dy = lat2 - lat1
-    
-    dot = x * dx + y * dy
-    len_sq = dx * dx + dy * dy
-    param = -1
-    if len_sq != 0:
-        param = dot / len_sq
-
-    if param < 0:
-        xx, yy = lon1, lat1
-    elif param > 1:
-        xx, yy = lon2, lat2
-    else:
-        xx = lon1 + param * dx
-        yy = lat1 + param * dy
 
-    return haversine_distance(point[0], point[1], math.degrees(lat1 + param*dy), math.degrees(lon1 + param*dx))
+def report_profile(profile):
+    """Profilul unei operații încheiate: în logul scanării (dacă e unul deschis) și în Logs/profiles.txt."""
+    summary = profile.summary()
+    log_file_only("\n" + summary, "PROFILE")
+    log_writer.write(os.path.join(application_path, "Logs", "profiles.txt"), "\n" + summary, "PROFILE")
 
 
 from PySide6.QtWidgets import (QTabBar, 
@@ -170,14 +127,17 @@ from PySide6.QtWidgets import (QTabBar,
     QFrame, QScrollArea, QComboBox, QTabWidget, QListWidget, QDialog,
     QMessageBox, QButtonGroup, QSizePolicy, QGroupBox, QDialogButtonBox,
     QAbstractItemView, QListWidgetItem, QMenu, QFileDialog, 
-    QInputDialog # <--- IMPORT NECESAR PENTRU POPUP
+    QInputDialog, # <--- IMPORT NECESAR PENTRU POPUP
+    QCompleter, QDockWidget, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PySide6.QtCore import Qt, QByteArray, Signal, QTimer, QMimeData, QUrl, Slot, QObject, QFileInfo, QSize
-from PySide6.QtGui import QPixmap, QFont, QCursor, QImage, QDrag, QAction, QGuiApplication
+from PySide6.QtCore import Qt, QByteArray, Signal, QTimer, QMimeData, QUrl, Slot, QObject, QFileInfo, QSize, QStringListModel
+from PySide6.QtGui import QPixmap, QFont, QCursor, QImage, QDrag, QAction, QGuiApplication, QTextCursor
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage
 from PySide6.QtWebChannel import QWebChannel
 
+startup.checkpoint("importuri (PySide6, QtWebEngine, module)")
+
 
 class WebPage(QWebEnginePage):
     """Pagină web custom care afișează erorile de JS în consola Python."""
@@ -190,7 +150,10 @@ class WebPage(QWebEnginePage):
 
 
 # --- VARIABILE GLOBALE & CONFIGURARE ---
-STATE_FILE = "app_state.json"
+STATE_FILE = "app_state.json"   # formatul vechi (un JSON rescris la închidere), importat o dată în STATE_DB
+STATE_DB = "app_state.db"
+STATE_SAVE_DELAY_MS = 1500      # salvarea se face la o pauză de atâtea ms după ultima modificare
+LOG_RETENTION_DAYS = 14
 DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-lite"
 DEFAULT_AI_PROMPT = """Ești un analist expert în recenzii. Analizează următoarele recenzii și oferă:
 
@@ -209,12 +172,22 @@ dotenv_path = os.path.join(application_path, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 api_key = os.getenv("GOOGLE_API_KEY")
 
-# 2. Dacă nu există cheie, o cerem (AUTO-CREATE ENV)
-if not api_key:
-    # Creăm o instanță temporară de Qt pentru a afișa fereastra de dialog
-    temp_app = QApplication.instance()
-    if not temp_app:
-        temp_app = QApplication(sys.argv)
+# Apeluri reale, înregistrate sau redate din fixture-uri (TURIST_API_MODE, vezi replay_transport.py)
+api_mode = ApiMode(application_path)
+if api_mode.mode != 'live':
+    log_warning(f"Mod API: {api_mode.describe()}")
+    if api_mode.mode == 'replay':
+        api_key = api_key or ""  # redarea nu iese în rețea (harta din pagina web rămâne fără cheie)
+
+def ensure_api_key():
+    """
+    2. Dacă nu există cheie, o cerem (AUTO-CREATE ENV).
+    Rulează din main(), după crearea QApplication: clienții API se construiesc abia la primul
+    acces, deci cheia trebuie să existe doar înainte de fereastră (pagina hărții o conține).
+    """
+    global api_key
+    if api_key or api_mode.mode == 'replay':
+        return
 
     while not api_key:
         input_text, ok = QInputDialog.getText(
@@ -242,12 +215,48 @@ if not api_key:
 # --- INITIALIZARE CLIENTE ---
 custom_manager = CustomDataManager()
 
-try:
-    gmaps_client = googlemaps.Client(key=api_key)
-    log_success("Clientul Google Maps a fost inițializat cu succes.")
-except Exception as e:
-    log_error(f"Inițializarea clientului Google Maps a eșuat: {e}")
-    sys.exit()
+# Sesiune HTTP comună (keep-alive, timeout-uri pe endpoint, reîncercări cu jitter, latențe)
+http_transport = HttpTransport()
+# Cererile HTTP intră și în profilul operației în curs (dacă rulează una)
+http_transport.add_observer(profiler.record_io)
+profiler.on_finish = report_profile
+startup.on_complete = report_startup
+
+# QPS pe familie de API + plafon zilnic de cost (consumul zilei în api_usage.json; redarea nu consumă)
+api_governor = QuotaGovernor(os.path.join(application_path, "api_usage.json") if api_mode.mode != 'replay' else None)
+
+def make_maps_client():
+    """googlemaps (modulul și clientul) abia la primul apel sau în fundal, după afișarea ferestrei."""
+    import googlemaps
+    # OVER_QUERY_LIMIT vine cu status 200: îl reîncearcă googlemaps (backoff cu jitter, maxim retry_timeout)
+    return api_mode.maps_client(lambda: googlemaps.Client(key=api_key, requests_session=http_transport.session,
+                                                          retry_timeout=30, retry_over_query_limit=True))
+
+gmaps_client = MapsGateway(LazyClient(make_maps_client), api_governor, metrics=metrics)
+
+# Trasee lungi (> 25 puncte) se cer pe tronsoane, în paralel, cu cache per tronson
+route_assembler = RouteAssembler(gmaps_client)
+
+# Gemini cu streaming: textul apare în dialog pe măsură ce e generat (construit la primul acces, ca Maps)
+gemini_client = LazyClient(lambda: api_mode.gemini_client(api_key, session=http_transport.session, metrics=metrics))
+
+
+def warm_up_clients():
+    """Construiește clienții API în fundal, ca primul apel al utilizatorului să nu mai aștepte după ei."""
+    try:
+        gmaps_client.client.get()
+        gemini_client.get()
+        log_success("Clientul Google Maps a fost inițializat cu succes.")
+    except Exception as e:
+        log_error(f"Inițializarea clientului Google Maps a eșuat: {e}")
+        raise
+
+# Textele AI deja generate (rezumate, istoric), refolosite la redeschidere
+ai_cache = AiResponseCache(os.path.join(application_path, "ai_cache.json"))
+
+# Panoul de metrici citește contoarele cache-urilor la reîmprospătare
+metrics.register_cache("ai_cache", lambda: {'hits': ai_cache.hits, 'misses': ai_cache.misses})
+metrics.register_cache("route_legs", route_assembler.stats)
 
 # Variabile pentru starea curentă a hărții
 current_map_lat = None
@@ -255,112 +264,63 @@ current_map_lng = None
 current_map_name = None
 current_zoom_level = 15
 current_map_place_id = None
-current_search_results = []
-current_distance_info = {}
 saved_locations = {}
 my_coords_full_address = ""
 explore_coords_full_address = ""
 
 # --- SISTEM MEMORIE DUBLĂ (CIRCULAR vs LINIAR) ---
-selected_places = {}        # Memorie pentru Traseu CIRCULAR (City Break)
-route_places_coords = {}    # Coordonate pentru Circular
-
-linear_places = {}          # Memorie pentru Traseu LINIAR (A -> B)
-linear_places_coords = {}   # Coordonate pentru Liniar
+# Locurile (ambele trasee + rezultatele căutării): o singură înregistrare per place_id,
+# traseul fiecărui mod e un index ordonat în depozit
+place_repo = PlaceRepository()
 
 is_linear_mode = False      # Flag: False = Circular, True = Liniar (A->B)
 # -------------------------------------------------
 
-place_initial_colors = {}
+def route_mode():
+    """Modul traseului afișat: 'circular' (City Break) sau 'linear' (A -> B)."""
+    return 'linear' if is_linear_mode else 'circular'
+
 gemini_model_value = DEFAULT_GEMINI_MODEL
 ai_prompt_var = DEFAULT_AI_PROMPT
 
-# --- Configurare Categorii Diversitate (Granularitate Maximă) ---
-CATEGORIES_MAP = {
-    # --- MÂNCARE & BĂUTURĂ ---
-    'restaurant': {
-        'label': '🍴 Restaurante',
-        'keywords': ['restaurant', 'meal_takeaway', 'meal_delivery']
-    },
-    'cafe': {
-        'label': '☕ Cafenele/Patiserii',
-        'keywords': ['cafe', 'bakery', 'coffee_shop']
-    },
-    'bar': {
-        'label': '🍻 Bar/Club/Viață de noapte',
-        'keywords': ['bar', 'night_club', 'casino', 'liquor_store']
-    },
-    
-    # --- CULTURĂ & TURISM ---
-    'museum': {
-        'label': '🏛️ Muzee & Artă',
-        'keywords': ['museum', 'art_gallery']
-    },
-    'religion': {
-        'label': '⛪ Religie/Spiritual',
-        'keywords': ['church', 'place_of_worship', 'synagogue', 'mosque', 'hindu_temple']
-    },
-    'tourist': {
-        'label': '📸 Atracții Turistice',
-        'keywords': ['tourist_attraction', 'city_hall', 'stadium', 'landmark']
-    },
-    
-    # --- NATURĂ & DISTRACȚIE ---
-    'park': {
-        'label': '🌳 Parcuri & Natură',
-        'keywords': ['park', 'natural_feature', 'campground', 'rv_park']
-    },
-    'fun': {
-        'label': '🎡 Zoo/Distracție/Film',
-        'keywords': ['amusement_park', 'zoo', 'aquarium', 'bowling_alley', 'movie_theater']
-    },
-    
-    # --- SHOPPING ---
-    'mall': {
-        'label': '🛍️ Mall/Fashion',
-        'keywords': ['shopping_mall', 'clothing_store', 'department_store', 'jewelry_store', 'shoe_store', 'electronics_store']
-    },
-    'market': {
-        'label': '🛒 Supermarket/Băcănie',
-        'keywords': ['supermarket', 'grocery_or_supermarket', 'convenience_store']
-    },
-    'books': {
-        'label': '📖 Librării/Biblioteci',
-        'keywords': ['book_store', 'library']
-    },
-    
-    # --- UTILITĂȚI & URGENȚE ---
-    'pharmacy': {
-        'label': '💊 Farmacii/Sănătate',
-        'keywords': ['pharmacy', 'drugstore', 'hospital', 'doctor']
-    },
-    'bank': {
-        'label': '🏧 Bănci/ATM',
-        'keywords': ['bank', 'atm']
-    },
-    'fuel': {
-        'label': '⛽ Benzinării',
-        'keywords': ['gas_station']
-    },
-    'transport': {
-        'label': '🚆 Transport (Gară/Bus)',
-        'keywords': ['train_station', 'bus_station', 'subway_station', 'transit_station', 'airport']
-    }
-}
-
-# Setări implicite extinse (Min/Max)
-diversity_settings = {
-    'restaurant': {'min': 2, 'max': 5, 'min_rating': 4},
-    'cafe':       {'min': 2, 'max': 4, 'min_rating': 4},
-    'bar':        {'min': 0, 'max': 3, 'min_rating': 4},
-    'museum':     {'min': 2, 'max': 5, 'min_rating': 4},
-    'religion':   {'min': 3, 'max': 5, 'min_rating': 0}, # Prioritate Biserici
-    'park':       {'min': 2, 'max': 4, 'min_rating': 4},
-    'mall':       {'min': 1, 'max': 2, 'min_rating': 4},
-    'pharmacy':   {'min': 1, 'max': 2, 'min_rating': 0}, 
-    'bank':       {'min': 0, 'max': 2, 'min_rating': 0},
-    'market':     {'min': 0, 'max': 2, 'min_rating': 0}
-}
+# --- Configurare Categorii Diversitate: vezi categories.py ---
+category_index = CategoryIndex(CATEGORIES_MAP)
+
+# Setări implicite extinse (Min/Max), copie modificabilă din Setări
+diversity_settings = copy.deepcopy(DEFAULT_DIVERSITY_SETTINGS)
+
+# Ponderile scorului pentru selecția automată (salvate în app_state.db)
+ranking_weights = dict(DEFAULT_RANKING_WEIGHTS)
+
+
+class AppScanLog(ScanLog):
+    """
+    Mesajele motorului de scanare merg în consola colorată și în fișierul de log al scanării;
+    deciziile pe candidați, în jurnalul JSONL (Logs/events, interogabil cu scan_query.py).
+    """
+    def __init__(self, events):
+        self.events = events
+    def info(self, message): log_info(message)
+    def success(self, message): log_success(message)
+    def warning(self, message): log_warning(message)
+    def error(self, message): log_error(message)
+    def detail(self, message): log_file_only(message)
+    def begin(self, mode, **fields):
+        self.events.begin(mode, text_log=current_log_filename, **fields)
+    def event(self, event, **fields): self.events.record(event, **fields)
+    def end(self, **fields): self.events.end(**fields)
+
+
+def wait_processing_events(pending):
+    """Așteptare scurtă pe cereri în zbor, cu interfața responsivă între timp."""
+    _, pending = concurrent.futures.wait(pending, timeout=0.05)
+    QApplication.processEvents()
+    return pending
+
+
+# Scanările (circulară, coridor) rulează în motorul fără interfață; MainWindow doar afișează
+scan_engine = ScanEngine(gmaps_client, category_index, log=AppScanLog(ScanEventLog(os.path.join(application_path, "Logs", "events"))),
+                         wait=wait_processing_events)
 
 
 def parse_coordinates(coords_string: str):
@@ -374,71 +334,75 @@ def parse_coordinates(coords_string: str):
 
 
 
-def reverse_geocode(lat, lng):
-    """Obține adresa pentru coordonatele date folosind Google Geocoding API."""
-    try:
-        log_info(f"Reverse geocoding pentru {lat}, {lng}...")
-        result = gmaps_client.reverse_geocode((lat, lng), language='ro')
+def fetch_reverse_geocode(lat, lng):
+    """Apelul efectiv la Google Geocoding API. Ridică excepție la eroare (nu se pune în cache)."""
+    log_info(f"Reverse geocoding pentru {lat}, {lng}...")
+    result = gmaps_client.reverse_geocode((lat, lng), language='ro')
+    if result and len(result) > 0:
+        log_debug(f"Geocoding a returnat {len(result)} rezultate:")
+        for i, res in enumerate(result[:5]):
+            log_debug(f"  [{i}] {res.get('types')}: {res.get('formatted_address', '')[:60]}")
         
-        if result and len(result) > 0:
-            log_debug(f"Geocoding a returnat {len(result)} rezultate:")
-            for i, res in enumerate(result[:5]):
-                log_debug(f"  [{i}] {res.get('types')}: {res.get('formatted_address', '')[:60]}")
-            
-            street_name = None
-            street_number = None
-            locality = None
-            neighborhood = None
+        street_name = None
+        street_number = None
+        locality = None
+        neighborhood = None
+        
+        for res in result:
+            components = res.get('address_components', [])
             
-            for res in result:
-                components = res.get('address_components', [])
-                
-                for comp in components:
-                    comp_types = comp.get('types', [])
-                    
-                    if 'route' in comp_types and not street_name:
-                        street_name = comp.get('long_name')
-                        log_debug(f"  Găsit route: {street_name}")
-                    
-                    if 'street_number' in comp_types and not street_number:
-                        street_number = comp.get('long_name')
-                    
-                    if 'locality' in comp_types and not locality:
-                        locality = comp.get('long_name')
-                    
-                    if ('neighborhood' in comp_types or 'sublocality' in comp_types or 'sublocality_level_1' in comp_types) and not neighborhood:
-                        neighborhood = comp.get('long_name')
+            for comp in components:
+                comp_types = comp.get('types', [])
                 
-                if street_name:
-                    break
-            
-            if street_name:
-                parts = []
-                if street_number:
-                    parts.append(f"{street_name} {street_number}")
-                else:
-                    parts.append(street_name)
+                if 'route' in comp_types and not street_name:
+                    street_name = comp.get('long_name')
+                    log_debug(f"  Găsit route: {street_name}")
                 
-                if neighborhood and neighborhood != locality:
-                    parts.append(neighborhood)
+                if 'street_number' in comp_types and not street_number:
+                    street_number = comp.get('long_name')
                 
-                if locality:
-                    parts.append(locality)
+                if 'locality' in comp_types and not locality:
+                    locality = comp.get('long_name')
                 
-                address = ", ".join(parts)
+                if ('neighborhood' in comp_types or 'sublocality' in comp_types or 'sublocality_level_1' in comp_types) and not neighborhood:
+                    neighborhood = comp.get('long_name')
+            
+            if street_name:
+                break
+        
+        if street_name:
+            parts = []
+            if street_number:
+                parts.append(f"{street_name} {street_number}")
             else:
-                address = result[0].get('formatted_address', 'Adresă necunoscută')
-                log_debug("Nu s-a găsit strada în componente, folosim formatted_address")
+                parts.append(street_name)
             
-            log_success(f"Adresă găsită: {address}")
-            return address
+            if neighborhood and neighborhood != locality:
+                parts.append(neighborhood)
+            
+            if locality:
+                parts.append(locality)
+            
+            address = ", ".join(parts)
         else:
-            return "Adresă necunoscută"
-    except Exception as e:
-        log_error(f"Eroare la reverse geocoding: {e}")
-        return f"Eroare: {e}"
+            address = result[0].get('formatted_address', 'Adresă necunoscută')
+            log_debug("Nu s-a găsit strada în componente, folosim formatted_address")
+        
+        log_success(f"Adresă găsită: {address}")
+        return address
+    else:
+        return "Adresă necunoscută"
+
+
+# Cache persistent (celule de ~10 m) + coalescing pentru cererile simultane
+geocode_cache = ReverseGeocodeCache(fetch_reverse_geocode, os.path.join(application_path, "geocode_cache.json"))
+metrics.register_cache("geocode_cache", lambda: {'hits': geocode_cache.hits, 'misses': geocode_cache.misses})
+
+# Autocomplete pentru start/destinație/căutare hartă + trie local cu numele deja rezolvate
+place_lookup = PlaceLookup(gmaps_client, os.path.join(application_path, "place_names.json"))
 
 
+@profiled("get_distance_info")
 def get_distance_info(origin_coords, destinations):
     """
     Obține informații despre distanță și durată de la origin la multiple destinații.
@@ -474,21 +438,22 @@ def get_distance_info(origin_coords, destinations):
             
             log_info(f"Distance Matrix: Procesez lotul {i//CHUNK_SIZE + 1} ({len(chunk_coords)} destinații)...")
             
-            # Apel Driving
-            driving_result = gmaps_client.distance_matrix(
-                origins=[origin_str],
-                destinations=chunk_coords,
-                mode="driving",
-                language="ro"
-            )
-            
-            # Apel Walking (doar dacă sunt puține, sau opțional - aici îl lăsăm)
-            walking_result = gmaps_client.distance_matrix(
-                origins=[origin_str],
-                destinations=chunk_coords,
-                mode="walking",
-                language="ro"
-            )
+            with profiler.span("distance_matrix"):
+                # Apel Driving
+                driving_result = gmaps_client.distance_matrix(
+                    origins=[origin_str],
+                    destinations=chunk_coords,
+                    mode="driving",
+                    language="ro"
+                )
+                
+                # Apel Walking (doar dacă sunt puține, sau opțional - aici îl lăsăm)
+                walking_result = gmaps_client.distance_matrix(
+                    origins=[origin_str],
+                    destinations=chunk_coords,
+                    mode="walking",
+                    language="ro"
+                )
             
             # Procesăm rezultatele acestui lot
             drv_rows = driving_result.get('rows', [{}])[0].get('elements', [])
@@ -529,62 +494,26 @@ def get_distance_info(origin_coords, destinations):
         return {}
 
 
-def get_ai_summary(reviews, place_name):
-    """Apelează Gemini API pentru a obține un rezumat al recenziilor."""
-    global ai_prompt_var, gemini_model_value
-    if not reviews:
-        return "Nu există recenzii de analizat."
-    
-    try:
-        model = gemini_model_value
-        system_prompt = ai_prompt_var
-        
-        reviews_text = ""
-        for i, review in enumerate(reviews[:400]):
-            author = review.get('author_name', 'Anonim')
-            rating = review.get('rating', 'N/A')
-            text = review.get('text', '')
-            reviews_text += f"[{rating}⭐] {author}: {text}\n\n"
-        
-        log_info(f"Se apelează Gemini API (model: {model})...")
-        
-        gemini_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": f"{system_prompt}\n\nRecenzii pentru '{place_name}':\n\n{reviews_text}"
-                }]
-            }],
-            "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 1024
-            }
-        }
-        
-        response = requests.post(gemini_url, json=payload, headers={"Content-Type": "application/json"})
-        
-        if response.status_code != 200:
-            log_error(f"Eroare Gemini API: {response.status_code} - {response.text}")
-            return f"Eroare la apelul API: {response.status_code}"
-        
-        result = response.json()
-        ai_text = result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', 'Nu s-a putut genera rezumatul.')
-        
-        log_success("Rezumat AI generat cu succes.")
-        return ai_text
-        
-    except Exception as e:
-        log_error(f"Eroare la generarea rezumatului AI: {e}")
-        return f"Eroare: {e}"
+# Parametrii de generare pentru fiecare tip de text AI
+SUMMARY_GENERATION = {'temperature': 0.7, 'max_tokens': 1024}
+HISTORY_GENERATION = {'temperature': 0.4, 'max_tokens': 800}
 
 
-def get_history_info(place_name, place_address):
-    """Folosește Gemini pentru a genera o descriere enciclopedică."""
-    global gemini_model_value
-    log_info(f"Se solicită info istoric pentru: {place_name}")
+def build_summary_prompt(reviews, place_name):
+    """Promptul pentru rezumatul recenziilor: instrucțiunile din Setări + recenziile."""
+    reviews_text = ""
+    for i, review in enumerate(reviews[:400]):
+        author = review.get('author_name', 'Anonim')
+        rating = review.get('rating', 'N/A')
+        text = review.get('text', '')
+        reviews_text += f"[{rating}⭐] {author}: {text}\n\n"
     
-    prompt_istoric = (
+    return f"{ai_prompt_var}\n\nRecenzii pentru '{place_name}':\n\n{reviews_text}"
+
+
+def build_history_prompt(place_name, place_address):
+    """Promptul pentru descrierea enciclopedică a unui loc."""
+    return (
         f"Ești un ghid turistic expert și istoric de artă. "
         f"Am nevoie de informații despre locația: '{place_name}' situată în '{place_address}'.\n\n"
         f"Te rog să scrii o prezentare stil 'Wikipedia' sau Enciclopedie care să includă:\n"
@@ -596,22 +525,16 @@ def get_history_info(place_name, place_address):
         f"fără să inventezi fapte istorice. Răspunde în limba română."
     )
 
-    try:
-        model_name = gemini_model_value
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={api_key}"
-        payload = {
-            "contents": [{"parts": [{"text": prompt_istoric}]}],
-            "generationConfig": {"temperature": 0.4, "maxOutputTokens": 800}
-        }
-        response = requests.post(url, json=payload, headers={"Content-Type": "application/json"})
-        if response.status_code != 200:
-            return "Eroare la generarea textului."
-        
-        result = response.json()
-        return result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', 'Nu am găsit informații.')
-    except Exception as e:
-        log_error(f"Eroare Gemini History: {e}")
-        return f"Eroare: {e}"
+
+def summary_cache_key(place_id, place_name, reviews):
+    """Cheia rezumatului: model + instrucțiunile din Setări + loc + setul de recenzii."""
+    return make_key("summary", gemini_model_value, ai_prompt_var, place_id or place_name, reviews, SUMMARY_GENERATION)
+
+
+def history_cache_key(place_name, place_address):
+    """Cheia textului istoric: model + promptul (care include deja numele și adresa)."""
+    return make_key("history", gemini_model_value, build_history_prompt(place_name, place_address),
+                    f"{place_name}|{place_address}", None, HISTORY_GENERATION)
 
 
 class ClickableLabel(QLabel):
@@ -707,6 +630,130 @@ class MapBridge(QObject):
         log_info(f"Setare poziție curentă: {lat}, {lng}")
         self.setMyPositionSignal.emit(lat, lng)
         
+class UiDispatcher(QObject):
+    """Trimite callback-uri din thread-urile de lucru pe thread-ul interfeței."""
+    callRequested = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.callRequested.connect(self._run, Qt.QueuedConnection)
+
+    @Slot(object)
+    def _run(self, fn):
+        try:
+            fn()
+        except RuntimeError as e:
+            # Widget-ul țintă a fost distrus între timp (ex: dialog închis)
+            log_debug(f"Callback UI ignorat: {e}")
+        except Exception as e:
+            log_error(f"Eroare callback UI: {e}")
+            traceback.print_exc()
+
+    def call(self, fn):
+        self.callRequested.emit(fn)
+
+    def when_done(self, future, callback):
+        """Apelează callback(future) pe thread-ul UI când future-ul se termină."""
+        future.add_done_callback(lambda f: self.call(lambda: callback(f)))
+
+
+class PlaceAutocomplete(QObject):
+    """
+    Autocomplete pe un QLineEdit: sugestii locale (trie) instant, apoi Places Autocomplete
+    după o pauză de tastare (debounce). La alegerea unei sugestii se emite placeResolved(lat, lng, nume).
+    Textul care arată deja a coordonate nu declanșează cereri.
+    """
+    placeResolved = Signal(float, float, str)
+
+    DEBOUNCE_MS = 350
+    MIN_CHARS = 3
+
+    def __init__(self, line_edit, dispatcher, bias_provider=None, parent=None):
+        super().__init__(parent or line_edit)
+        self.line_edit = line_edit
+        self.dispatcher = dispatcher
+        self.bias_provider = bias_provider
+        self.suggestions = {}  # text afișat -> place_id (sau None pentru cele locale)
+        self.request_seq = 0
+
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setFilterMode(Qt.MatchContains)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.line_edit.setCompleter(self.completer)
+        self.completer.activated[str].connect(self.on_activated)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.fetch_remote)
+        self.line_edit.textEdited.connect(self.on_text_edited)
+
+    def is_suggestion(self, text):
+        return text in self.suggestions
+
+    def show_suggestions(self, items):
+        self.suggestions = {}
+        for it in items:
+            if it['description'] and it['description'] not in self.suggestions:
+                self.suggestions[it['description']] = it.get('place_id')
+        self.model.setStringList(list(self.suggestions.keys()))
+        if self.suggestions and self.line_edit.hasFocus():
+            self.completer.complete()
+
+    def on_text_edited(self, text):
+        text = text.strip()
+        self.request_seq += 1
+        if len(text) < self.MIN_CHARS or parse_coordinates(text):
+            self.timer.stop()
+            return
+        local = place_lookup.local_suggestions(text)
+        if local:
+            self.show_suggestions(local)
+        self.timer.start()
+
+    def fetch_remote(self):
+        text = self.line_edit.text().strip()
+        if len(text) < self.MIN_CHARS or parse_coordinates(text):
+            return
+        seq = self.request_seq
+        bias = self.bias_provider() if self.bias_provider else None
+
+        def deliver(fut):
+            # Răspunsurile depășite de tastări ulterioare se ignoră
+            if seq != self.request_seq:
+                return
+            try:
+                remote = fut.result()
+            except Exception as e:
+                log_error(f"Eroare autocomplete: {e}")
+                return
+            self.show_suggestions(place_lookup.local_suggestions(text) + remote)
+
+        self.dispatcher.when_done(place_lookup.suggest_async(text, bias), deliver)
+
+    def on_activated(self, text):
+        self.timer.stop()
+        self.request_seq += 1
+        self.resolve(text, self.suggestions.get(text))
+
+    def resolve(self, text, place_id=None):
+        def deliver(fut):
+            try:
+                result = fut.result()
+            except Exception as e:
+                log_error(f"Eroare rezolvare loc '{text}': {e}")
+                return
+            if not result:
+                log_warning(f"Locul '{text}' nu a fost găsit.")
+                return
+            lat, lng, name = result
+            self.placeResolved.emit(lat, lng, name)
+
+        self.dispatcher.when_done(place_lookup.resolve_async(text, place_id), deliver)
+
+
 class ReviewsDialog(QDialog):
     """Dialog pentru afișarea recenziilor."""
     def __init__(self, place_id, place_name, parent=None):
@@ -793,33 +840,25 @@ class ReviewsDialog(QDialog):
             self.review_text_widget.setText(f"A apărut o eroare: {e}")
     
     def generate_ai_summary(self):
-        self.ai_button.setEnabled(False)
-        self.ai_button.setText("⏳ Se generează...")
-        QApplication.processEvents()
-        
-        summary = get_ai_summary(self.stored_reviews, self.place_name)
-        
-        summary_dialog = QDialog(self)
-        summary_dialog.setWindowTitle(f"✨ Rezumat AI - {self.place_name}")
-        summary_dialog.resize(550, 450)
-        
-        layout = QVBoxLayout(summary_dialog)
-        summary_text = QTextEdit()
-        summary_text.setReadOnly(True)
-        summary_text.setText(summary)
-        layout.addWidget(summary_text)
-        
-        summary_dialog.exec()
-        
-        self.ai_button.setEnabled(True)
-        self.ai_button.setText("✨ Rezumat AI")
+        dialog = AiTextDialog(f"✨ Rezumat AI - {self.place_name}", parent=self)
+        dialog.resize(550, 450)
+        dialog.start(build_summary_prompt(self.stored_reviews, self.place_name), **SUMMARY_GENERATION,
+                     cache_key=summary_cache_key(self.place_id, self.place_name, self.stored_reviews),
+                     kind="summary", place=self.place_name)
+        dialog.exec()
 
-class HistoryDialog(QDialog):
-    """Dialog pentru afișarea informațiilor istorice."""
-    def __init__(self, place_name, info, parent=None):
+
+class AiTextDialog(QDialog):
+    """
+    Dialog pentru un text generat de Gemini, afișat pe măsură ce sosește (streaming).
+    Închiderea dialogului oprește generarea.
+    """
+    def __init__(self, title, heading=None, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(f"📖 Despre: {place_name}")
-        self.resize(600, 550)
+        self.setWindowTitle(title)
+        self.job = None
+        self.received = False
+        self.ui_dispatcher = UiDispatcher(self)
         
         # Stiluri pentru dialog
         self.setStyleSheet("""
@@ -838,21 +877,113 @@ class HistoryDialog(QDialog):
         
         layout = QVBoxLayout(self)
         
-        title_label = QLabel(f"Despre {place_name}")
-        title_font = QFont("Segoe UI", 14)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
-        title_label.setWordWrap(True)
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("color: #333; padding: 10px;")
-        layout.addWidget(title_label)
-        
-        text_area = QTextEdit()
-        text_area.setReadOnly(True)
-        text_font = QFont("Segoe UI", 11)
-        text_area.setFont(text_font)
-        text_area.setText(info)
-        layout.addWidget(text_area)
+        if heading:
+            title_label = QLabel(heading)
+            title_font = QFont("Segoe UI", 14)
+            title_font.setBold(True)
+            title_label.setFont(title_font)
+            title_label.setWordWrap(True)
+            title_label.setAlignment(Qt.AlignCenter)
+            title_label.setStyleSheet("color: #333; padding: 10px;")
+            layout.addWidget(title_label)
+        
+        self.text_area = QTextEdit()
+        self.text_area.setReadOnly(True)
+        self.text_area.setFont(QFont("Segoe UI", 11))
+        layout.addWidget(self.text_area)
+        
+        bottom = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #666; font-size: 9pt;")
+        bottom.addWidget(self.status_label, 1)
+        
+        self.regen_button = QPushButton("🔄 Regenerează")
+        self.regen_button.setToolTip("Ignoră textul salvat și cere unul nou de la Gemini")
+        self.regen_button.setEnabled(False)
+        self.regen_button.clicked.connect(self.regenerate)
+        bottom.addWidget(self.regen_button)
+        layout.addLayout(bottom)
+        
+        self.request = None
+        self.generation = 0
+    
+    def start(self, prompt, temperature=0.7, max_tokens=1024, cache_key=None, kind="", place="", force=False):
+        """
+        Afișează textul din cache dacă există (și force=False), altfel pornește generarea.
+        Rezultatul complet se salvează în cache sub cache_key.
+        """
+        self.request = (prompt, temperature, max_tokens, cache_key, kind, place)
+        if self.job and not self.job.future.done():
+            self.job.cancel()
+        self.generation += 1
+        generation = self.generation
+        self.received = False
+        
+        if cache_key and not force:
+            cached = ai_cache.get(cache_key)
+            if cached:
+                log_info(f"Text AI din cache ({kind}: {place}).")
+                self.text_area.setText(cached['text'])
+                self.status_label.setText(f"💾 Salvat la {cached.get('created', '?')} (fără cerere nouă)")
+                self.regen_button.setEnabled(True)
+                return
+        
+        model = gemini_model_value
+        log_info(f"Se apelează Gemini API (model: {model}, streaming)...")
+        self.text_area.setText("⏳ Se generează...")
+        self.status_label.setText("⏳ Se primește răspunsul...")
+        self.regen_button.setEnabled(False)
+        
+        def on_chunk(text):
+            self.ui_dispatcher.call(lambda: self.append_text(text) if generation == self.generation else None)
+        
+        self.job = gemini_client.stream_async(model, prompt, temperature, max_tokens, on_chunk=on_chunk)
+        self.ui_dispatcher.when_done(self.job.future, lambda fut: self.on_finished(fut, generation))
+    
+    def regenerate(self):
+        if self.request:
+            prompt, temperature, max_tokens, cache_key, kind, place = self.request
+            self.start(prompt, temperature, max_tokens, cache_key, kind, place, force=True)
+    
+    def append_text(self, text):
+        if not self.received:
+            self.text_area.clear()
+            self.received = True
+        self.text_area.moveCursor(QTextCursor.End)
+        self.text_area.insertPlainText(text)
+    
+    def on_finished(self, fut, generation):
+        if generation != self.generation:
+            return
+        self.regen_button.setEnabled(True)
+        try:
+            text = fut.result()
+            self.status_label.setText("")
+            log_success("Text AI generat cu succes.")
+            cache_key, kind, place = self.request[3:]
+            if cache_key:
+                ai_cache.put(cache_key, text, kind, place)
+        except GeminiCancelled:
+            return
+        except Exception as e:
+            log_error(f"Eroare Gemini API: {e}")
+            self.status_label.setText("⚠️ Generarea s-a întrerupt.")
+            if self.received:
+                self.append_text(f"\n\n⚠️ Eroare: {e}")
+            else:
+                self.text_area.setText(f"Eroare la apelul API: {e}")
+    
+    def done(self, result):
+        if self.job and not self.job.future.done():
+            self.job.cancel()
+            log_info("Generarea AI a fost oprită (dialog închis).")
+        super().done(result)
+
+class HistoryDialog(AiTextDialog):
+    """Dialog pentru afișarea informațiilor istorice."""
+    def __init__(self, place_name, parent=None):
+        super().__init__(f"📖 Despre: {place_name}", f"Despre {place_name}", parent)
+        self.resize(600, 550)
 
 class RouteDialog(QDialog):
     """Dialog pentru afișarea traseului."""
@@ -883,6 +1014,144 @@ class RouteDialog(QDialog):
         text_widget.setText(summary_text)
         layout.addWidget(text_widget)
 
+class DiagnosticsDialog(QDialog):
+    """Profilul pe faze al ultimelor operații (scanări, căutări, trasee) și statisticile HTTP / cotă."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🩺 Diagnostic")
+        self.resize(860, 560)
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Operația:"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.currentIndexChanged.connect(lambda _: self.show_selected())
+        top.addWidget(self.profile_combo, 1)
+        btn_refresh = QPushButton("🔄 Reîmprospătează")
+        btn_refresh.clicked.connect(lambda: self.refresh())
+        top.addWidget(btn_refresh)
+        layout.addLayout(top)
+
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Consolas", 9))
+        self.text.setLineWrapMode(QTextEdit.NoWrap)
+        layout.addWidget(self.text)
+        self.refresh()
+
+    def refresh(self):
+        # Cel mai recent profil primul
+        self.profiles = list(reversed(profiler.history))
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        for profile in self.profiles:
+            self.profile_combo.addItem(profile.title())
+        self.profile_combo.blockSignals(False)
+        self.show_selected()
+
+    def show_selected(self):
+        idx = self.profile_combo.currentIndex()
+        parts = []
+        if 0 <= idx < len(self.profiles):
+            parts.append(self.profiles[idx].summary())
+        else:
+            parts.append("Nicio operație profilată încă (rulează o scanare, o căutare sau un traseu).")
+        if startup.completed:
+            parts.append("\n" + startup.summary())
+        parts.append("\n🌐 HTTP pe endpoint (de la pornire):\n" + (http_transport.summary() or "-"))
+        stats = api_governor.stats()
+        calls = ", ".join(f"{m}: {n}" for m, n in sorted(stats['calls'].items())) or "-"
+        parts.append(f"\n💰 Cotă API ({stats['day']}): {stats['spent_usd']:.2f} / {stats['daily_cap_usd']} USD | "
+                     f"respinse: {stats['rejected']}\n   Apeluri: {calls}")
+        self.text.setPlainText("\n".join(parts))
+
+class MetricsPanel(QWidget):
+    """
+    Panou (dock) cu metricile API ale sesiunii: apeluri, latențe p50/p95 și cost estimat
+    pe metodă și funcționalitate, plus rata de hit a cache-urilor. Se reîmprospătează cât e vizibil.
+    """
+    HEADERS = ["API", "Metodă", "Funcționalitate", "Apeluri", "Erori", "Cost $", "p50 ms", "p95 ms", "Medie ms"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+
+        self.totals_label = QLabel()
+        self.totals_label.setStyleSheet("font-size: 10pt; font-weight: bold;")
+        layout.addWidget(self.totals_label)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        self.features_label = QLabel()
+        self.features_label.setWordWrap(True)
+        layout.addWidget(self.features_label)
+        self.cache_label = QLabel()
+        self.cache_label.setWordWrap(True)
+        layout.addWidget(self.cache_label)
+
+        buttons = QHBoxLayout()
+        for text, handler in (("📤 Prometheus", lambda: self.export("prom")), ("📤 CSV", lambda: self.export("csv")),
+                              ("♻️ Resetează", lambda: self.reset())):
+            btn = QPushButton(text)
+            btn.clicked.connect(handler)
+            buttons.addWidget(btn)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(2000)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        totals = metrics.totals()
+        self.totals_label.setText(f"Sesiune: {totals['calls']} apeluri, {totals['errors']} erori, "
+                                  f"cost estimat {totals['cost_usd']:.3f} USD")
+        rows = metrics.rows()
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                item = QTableWidgetItem("" if value is None else str(value))
+                if c >= 3: item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(r, c, item)
+
+        features = metrics.cost_by_feature()
+        self.features_label.setText("💰 Pe funcționalitate: " + (" | ".join(f"{name}: {cost:.3f} $" for name, cost in features.items()) or "-"))
+        caches = []
+        for name, st in metrics.cache_stats().items():
+            rate = f"{st['hit_rate'] * 100:.0f}%" if st['hit_rate'] is not None else "-"
+            caches.append(f"{name}: {rate} ({st['hits']}/{st['hits'] + st['misses']})")
+        self.cache_label.setText("🗄️ Cache: " + (" | ".join(caches) or "-"))
+
+    def export(self, kind):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        default = os.path.join(application_path, f"metrics_{timestamp}.{kind}")
+        file_filter = "CSV (*.csv)" if kind == "csv" else "Prometheus (*.prom *.txt)"
+        path, _ = QFileDialog.getSaveFileName(self, "Export metrici", default, file_filter)
+        if not path: return
+        try:
+            metrics.export(path)
+            log_success(f"Metrici exportate: {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Eroare", f"Nu am putut exporta metricile:\n{e}")
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
 class SettingsDialog(QDialog):
     """Dialog pentru setări."""
     def __init__(self, main_window, parent=None):
@@ -948,6 +1217,22 @@ class SettingsDialog(QDialog):
         
         ai_layout.addSpacing(10)
         
+        budget_label = QLabel("Buget zilnic Google Maps API (USD):")
+        budget_label.setFont(QFont("Helvetica", 10, QFont.Bold))
+        ai_layout.addWidget(budget_label)
+        
+        budget_row = QHBoxLayout()
+        self.budget_entry = QLineEdit()
+        self.budget_entry.setFixedWidth(100)
+        self.budget_entry.setText(f"{api_governor.daily_cap_usd:.2f}")
+        budget_row.addWidget(self.budget_entry)
+        usage = api_governor.stats()
+        budget_row.addWidget(QLabel(f"Consumat azi: ~{usage['spent_usd']:.2f} USD ({sum(usage['calls'].values())} cereri)"))
+        budget_row.addStretch()
+        ai_layout.addLayout(budget_row)
+        
+        ai_layout.addSpacing(10)
+        
         prompt_label = QLabel("Prompt pentru analist AI:")
         prompt_label.setFont(QFont("Helvetica", 10, QFont.Bold))
         ai_layout.addWidget(prompt_label)
@@ -1287,6 +1572,11 @@ class SettingsDialog(QDialog):
         gemini_model_value = self.model_entry.text().strip()
         ai_prompt_var = self.prompt_text.toPlainText().strip()
         
+        try:
+            api_governor.set_daily_cap(float(self.budget_entry.text().strip().replace(',', '.')))
+        except ValueError:
+            log_warning("Buget zilnic invalid; se păstrează valoarea anterioară.")
+        
         # Salvare Diversitate
         for cat_key, widgets in self.div_widgets.items():
             try:
@@ -1327,9 +1617,9 @@ class SettingsDialog(QDialog):
 def get_category_label(types_list):
     if not types_list: return "📍 Locație"
     
-    for cat_key, data in CATEGORIES_MAP.items():
-        if any(t in types_list for t in data['keywords']):
-            return data['label']
+    label = category_index.label(types_list)
+    if label:
+        return label
             
     simple_map = {
         'lodging': '🏨 Hotel/Cazare',
@@ -1419,14 +1709,7 @@ class RouteItemWidget(QFrame):
         stats_layout.setSpacing(8)
         stats_layout.setContentsMargins(0, 1, 0, 0)
         
-        rating_val = f"{rating}" if rating != 'N/A' else "-"
-        reviews_val = f"{reviews_count}"
-        
-        stats_html = (f"<span style='color:#f57c00; font-weight:bold;'>⭐ {rating_val}</span>"
-                      f"&nbsp;&nbsp;"
-                      f"<span style='color:#1976d2; font-weight:bold;'>📝 {reviews_val}</span>")
-        
-        self.stats_clickable = ClickableLabel(stats_html)
+        self.stats_clickable = ClickableLabel(self.stats_html())
         self.stats_clickable.setCursor(Qt.PointingHandCursor)
         self.stats_clickable.setToolTip("Citește Recenziile")
         self.stats_clickable.clicked.connect(self.open_reviews_dialog)
@@ -1448,16 +1731,17 @@ class RouteItemWidget(QFrame):
         BTN_W = 80
         BTN_H = 36
         
-        if self.website:
-            web_btn = QPushButton("🌐")
-            web_btn.setFixedSize(BTN_W, BTN_H)
-            web_btn.setToolTip(f"Website: {self.website}")
-            web_btn.setStyleSheet("""
-                QPushButton { background-color: #f8f9fa; border: 1px solid #ccc; border-radius: 4px; font-size: 16pt; }
-                QPushButton:hover { background-color: #e2e6ea; }
-            """)
-            web_btn.clicked.connect(self.open_website)
-            btns_layout.addWidget(web_btn)
+        # Ascuns cât timp nu se știe site-ul (poate sosi mai târziu, din update_details)
+        self.web_btn = QPushButton("🌐")
+        self.web_btn.setFixedSize(BTN_W, BTN_H)
+        self.web_btn.setToolTip(f"Website: {self.website}")
+        self.web_btn.setStyleSheet("""
+            QPushButton { background-color: #f8f9fa; border: 1px solid #ccc; border-radius: 4px; font-size: 16pt; }
+            QPushButton:hover { background-color: #e2e6ea; }
+        """)
+        self.web_btn.clicked.connect(self.open_website)
+        self.web_btn.setVisible(bool(self.website))
+        btns_layout.addWidget(self.web_btn)
         
         ai_btn = QPushButton("🗣️")
         ai_btn.setFixedSize(BTN_W, BTN_H)
@@ -1484,6 +1768,12 @@ class RouteItemWidget(QFrame):
     def sizeHint(self):
         return QSize(0, 70)
 
+    def stats_html(self):
+        rating_val = f"{self.rating}" if self.rating not in ('N/A', None) else "-"
+        return (f"<span style='color:#f57c00; font-weight:bold;'>⭐ {rating_val}</span>"
+                f"&nbsp;&nbsp;"
+                f"<span style='color:#1976d2; font-weight:bold;'>📝 {self.reviews_count}</span>")
+
     def update_index_style(self, index):
         self.index_label.setStyleSheet(f"background-color: {self.initial_color}; color: white; border-radius: 12px; font-weight: bold; font-size: 10pt;")
     
@@ -1508,11 +1798,34 @@ class RouteItemWidget(QFrame):
         self.index_label.setText(str(new_index))
         self.index_label.setStyleSheet(f"background-color: {self.initial_color}; color: white; border-radius: 12px; font-weight: bold; font-size: 10pt;")
 
+    def update_labels(self, name=None, address=None):
+        """Actualizează pe loc numele/adresa (ex: după ce sosește adresa din geocoding)."""
+        if name is not None:
+            self.name = name
+            self.name_label.setText(name)
+        if address is not None:
+            self.address = address
+
+    def update_details(self, name=None, address=None, rating=None, reviews_count=None, is_open_status=None, website=None):
+        """Actualizează pe loc rândul cu datele sosite în fundal (Place Details sau Excel)."""
+        self.update_labels(name, address)
+        if rating is not None:
+            self.rating = rating
+        if reviews_count is not None:
+            self.reviews_count = reviews_count
+        self.stats_clickable.setText(self.stats_html())
+        if is_open_status is not None:
+            self.is_open_status = is_open_status
+            self.status_label.setText(f"🕒 {is_open_status}")
+        if website:
+            self.website = website
+            self.web_btn.setToolTip(f"Website: {website}")
+            self.web_btn.setVisible(True)
+
     def show_on_map(self):
-        global route_places_coords
-        c = route_places_coords.get(self.place_id)
+        c = place_repo.coords(self.place_id)
         if c:
-            self.main_window.update_map_image(c['lat'], c['lng'], self.name, None, self.place_id)
+            self.main_window.update_map_image(c[0], c[1], self.name, None, self.place_id)
             
     def open_website(self):
         self.main_window.open_website(self.place_id, self.name)
@@ -1535,6 +1848,10 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("City Break Assistant (PySide6)")
         self.resize(1250, 850)
         
+        # Rezultatele din thread-urile de lucru ajung în UI prin acest dispecer
+        self.ui_dispatcher = UiDispatcher(self)
+        self.route_batch_depth = 0
+        
         # Aplicăm stiluri profesionale globale
         self.setStyleSheet("""
             QMainWindow {
@@ -1793,6 +2110,9 @@ class MainWindow(QMainWindow):
         self.route_start_entry = QLineEdit()
         self.route_start_entry.setPlaceholderText("Coordonate start...")
         self.route_start_entry.setFixedHeight(INPUT_H)
+        self.route_start_entry.setToolTip("Coordonate sau nume de loc (cu sugestii)")
+        self.route_start_autocomplete = PlaceAutocomplete(self.route_start_entry, self.ui_dispatcher, self.map_bias)
+        self.route_start_autocomplete.placeResolved.connect(lambda lat, lng, name: self.on_route_entry_resolved(self.route_start_entry, self.route_start_lbl, lat, lng, name))
         row_a.addWidget(self.route_start_entry)
         
         # Buton mic "Acadea"
@@ -1818,6 +2138,9 @@ class MainWindow(QMainWindow):
         self.route_end_entry = QLineEdit()
         self.route_end_entry.setPlaceholderText("Coordonate sosire...")
         self.route_end_entry.setFixedHeight(INPUT_H)
+        self.route_end_entry.setToolTip("Coordonate sau nume de loc (cu sugestii)")
+        self.route_end_autocomplete = PlaceAutocomplete(self.route_end_entry, self.ui_dispatcher, self.map_bias)
+        self.route_end_autocomplete.placeResolved.connect(lambda lat, lng, name: self.on_route_entry_resolved(self.route_end_entry, self.route_end_lbl, lat, lng, name))
         row_b.addWidget(self.route_end_entry)
         
         # Buton mic "Acadea"
@@ -2000,6 +2323,12 @@ class MainWindow(QMainWindow):
         b_div = QPushButton("⚙️ Setări", self)
         b_div.setFixedSize(120, 35); b_div.clicked.connect(lambda: self.open_settings())
         h_v2.addWidget(b_div)
+        b_diag = QPushButton("🩺 Diagnostic", self)
+        b_diag.setFixedSize(120, 35); b_diag.clicked.connect(lambda: self.open_diagnostics())
+        h_v2.addWidget(b_diag)
+        b_metrics = QPushButton("📊 Metrici", self)
+        b_metrics.setFixedSize(120, 35); b_metrics.clicked.connect(lambda: self.metrics_dock.setVisible(not self.metrics_dock.isVisible()))
+        h_v2.addWidget(b_metrics)
         l_circ.addLayout(h_v2)
         
         # V3
@@ -2106,7 +2435,7 @@ class MainWindow(QMainWindow):
         self.prompt_entry.setStyleSheet("border: 1px solid #ccc; border-radius: 4px; padding-left: 8px; font-size: 11pt;")
         
         # BONUS: Apăsarea tastei Enter declanșează căutarea
-        self.prompt_entry.returnPressed.connect(self.send_request)
+        self.prompt_entry.returnPressed.connect(lambda: self.send_request())
         
         h_src.addWidget(self.prompt_entry)
         # -----------------------------------------------
@@ -2114,7 +2443,7 @@ class MainWindow(QMainWindow):
         b_src = QPushButton("🔍")
         b_src.setFixedSize(80, 40) 
         b_src.setStyleSheet("background-color: #4a90d9; color: white; font-size: 16px; border-radius: 4px;")
-        b_src.clicked.connect(self.send_request)
+        b_src.clicked.connect(lambda: self.send_request())
         h_src.addWidget(b_src)
         h_src.addStretch()
         l3.addLayout(h_src)
@@ -2214,7 +2543,8 @@ class MainWindow(QMainWindow):
         b_gen = QPushButton("🗺️ Planifică și Generează Traseu")
         b_gen.setFixedHeight(45) 
         b_gen.setStyleSheet("background-color: #ff5722; color: white; font-weight: bold; font-size: 12pt; border-radius: 5px;")
-        b_gen.clicked.connect(self.generate_optimized_route)
+        # lambda: decoratorul de profilare nu trebuie să primească 'checked' de la semnal
+        b_gen.clicked.connect(lambda: self.generate_optimized_route())
         l3.addWidget(b_gen)
         
         top_layout.addWidget(g3)
@@ -2235,6 +2565,8 @@ class MainWindow(QMainWindow):
         self.map_search_entry = QLineEdit()
         self.map_search_entry.setFixedWidth(150)
         self.map_search_entry.returnPressed.connect(self.search_location_on_map)
+        self.map_search_autocomplete = PlaceAutocomplete(self.map_search_entry, self.ui_dispatcher, self.map_bias)
+        self.map_search_autocomplete.placeResolved.connect(self.on_map_search_resolved)
         map_header.addWidget(self.map_search_entry)
         
         go_btn = QPushButton("Mergi")
@@ -2296,33 +2628,16 @@ class MainWindow(QMainWindow):
         # Variabilă pentru tipul de hartă
         self.current_map_type = 'roadmap'
         
-        # 4. Încărcăm HTML-ul
-        try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            map_path = resource_path("map_template.html")
-
-            with open(map_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            
-            # Injectare Cheie
-            placeholder = "API_KEY_PLACEHOLDER"
-            if placeholder in html_content:
-                html_content = html_content.replace(placeholder, api_key)
-                log_success("Cheia API a fost injectată.")
-            else:
-                log_warning("Placeholder-ul nu a fost găsit (posibil cheie hardcoded).")
-
-            self.web_view.setHtml(html_content, QUrl.fromLocalFile(map_path))
-            
-        except Exception as e:
-            log_error(f"Nu s-a putut încărca map_template.html: {e}")
-            self.web_view.setHtml(f"<h3>Eroare: {e}</h3>")
-
+        # 4. HTML-ul hărții se încarcă după afișarea ferestrei (finish_startup -> load_map_page)
         map_layout.addWidget(self.web_view, 1)
         
         # --- FIX STARTUP: Așteptăm încărcarea hărții ---
         self.map_is_loaded = False
         self.web_view.loadFinished.connect(self.on_map_ready)
+        # Stratul custom salvat (cale, vizibil), citit din Excel după afișare (finish_startup)
+        self.pending_custom_restore = None
+        # Opririle restaurate fără detalii în instantaneu (stare veche), completate după afișare
+        self.pending_route_refresh = []
 
         content_layout.addWidget(map_panel, 0, 0)
         
@@ -2465,6 +2780,24 @@ class MainWindow(QMainWindow):
         refresh_route_btn.clicked.connect(self.refresh_route_info)
         route_buttons_layout.addWidget(refresh_route_btn)
         
+        self.prefill_history_btn = QPushButton("📚 Istoric AI")
+        self.prefill_history_btn.setToolTip("Pregătește în fundal textele istorice pentru toate locurile din traseu\n(mai multe locuri într-o singură cerere Gemini)")
+        self.prefill_history_btn.setStyleSheet("""
+            QPushButton {
+                font-size: 11pt;
+                padding: 8px 16px;
+                background-color: #ede7f6;
+                color: #4527a0;
+                border: 1px solid #b39ddb;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #d1c4e9;
+            }
+        """)
+        self.prefill_history_btn.clicked.connect(self.prefill_route_history)
+        route_buttons_layout.addWidget(self.prefill_history_btn)
+        
         # --- NOU: Filtru ComboBox ---
         route_buttons_layout.addSpacing(15)
         self.route_filter_combo = QComboBox()
@@ -2497,11 +2830,52 @@ class MainWindow(QMainWindow):
         self.sort_group.buttonClicked.connect(self.update_ui_states)
         self.my_coords_entry.textChanged.connect(self.update_ui_states)
         
+        # Panoul de metrici API (dock, ascuns implicit; butonul 📊 Metrici)
+        self.metrics_dock = QDockWidget("📊 Metrici API", self)
+        self.metrics_dock.setObjectName("metrics_dock")
+        self.metrics_dock.setWidget(MetricsPanel(self.metrics_dock))
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.metrics_dock)
+        self.metrics_dock.hide()
+        
         # Încărcare stare
+        self.state_store = StateStore(os.path.join(application_path, STATE_DB),
+                                      legacy_json=os.path.join(application_path, STATE_FILE))
         self.load_state()
         self.refresh_location_combo()
         self.update_ui_states()
+        
+        # Salvare incrementală: orice modificare (re)pornește temporizatorul, la expirare se scriu
+        # doar secțiunile schimbate (o oprire bruscă pierde cel mult ultimele STATE_SAVE_DELAY_MS)
+        self.state_save_timer = QTimer(self)
+        self.state_save_timer.setSingleShot(True)
+        self.state_save_timer.setInterval(STATE_SAVE_DELAY_MS)
+        self.state_save_timer.timeout.connect(lambda: self.save_state(quiet=True))
+        self.connect_state_autosave()
     
+    def schedule_state_save(self, *args):
+        timer = getattr(self, 'state_save_timer', None)
+        if timer is not None:
+            timer.start()
+
+    def connect_state_autosave(self):
+        """Câmpurile, bifele și listele ferestrei, lista traseului și depozitul de locuri programează salvarea stării."""
+        for w in self.findChildren(QLineEdit):
+            w.textChanged.connect(self.schedule_state_save)
+        for w in self.findChildren(QCheckBox) + self.findChildren(QRadioButton):
+            w.toggled.connect(self.schedule_state_save)
+        for w in self.findChildren(QComboBox):
+            w.currentIndexChanged.connect(self.schedule_state_save)
+        model = self.route_list.model()
+        model.rowsInserted.connect(self.schedule_state_save)
+        model.rowsRemoved.connect(self.schedule_state_save)
+        model.rowsMoved.connect(self.schedule_state_save)
+        place_repo.subscribe(self.on_places_changed)
+
+    def on_places_changed(self, event, place_id):
+        """Modificările din depozitul de locuri (detalii, trasee) intră în salvarea stării; căutarea nu."""
+        if event != 'search':
+            self.schedule_state_save()
+
     def get_search_type(self):
         if self.radio_my_position.isChecked():
             return "my_position"
@@ -2566,7 +2940,7 @@ class MainWindow(QMainWindow):
     
     def switch_route_mode(self, to_linear=False):
         """Schimbă contextul între Circular și Liniar (A->B)."""
-        global selected_places, route_places_coords, linear_places, linear_places_coords, is_linear_mode
+        global is_linear_mode
         
         # Evităm munca inutilă dacă suntem deja în modul cerut
         if is_linear_mode == to_linear:
@@ -2574,21 +2948,7 @@ class MainWindow(QMainWindow):
 
         # 1. SALVĂM ORDINEA CURENTĂ (din GUI în Memorie)
         # Astfel, dacă ai reordonat cu drag & drop, nu pierzi ordinea la schimbarea tab-ului
-        current_dict = linear_places if is_linear_mode else selected_places
-        new_ordered_dict = {}
-        
-        # Iterăm prin lista vizuală pentru a captura ordinea
-        for i in range(self.route_list.count()):
-            item = self.route_list.item(i)
-            pid = item.data(Qt.UserRole)
-            if pid in current_dict:
-                new_ordered_dict[pid] = current_dict[pid]
-        
-        # Suprascriem memoria veche cu versiunea ordonată
-        if is_linear_mode:
-            linear_places = new_ordered_dict
-        else:
-            selected_places = new_ordered_dict
+        place_repo.set_route_order(route_mode(), self.get_route_order())
 
         # 2. SCHIMBĂM MODUL
         is_linear_mode = to_linear
@@ -2596,23 +2956,22 @@ class MainWindow(QMainWindow):
         # 3. ACTUALIZĂM INTERFAȚA VIZUALĂ
         self.route_list.clear()
         
-        # Ce memorie încărcăm acum?
-        target_dict = linear_places if is_linear_mode else selected_places
-        
-        # Reconstruim lista element cu element
-        for pid, data in target_dict.items():
-            self.add_to_route_list(
-                place_id=pid,
-                name=data.get('name', 'Unknown'),
-                address=data.get('address', ''),
-                rating=data.get('rating', 'N/A'),
-                reviews_count=data.get('reviews_count', 0),
-                is_open_status=data.get('is_open_status', 'N/A'),
-                place_types=data.get('types', []),
-                route_info=data.get('route_info'),
-                website=data.get('website'),
-                update_memory=False # IMPORTANT: Nu vrem să le re-adăugăm în dict, sunt deja acolo
-            )
+        # Reconstruim lista din traseul modului nou
+        with self.batched_route_update():
+            for rec in place_repo.route_records(route_mode()):
+                self.add_to_route_list(
+                    place_id=rec.place_id,
+                    name=rec.name or 'Unknown',
+                    address=rec.address,
+                    initial_color=rec.initial_color,
+                    rating=rec.rating,
+                    reviews_count=rec.reviews_count,
+                    is_open_status=rec.is_open_status,
+                    place_types=rec.types,
+                    route_info=rec.route_info,
+                    website=rec.website,
+                    update_memory=False # IMPORTANT: sunt deja în traseul modului
+                )
             
         # 4. ACTUALIZĂM TITLUL TABULUI
         mode_label = "Liniar (A->B)" if is_linear_mode else "Circular"
@@ -2680,13 +3039,30 @@ class MainWindow(QMainWindow):
         parsed = parse_coordinates(coords_text)
         if parsed:
             lat, lng = parsed
-            address = reverse_geocode(lat, lng)
-            if len(address) > 60:
-                address = address[:57] + "..."
-            address_label_widget.setText(f"📍 {address}")
+            self.request_address(lat, lng, lambda address: self.show_address_on_label(coords_entry_widget, address_label_widget, coords_text, address))
         else:
             address_label_widget.setText("⚠️ Coordonate invalide")
     
+    def request_address(self, lat, lng, on_address):
+        """Reverse geocoding în fundal (cu cache); on_address(adresă) rulează pe thread-ul UI."""
+        def deliver(fut):
+            try:
+                address = fut.result()
+            except Exception as e:
+                log_error(f"Eroare la reverse geocoding: {e}")
+                address = f"Eroare: {e}"
+            on_address(address)
+        
+        self.ui_dispatcher.when_done(geocode_cache.lookup_async(lat, lng), deliver)
+    
+    def show_address_on_label(self, coords_entry_widget, address_label_widget, coords_text, address):
+        # Ignorăm răspunsurile întârziate dacă între timp s-au schimbat coordonatele
+        if coords_entry_widget.text().strip() != coords_text:
+            return
+        if len(address) > 60:
+            address = address[:57] + "..."
+        address_label_widget.setText(f"📍 {address}")
+    
     def update_address_and_center_map(self, coords_entry_widget, address_label_widget, location_name="Locația selectată", address_var_name=None):
         global my_coords_full_address, explore_coords_full_address
         
@@ -2702,21 +3078,29 @@ class MainWindow(QMainWindow):
         parsed = parse_coordinates(coords_text)
         if parsed:
             lat, lng = parsed
-            address = reverse_geocode(lat, lng)
-            
-            if address_var_name == "my_coords":
-                my_coords_full_address = address
-            elif address_var_name == "explore_coords":
-                explore_coords_full_address = address
-            
-            display_address = address
-            if len(address) > 60:
-                display_address = address[:57] + "..."
-            address_label_widget.setText(f"📍 {display_address}")
+            # Harta se mută imediat; adresa se completează când sosește din geocoding
+            self.update_map_image(lat, lng, location_name, 15, None)
+            
+            def on_address(address):
+                global my_coords_full_address, explore_coords_full_address, current_map_name
+                if coords_entry_widget.text().strip() != coords_text:
+                    return
+                if address_var_name == "my_coords":
+                    my_coords_full_address = address
+                elif address_var_name == "explore_coords":
+                    explore_coords_full_address = address
+                
+                display_address = address
+                if len(address) > 60:
+                    display_address = address[:57] + "..."
+                address_label_widget.setText(f"📍 {display_address}")
+                
+                if current_map_lat == lat and current_map_lng == lng:
+                    current_map_name = address if len(address) <= 40 else address[:37] + "..."
+                log_success(f"Harta a fost centrată pe: {address}")
             
-            map_name = address if len(address) <= 40 else address[:37] + "..."
-            self.update_map_image(lat, lng, map_name, 15, None)
-            log_success(f"Harta a fost centrată pe: {address}")
+            address_label_widget.setText("📍 ⏳ Se caută adresa...")
+            self.request_address(lat, lng, on_address)
         else:
             address_label_widget.setText("⚠️ Coordonate invalide")
             if address_var_name == "my_coords":
@@ -2750,33 +3134,79 @@ class MainWindow(QMainWindow):
     def open_settings(self):
         dialog = SettingsDialog(self, self)
         dialog.exec()
+        self.schedule_state_save()  # locații salvate, setări AI / diversitate / scor
+
+    def open_diagnostics(self):
+        dialog = DiagnosticsDialog(self)
+        dialog.exec()
     
     def search_location_on_map(self):
         query = self.map_search_entry.text().strip()
         if not query:
             return
         
-        try:
-            log_info(f"Navigare hartă către: {query}")
-            geocode_result = gmaps_client.geocode(query, language='ro')
-            
-            if geocode_result:
-                location = geocode_result[0]['geometry']['location']
-                lat, lng = location['lat'], location['lng']
-                formatted_address = geocode_result[0]['formatted_address']
-                
-                zoom = 15 if any(char.isdigit() for char in query) else 12
-                
-                self.update_map_image(lat, lng, formatted_address, zoom, None)
-                log_success(f"Harta mutată la: {formatted_address}")
-            else:
-                QMessageBox.warning(self, "Info", "Locația nu a fost găsită.")
-                
-        except Exception as e:
-            log_error(f"Eroare navigare hartă: {e}")
-    
-    def set_map_center_as_explore(self):
-        global current_map_lat, current_map_lng
+        # Sugestia aleasă din listă e rezolvată deja de autocomplete
+        if self.map_search_autocomplete.is_suggestion(query):
+            return
+        
+        coords = parse_coordinates(query)
+        if coords:
+            self.update_map_image(coords[0], coords[1], query, 15, None)
+            return
+        
+        log_info(f"Navigare hartă către: {query}")
+        
+        def deliver(fut):
+            try:
+                result = fut.result()
+            except Exception as e:
+                log_error(f"Eroare navigare hartă: {e}")
+                return
+            if not result:
+                QMessageBox.warning(self, "Info", "Locația nu a fost găsită.")
+                return
+            lat, lng, formatted_address = result
+            zoom = 15 if any(char.isdigit() for char in query) else 12
+            self.update_map_image(lat, lng, formatted_address, zoom, None)
+            log_success(f"Harta mutată la: {formatted_address}")
+        
+        # Numele deja rezolvate vin din trie-ul local, fără rețea
+        self.ui_dispatcher.when_done(place_lookup.resolve_async(query), deliver)
+    
+    def on_map_search_resolved(self, lat, lng, name):
+        zoom = 15 if any(char.isdigit() for char in name) else 12
+        self.update_map_image(lat, lng, name, zoom, None)
+        log_success(f"Harta mutată la: {name}")
+    
+    def map_bias(self):
+        """Centrul hărții, folosit ca preferință de zonă pentru sugestiile de autocomplete."""
+        if current_map_lat is None or current_map_lng is None:
+            return None
+        return (current_map_lat, current_map_lng)
+    
+    def resolve_entry_offline(self, coords_entry_widget, address_label_widget):
+        """Dacă în câmp e un nume deja rezolvat (trie local), îl înlocuim cu coordonatele lui."""
+        text = coords_entry_widget.text().strip()
+        if not text or parse_coordinates(text):
+            return
+        known = place_lookup.known(text)
+        if known:
+            self.on_route_entry_resolved(coords_entry_widget, address_label_widget, known['lat'], known['lng'], known['name'])
+    
+    def resolve_route_entries_offline(self):
+        """Start (A) și destinația (B): numele de locuri folosite anterior devin coordonate, fără geocodare."""
+        self.resolve_entry_offline(self.route_start_entry, self.route_start_lbl)
+        self.resolve_entry_offline(self.route_end_entry, self.route_end_lbl)
+    
+    def on_route_entry_resolved(self, coords_entry_widget, address_label_widget, lat, lng, name):
+        """Sugestia aleasă devine coordonate în câmp; numele rămâne afișat sub el."""
+        coords_entry_widget.setText(f"{lat}, {lng}")
+        display_name = name if len(name) <= 60 else name[:57] + "..."
+        address_label_widget.setText(f"📍 {display_name}")
+        log_success(f"Loc rezolvat: {name} ({lat:.6f}, {lng:.6f})")
+    
+    def set_map_center_as_explore(self):
+        global current_map_lat, current_map_lng
         
         if current_map_lat is None or current_map_lng is None:
             QMessageBox.warning(self, "Info", "Harta nu este inițializată.")
@@ -2813,6 +3243,7 @@ class MainWindow(QMainWindow):
         current_map_name = name
         current_zoom_level = target_zoom
         current_map_place_id = place_id
+        self.schedule_state_save()
         
         self.zoom_in_button.setEnabled(True)
         self.zoom_out_button.setEnabled(True)
@@ -2853,17 +3284,13 @@ class MainWindow(QMainWindow):
 
     
     def on_map_click(self):
-        global current_search_results, current_distance_info, current_map_place_id, current_map_name
+        global current_map_place_id, current_map_name
         
         if not current_map_place_id:
             log_info("Nu există un loc selectat pe hartă.")
             return
         
-        current_place = None
-        for place in current_search_results:
-            if place.get('place_id') == current_map_place_id:
-                current_place = place
-                break
+        current_place = place_repo.search_result(current_map_place_id)
         
         if not current_place:
             log_info(f"Se caută detalii pentru place_id: {current_map_place_id}")
@@ -2880,7 +3307,7 @@ class MainWindow(QMainWindow):
                 return
         
         self.clear_results()
-        self.create_place_card(current_place, current_distance_info)
+        self.create_place_card(current_place, place_repo.distance_info())
         
         dialog = ReviewsDialog(current_map_place_id, current_map_name, self)
         dialog.exec()
@@ -2894,7 +3321,6 @@ class MainWindow(QMainWindow):
                 child.widget().deleteLater()
     
     def create_place_card(self, place, distance_info=None):
-        global selected_places, route_places_coords, linear_places_coords, is_linear_mode, linear_places
         
         name = place.get('name', 'Fără nume')
         address = place.get('vicinity', place.get('formatted_address', 'Adresă necunoscută'))
@@ -2912,12 +3338,9 @@ class MainWindow(QMainWindow):
         lat = location.get('lat')
         lng = location.get('lng')
         
-        # --- [MODIFICARE] SALVARE COORDONATE DUALĂ ---
+        # --- Coordonatele intră în depozit ---
         if place_id and lat and lng:
-            if is_linear_mode:
-                linear_places_coords[place_id] = {'lat': lat, 'lng': lng, 'name': name}
-            else:
-                route_places_coords[place_id] = {'lat': lat, 'lng': lng, 'name': name}
+            place_repo.remember_coords(place_id, lat, lng, name)
         # ---------------------------------------------
         
         card = QFrame()
@@ -2960,9 +3383,8 @@ class MainWindow(QMainWindow):
             sel_checkbox = QCheckBox()
             sel_checkbox.setStyleSheet("QCheckBox::indicator { width: 26px; height: 26px; }")
             
-            # Verificăm în memoria activă
-            target_dict = linear_places if is_linear_mode else selected_places
-            if place_id in target_dict:
+            # Verificăm în traseul modului activ
+            if place_repo.in_route(place_id, route_mode()):
                 sel_checkbox.setChecked(True)
                 
             p_types = place.get('types', [])
@@ -3047,21 +3469,11 @@ class MainWindow(QMainWindow):
 
 
     def toggle_selection(self, place_id, name, rating, reviews_count, is_open_status, state, place_types=None, website=None):
-        global selected_places
         if state == Qt.Checked.value:
-            selected_places[place_id] = {
-                'name': name,
-                'rating': rating,
-                'reviews_count': reviews_count,
-                'is_open_status': is_open_status,
-                'types': place_types or [],
-                'website': website 
-            }
             log_info(f"Adăugat la traseu: {name}")
             self.add_to_route_list(place_id, name, "", None, rating, reviews_count, is_open_status, place_types, None, website)
         else:
-            if place_id in selected_places:
-                del selected_places[place_id]
+            if place_repo.in_route(place_id, route_mode()):
                 log_info(f"Eliminat din traseu: {name}")
                 self.remove_from_route_list(place_id)
         
@@ -3070,32 +3482,12 @@ class MainWindow(QMainWindow):
     def add_to_route_list(self, place_id, name, address="", initial_color=None, rating='N/A', reviews_count=0, is_open_status='Program necunoscut', place_types=None, route_info=None, website=None, update_memory=True):
         """Adaugă un element în lista vizuală și (opțional) în memoria activă."""
         
-        # --- LOGICĂ MEMORIE DUBLĂ ---
+        # --- LOGICĂ MEMORIE DUBLĂ: traseul modului activ (coordonatele sunt deja în înregistrare) ---
         if update_memory:
-            global selected_places, linear_places, is_linear_mode, route_places_coords, linear_places_coords
-            
-            # Alegem dicționarul activ
-            target_dict = linear_places if is_linear_mode else selected_places
-            
-            # Salvăm datele
-            target_dict[place_id] = {
-                'name': name,
-                'address': address,
-                'rating': rating,
-                'reviews_count': reviews_count,
-                'is_open_status': is_open_status,
-                'types': place_types or [],
-                'website': website,
-                'route_info': route_info
-            }
-            
-            # Gestionăm coordonatele (dacă există în cache-ul global temporar, le mutăm în cel permanent)
-            # Verificăm în ambele surse de coordonate posibile
-            source_coords = route_places_coords if not is_linear_mode else linear_places_coords
-            # Notă: route_places_coords a fost folosit istoric pentru toate. 
-            # Acum, dacă suntem pe liniar, ne asigurăm că avem coordonatele și în linear_places_coords
-            if is_linear_mode and place_id in route_places_coords:
-                linear_places_coords[place_id] = route_places_coords[place_id]
+            place_repo.add_to_route(place_id, route_mode(), name=name, address=address, rating=rating,
+                                    reviews_count=reviews_count, is_open_status=is_open_status,
+                                    types=place_types or [], website=website, route_info=route_info,
+                                    initial_color=initial_color)
         # ---------------------------
 
         index = self.route_list.count() + 1
@@ -3109,8 +3501,26 @@ class MainWindow(QMainWindow):
         self.route_list.addItem(item)
         self.route_list.setItemWidget(item, item_widget)
         
+        # În batched_route_update(), actualizările de listă se fac o singură dată, la final
+        if self.route_batch_depth:
+            return
         self.update_lock_states()
         self.apply_route_filter()
+    
+    @contextmanager
+    def batched_route_update(self):
+        """Adăugări multiple în lista traseului cu o singură redesenare și actualizare la final."""
+        self.route_batch_depth += 1
+        self.route_list.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.route_batch_depth -= 1
+            if not self.route_batch_depth:
+                self.update_lock_states()
+                self.apply_route_filter()
+                self.update_route_tab_title()
+                self.route_list.setUpdatesEnabled(True)
 
     def on_route_items_moved(self):
         """Se apelează după drag & drop. Reconstruiește lista pentru a repara widget-urile distruse."""
@@ -3139,30 +3549,13 @@ class MainWindow(QMainWindow):
         self.route_list.clear()
         
         # 3. Reconstruim lista curată, element cu element, păstrând culorile
-        global selected_places
-        for place_id in new_order_ids:
-            if place_id in selected_places:
-                data = selected_places[place_id]
-                
-                if isinstance(data, dict):
-                    name = data.get('name', "Unknown")
-                    address = data.get('address', "")
-                    rating = data.get('rating', 'N/A')
-                    reviews_count = data.get('reviews_count', 0)
-                    is_open_status = data.get('is_open_status', 'Program necunoscut')
-                    place_types = data.get('types', [])
-                else:
-                    # Fallback pentru date vechi (doar nume)
-                    name = str(data)
-                    address = ""
-                    rating = 'N/A'
-                    reviews_count = 0
-                    is_open_status = 'Program necunoscut'
-                
+        place_repo.set_route_order(route_mode(), new_order_ids)
+        with self.batched_route_update():
+            for rec in place_repo.route_records(route_mode()):
                 # Reconstruim rândul cu culoarea originală și toate datele
-                original_color = saved_colors.get(place_id)
-                place_types = data.get('types', []) if isinstance(data, dict) else []
-                self.add_to_route_list(place_id, name, address, original_color, rating, reviews_count, is_open_status, place_types)
+                self.add_to_route_list(rec.place_id, rec.name or "Unknown", rec.address, saved_colors.get(rec.place_id),
+                                       rec.rating, rec.reviews_count, rec.is_open_status, rec.types,
+                                       rec.route_info, rec.website, update_memory=False)
         
         # 4. Restaurăm bifele inteligent
         # Parcurgem de la început și restaurăm bifele doar pentru elementele 
@@ -3195,10 +3588,14 @@ class MainWindow(QMainWindow):
         
         # 6. Salvăm noua ordine pentru următorul drag & drop
         self.save_route_order()
+        
+        # 7. Totalul din titlul tab-ului se actualizează imediat din tronsoanele din cache
+        self.update_route_estimate_from_cache()
     
     def on_lock_changed(self, place_id, locked):
         """Se apelează când se schimbă starea de blocare a unui element."""
         self.update_lock_states()
+        self.schedule_state_save()
     
     def update_lock_states(self):
         """Actualizează starea checkbox-urilor de blocare conform regulii consecutive."""
@@ -3243,14 +3640,8 @@ class MainWindow(QMainWindow):
     
     def remove_from_route_list(self, place_id):
         """Elimină o locație din lista vizuală și din memoria activă."""
-        global selected_places, linear_places, is_linear_mode
-        
-        # Alegem dicționarul activ
-        target_dict = linear_places if is_linear_mode else selected_places
-        
-        # Ștergem din memorie
-        if place_id in target_dict:
-            del target_dict[place_id]
+        # Ștergem din traseul modului activ
+        place_repo.remove_from_route(place_id, route_mode())
             
         # Ștergem din lista vizuală
         for i in range(self.route_list.count()):
@@ -3265,6 +3656,7 @@ class MainWindow(QMainWindow):
         self.save_route_order()
         self.apply_route_filter()
         self.update_route_tab_title()
+        self.update_route_estimate_from_cache()
     
     def renumber_route_items(self):
         """Renumerotează toate elementele din lista de traseu."""
@@ -3275,8 +3667,6 @@ class MainWindow(QMainWindow):
                 widget.update_index(i + 1)
     
     def reorder_route_list(self, new_order):
-        global selected_places
-        
         saved_colors = {}
         saved_locks = {}
         
@@ -3292,32 +3682,24 @@ class MainWindow(QMainWindow):
         self.route_list.clear()
         
         # 2. Reconstruim lista în ordinea nouă
+        mode = route_mode()
+        place_repo.set_route_order(mode, new_order)
         for place_id in new_order:
-            if place_id in selected_places:
-                d = selected_places[place_id]
-                
-                name = d.get('name', "Unknown")
-                addr = d.get('address', "")
-                rt = d.get('rating', 'N/A')
-                rc = d.get('reviews_count', 0)
-                st = d.get('is_open_status', 'Program necunoscut')
-                pt = d.get('types', [])
-                r_info = d.get('route_info', None)
-                
-                # --- FIX: EXTRAGEM ȘI WEBSITE-UL ---
-                web = d.get('website', None)
-                # -----------------------------------
-                
-                col = saved_colors.get(place_id)
-                
-                # Îl pasăm mai departe la creare
-                self.add_to_route_list(place_id, name, addr, col, rt, rc, st, pt, r_info, website=web)
-                
-                # Restaurăm lacătul
-                last_row = self.route_list.count() - 1
-                item = self.route_list.item(last_row)
-                w = self.route_list.itemWidget(item)
-                if w: w.set_locked(saved_locks.get(place_id, False))
+            d = place_repo.get(place_id)
+            if d is None or not place_repo.in_route(place_id, mode):
+                continue
+            
+            col = saved_colors.get(place_id)
+            
+            # Îl pasăm mai departe la creare (cu website, din înregistrare)
+            self.add_to_route_list(place_id, d.name or "Unknown", d.address, col, d.rating, d.reviews_count,
+                                   d.is_open_status, d.types, d.route_info, website=d.website, update_memory=False)
+            
+            # Restaurăm lacătul
+            last_row = self.route_list.count() - 1
+            item = self.route_list.item(last_row)
+            w = self.route_list.itemWidget(item)
+            if w: w.set_locked(saved_locks.get(place_id, False))
         
         self.update_lock_states()
         self.save_route_order()
@@ -3344,12 +3726,10 @@ class MainWindow(QMainWindow):
 
     def remove_selected_from_route(self):
         """Elimină locația selectată din traseu."""
-        global selected_places
         current_item = self.route_list.currentItem()
         if current_item:
             place_id = current_item.data(Qt.UserRole)
-            if place_id in selected_places:
-                del selected_places[place_id]
+            place_repo.remove_from_route(place_id, route_mode())
             self.route_list.takeItem(self.route_list.row(current_item))
             self.update_route_tab_title()
             self.renumber_route_items()
@@ -3359,8 +3739,7 @@ class MainWindow(QMainWindow):
     
     def clear_route(self):
         """Golește tot traseul."""
-        global selected_places
-        selected_places.clear()
+        place_repo.clear_route(route_mode())
         self.route_list.clear()
         self.update_route_tab_title()
         self.save_route_order()
@@ -3373,10 +3752,57 @@ class MainWindow(QMainWindow):
         self.web_view.page().runJavaScript(js_nuke)
         log_info("Harta a fost curățată forțat (V22).")
 
-    def refresh_route_info(self, silent_mode=False):
-        """Actualizează informațiile prin API Google (V66 - Fix Eroare Types)."""
-        global selected_places, linear_places, is_linear_mode
+    def prefill_route_history(self):
+        """Cere în lot textele 'Istoric' pentru locurile din traseu care nu sunt încă în cache."""
+        if getattr(self, 'history_batch_cancel', None) and not self.history_batch_cancel.is_set():
+            log_info("Pregătirea istoricului AI rulează deja.")
+            return
+        
+        places = []
+        for i in range(self.route_list.count()):
+            widget = self.route_list.itemWidget(self.route_list.item(i))
+            if not isinstance(widget, RouteItemWidget) or str(widget.place_id).startswith("waypoint_"):
+                continue
+            key = history_cache_key(widget.name, widget.address)
+            if ai_cache.get(key):
+                continue
+            places.append({'id': str(len(places) + 1), 'name': widget.name, 'address': widget.address, 'key': key})
+        
+        if not places:
+            log_info("Toate locurile din traseu au deja textul istoric pregătit.")
+            return
+        
+        enricher = BatchEnricher(gemini_client, gemini_model_value,
+                                 temperature=HISTORY_GENERATION['temperature'], on_error=log_error)
+        batches, skipped = enricher.plan(places)
+        log_info(f"Istoric AI: {len(places)} locuri în {len(batches)} cereri Gemini"
+                 + (f" ({len(skipped)} peste buget)" if skipped else "") + "...")
+        
+        def on_result(place, text):
+            # Rulează pe firul Gemini: put() e sigur între fire, iar scrierea pe disc e amânată în fundal
+            ai_cache.put(place['key'], text, "history", place['name'])
+        
+        self.history_batch_cancel = threading.Event()
+        self.prefill_history_btn.setEnabled(False)
+        self.prefill_history_btn.setText("⏳ Istoric AI...")
+        future = gemini_client.executor.submit(enricher.run, places, on_result, self.history_batch_cancel)
+        
+        def finished(fut):
+            self.history_batch_cancel.set()
+            self.prefill_history_btn.setEnabled(True)
+            self.prefill_history_btn.setText("📚 Istoric AI")
+            try:
+                results, missing = fut.result()
+            except Exception as e:
+                log_error(f"Eroare la pregătirea istoricului AI: {e}")
+                return
+            log_success(f"Istoric AI pregătit pentru {len(results)} locuri (~{enricher.tokens_used} tokeni)."
+                        + (f" {len(missing)} rămase pentru cererea individuală." if missing else ""))
         
+        self.ui_dispatcher.when_done(future, finished)
+    
+    def refresh_route_info(self, silent_mode=False):
+        """Actualizează informațiile prin API Google; rândurile se actualizează pe loc, pe măsură ce sosesc."""
         is_silent = silent_mode is True
         
         if self.route_list.count() == 0:
@@ -3387,136 +3813,98 @@ class MainWindow(QMainWindow):
             reply = QMessageBox.question(self, "Refresh", "Actualizez datele prin API Google?", QMessageBox.Yes | QMessageBox.No)
             if reply != QMessageBox.Yes: return
         
-        try:
-            log_info("Se actualizează datele LIVE de la Google...")
-            
-            target_dict = linear_places if is_linear_mode else selected_places
-            route_order = []
-            
-            # Salvăm ordinea
-            for i in range(self.route_list.count()):
-                item = self.route_list.item(i)
-                pid = item.data(Qt.UserRole)
-                route_order.append(pid)
-            
-            updated_count = 0
-            
-            for place_id in route_order:
-                try:
-                    # Păstrăm datele vechi (ca să nu pierdem tipul locului)
-                    old_data = target_dict.get(place_id, {})
-                    old_name = old_data.get('name', 'Unknown') if isinstance(old_data, dict) else str(old_data)
-                    old_types = old_data.get('types', []) # Păstrăm tipurile vechi
-                    
-                    # --- CAZUL 1: STRAT CUSTOM (Mănăstiri) ---
-                    if place_id.startswith("custom_") and custom_manager.is_enabled:
-                        cdata = custom_manager.get_place(place_id)
-                        if cdata:
-                            if place_id in target_dict:
-                                target_dict[place_id].update({
-                                    'rating': 5.0,
-                                    'reviews_count': 99999,
-                                    'is_open_status': "Date din Excel",
-                                    'address': f"Hram: {cdata['hram']}",
-                                    'website': cdata.get('website')
-                                })
-                            updated_count += 1
-                        continue
-                    
-                    # --- CAZUL 2: WAYPOINT ---
-                    if place_id.startswith("waypoint_"): continue
-                    
-                    # --- CAZUL 3: LOC GOOGLE (FIXED) ---
-                    # AM SCOS 'types' DIN LISTA DE CÂMPURI CA SĂ NU MAI DEA EROARE
-                    details = gmaps_client.place(
-                        place_id=place_id, 
-                        fields=['name', 'rating', 'user_ratings_total', 'opening_hours', 'website', 'formatted_address'], 
-                        language='ro'
-                    )
-                    
-                    if 'result' in details:
-                        res = details['result']
-                        
-                        new_name = res.get('name', old_name)
-                        prefix = ""
-                        if old_name.startswith("["):
-                            parts = old_name.split(']')
-                            if len(parts) > 1: prefix = parts[0] + "] "
-                        
-                        final_name = prefix + new_name if not new_name.startswith("[") else new_name
-                        
-                        oh = res.get('opening_hours', {})
-                        status = "Program necunoscut"
-                        if 'open_now' in oh:
-                            status = "Deschis acum" if oh.get('open_now') else "Închis acum"
-                            
-                        if place_id not in target_dict: target_dict[place_id] = {}
-                        
-                        # Actualizăm doar ce am primit, păstrăm tipurile vechi
-                        target_dict[place_id].update({
-                            'name': final_name,
-                            'rating': res.get('rating', 0),
-                            'reviews_count': res.get('user_ratings_total', 0),
-                            'is_open_status': status,
-                            'address': res.get('formatted_address', ''),
-                            'website': res.get('website'),
-                            'types': old_types # Punem la loc tipurile vechi
-                        })
-                        updated_count += 1
-                    
-                except Exception as e:
-                    log_error(f"Eroare update {place_id}: {e}")
-            
-            # --- RECONSTRUCȚIE LISTĂ VIZUALĂ ---
-            saved_state = {}
-            for i in range(self.route_list.count()):
-                it = self.route_list.item(i)
-                wid = self.route_list.itemWidget(it)
-                if wid:
-                    saved_state[it.data(Qt.UserRole)] = {
-                        'color': getattr(wid, 'initial_color', None),
-                        'locked': wid.is_locked()
-                    }
-            
-            self.route_list.clear()
-            
-            for pid in route_order:
-                if pid in target_dict:
-                    d = target_dict[pid]
-                    state = saved_state.get(pid, {})
-                    
-                    self.add_to_route_list(
-                        pid, 
-                        d.get('name', '?'), 
-                        d.get('address', ''),
-                        state.get('color'), 
-                        d.get('rating', 0), 
-                        d.get('reviews_count', 0),
-                        d.get('is_open_status', '?'),
-                        d.get('types', []),
-                        d.get('route_info'),
-                        website=d.get('website'),
-                        update_memory=False
-                    )
-                    
-                    if state.get('locked'):
-                        last_item = self.route_list.item(self.route_list.count()-1)
-                        if last_item:
-                            wid = self.route_list.itemWidget(last_item)
-                            if wid: wid.set_locked(True)
+        log_info("Se actualizează datele LIVE de la Google...")
+        self.refresh_route_details(self.get_route_order())
 
-            self.renumber_route_items()
-            self.update_lock_states()
-            
-            log_success(f"Date actualizate pentru {updated_count} locații.")
-            
-        except Exception as e:
-            log_error(f"Refresh failed: {e}")
-            traceback.print_exc()
+    def refresh_route_details(self, place_ids):
+        """
+        Locurile Google se cer concurent (Place Details, prin gateway) și fiecare rând se actualizează
+        când îi sosește răspunsul; cele custom se completează din Excel (dacă stratul e încărcat).
+        Interfața rămâne utilizabilă între timp.
+        """
+        progress = {'left': 0, 'updated': 0}
+        
+        def on_details(place_id, future):
+            progress['left'] -= 1
+            try:
+                res = future.result().get('result')
+                if res and self.apply_route_details(place_id, self.route_details_from_google(place_id, res)):
+                    progress['updated'] += 1
+            except Exception as e:
+                log_error(f"Eroare update {place_id}: {e}")
+            if progress['left'] == 0:
+                log_success(f"Date actualizate pentru {progress['updated']} locații.")
+        
+        for place_id in place_ids:
+            # --- CAZUL 1: STRAT CUSTOM (Mănăstiri) ---
+            if place_id.startswith("custom_"):
+                cdata = custom_manager.get_place(place_id) if custom_manager.is_enabled else None
+                if cdata:
+                    self.apply_route_details(place_id, {
+                        'rating': 5.0,
+                        'reviews_count': 99999,
+                        'is_open_status': "Date din Excel",
+                        'address': f"Hram: {cdata['hram']}",
+                        'website': cdata.get('website')
+                    })
+                continue
+            
+            # --- CAZUL 2: WAYPOINT ---
+            if place_id.startswith("waypoint_"): continue
+            
+            # --- CAZUL 3: LOC GOOGLE ('types' nu se cere: se păstrează tipurile existente) ---
+            future = gmaps_client.call_async(
+                'place', place_id=place_id,
+                fields=['name', 'rating', 'user_ratings_total', 'opening_hours', 'website', 'formatted_address'],
+                language='ro'
+            )
+            progress['left'] += 1
+            self.ui_dispatcher.when_done(future, lambda f, pid=place_id: on_details(pid, f))
+
+    def route_details_from_google(self, place_id, res):
+        """Datele unui rând din răspunsul Place Details (prefixul '[..] ' al numelui se păstrează)."""
+        old_name = place_repo.name(place_id) or 'Unknown'
+        
+        new_name = res.get('name', old_name)
+        prefix = ""
+        if old_name.startswith("["):
+            parts = old_name.split(']')
+            if len(parts) > 1: prefix = parts[0] + "] "
+        
+        oh = res.get('opening_hours', {})
+        status = "Program necunoscut"
+        if 'open_now' in oh:
+            status = "Deschis acum" if oh.get('open_now') else "Închis acum"
+        
+        return {
+            'name': prefix + new_name if not new_name.startswith("[") else new_name,
+            'rating': res.get('rating', 0),
+            'reviews_count': res.get('user_ratings_total', 0),
+            'is_open_status': status,
+            'address': res.get('formatted_address', ''),
+            'website': res.get('website')
+        }
+
+    def find_route_widget(self, place_id):
+        for i in range(self.route_list.count()):
+            item = self.route_list.item(i)
+            if item.data(Qt.UserRole) == place_id:
+                widget = self.route_list.itemWidget(item)
+                return widget if isinstance(widget, RouteItemWidget) else None
+        return None
+
+    def apply_route_details(self, place_id, data):
+        """Actualizează înregistrarea și rândul din listă; False dacă locul a fost scos între timp din traseu."""
+        widget = self.find_route_widget(place_id)
+        if widget is None:
+            return False
+        place_repo.upsert(place_id, **data)
+        widget.update_details(data.get('name'), data.get('address'), data.get('rating'), data.get('reviews_count'),
+                              data.get('is_open_status'), data.get('website'))
+        return True
 
     def save_route_to_file(self):
         """Salvează traseul curent (Ordinea exactă + Bifele de fixare + Website)."""
-        global selected_places, route_places_coords, linear_places, is_linear_mode, linear_places_coords
         
         if self.route_list.count() == 0:
             QMessageBox.warning(self, "Atenție", "Nu există niciun traseu de salvat!")
@@ -3532,17 +3920,7 @@ class MainWindow(QMainWindow):
         
         if not file_path: return
         
-        import time
-        route_data = {
-            "version": "1.2", 
-            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "mode": "linear" if is_linear_mode else "circular",
-            "places": []
-        }
-        
-        # Alegem sursa de date din memorie (pentru website etc.)
-        source_dict = linear_places if is_linear_mode else selected_places
-        source_coords = linear_places_coords if is_linear_mode else route_places_coords
+        route_data = route_payload(route_mode(), [])
         
         # ITERĂM ÎN ORDINEA VIZUALĂ (Asta garantează salvarea ordinii)
         for i in range(self.route_list.count()):
@@ -3550,32 +3928,24 @@ class MainWindow(QMainWindow):
             place_id = item.data(Qt.UserRole)
             widget = self.route_list.itemWidget(item)
             
-            # Luăm datele
-            web = None
-            if place_id in source_dict:
-                web = source_dict[place_id].get('website')
-            
-            place_info = {
-                "place_id": place_id,
-                "name": widget.name if widget else "Unknown",
-                "address": widget.address if widget else "",
+            # Luăm datele (website, coordonate) din depozit
+            record = place_repo.get(place_id)
+            web = record.website if record else None
+            coords = (record.coords if record else None) or (None, None)
+            place_info = place_entry(
+                place_id,
+                widget.name if widget else "Unknown",
+                widget.address if widget else "",
                 # AICI SALVĂM BIFA (Fixarea)
-                "locked": widget.is_locked() if widget else False,
-                "initial_color": getattr(widget, 'initial_color', None) if widget else None,
-                "website": web
-            }
-            
-            # Adăugăm coordonatele
-            if place_id in source_coords:
-                coords = source_coords[place_id]
-                place_info["lat"] = coords.get("lat")
-                place_info["lng"] = coords.get("lng")
-            
+                locked=widget.is_locked() if widget else False,
+                initial_color=getattr(widget, 'initial_color', None) if widget else None,
+                website=web,
+                lat=coords[0], lng=coords[1]
+            )
             route_data["places"].append(place_info)
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(route_data, f, ensure_ascii=False, indent=2)
+            write_route_file(file_path, route_data)
             
             log_success(f"Traseu salvat în: {file_path}")
             QMessageBox.information(self, "Succes", f"Traseul a fost salvat!\n(Ordinea și bifele au fost păstrate)")
@@ -3586,7 +3956,6 @@ class MainWindow(QMainWindow):
 
     def load_route_from_file(self):
         """Încarcă un traseu, respectând ordinea și bifele salvate."""
-        global selected_places, route_places_coords, linear_places, is_linear_mode, linear_places_coords
         
         routes_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_routes")
         if not os.path.exists(routes_folder):
@@ -3599,11 +3968,7 @@ class MainWindow(QMainWindow):
         if not file_path: return
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                route_data = json.load(f)
-            
-            if "places" not in route_data:
-                raise ValueError("Fișier invalid")
+            route_data = read_route_file(file_path)
             
             # Resetare la cerere
             if self.route_list.count() > 0:
@@ -3612,56 +3977,45 @@ class MainWindow(QMainWindow):
                 if reply == QMessageBox.Yes:
                     self.clear_route()
             
-            target_dict = linear_places if is_linear_mode else selected_places
-            target_coords = linear_places_coords if is_linear_mode else route_places_coords
-            
+            mode = route_mode()
             loaded_count = 0
-            # ITERĂM LISTA DIN JSON (care e deja ordonată cum trebuie)
-            for place_info in route_data["places"]:
-                place_id = place_info["place_id"]
-                name = place_info.get("name", "Unknown")
-                address = place_info.get("address", "")
-                locked = place_info.get("locked", False) # Citim starea bifei
-                initial_color = place_info.get("initial_color")
-                website = place_info.get("website")
-                
-                # Populăm memoria
-                target_dict[place_id] = {
-                    'name': name, 
-                    'address': address, 
-                    'website': website
-                }
-                
-                if "lat" in place_info and "lng" in place_info:
-                    target_coords[place_id] = {
-                        'lat': place_info["lat"],
-                        'lng': place_info["lng"],
-                        'name': name
-                    }
-                
-                # Adăugăm în listă (se adaugă la fundul listei, deci ordinea se păstrează)
-                self.add_to_route_list(place_id, name, address, initial_color, website=website, update_memory=False)
-                
-                # RESTAURĂM BIFA (LACĂTUL)
-                if locked:
-                    last_row = self.route_list.count() - 1
-                    item = self.route_list.item(last_row)
-                    widget = self.route_list.itemWidget(item)
-                    if widget: 
-                        widget.set_locked(True) # Asta bifează căsuța
-                
-                loaded_count += 1
+            # ITERĂM LISTA DIN JSON (care e deja ordonată cum trebuie), cu o singură redesenare la final
+            with self.batched_route_update():
+                for place_info in route_data["places"]:
+                    place_id = place_info["place_id"]
+                    name = place_info.get("name", "Unknown")
+                    address = place_info.get("address", "")
+                    locked = place_info.get("locked", False) # Citim starea bifei
+                    initial_color = place_info.get("initial_color")
+                    website = place_info.get("website")
+                    
+                    # Populăm memoria (traseul modului activ)
+                    fields = {'name': name, 'address': address, 'website': website, 'initial_color': initial_color}
+                    if place_info.get("lat") is not None and place_info.get("lng") is not None:
+                        fields.update(lat=place_info["lat"], lng=place_info["lng"])
+                    place_repo.add_to_route(place_id, mode, **fields)
+                    
+                    # Adăugăm în listă (se adaugă la fundul listei, deci ordinea se păstrează)
+                    self.add_to_route_list(place_id, name, address, initial_color, website=website, update_memory=False)
+                    
+                    # RESTAURĂM BIFA (LACĂTUL)
+                    if locked:
+                        last_row = self.route_list.count() - 1
+                        item = self.route_list.item(last_row)
+                        widget = self.route_list.itemWidget(item)
+                        if widget: 
+                            widget.set_locked(True) # Asta bifează căsuța
+                    
+                    loaded_count += 1
             
-            self.update_route_tab_title()
-            self.update_lock_states() # Asigurăm că regulile de bife sunt respectate
+            # batched_route_update a actualizat deja titlul și regulile de bife
             self.save_route_order()
             
             log_success(f"Traseu încărcat: {file_path} ({loaded_count} locuri)")
+            # Refresh automat, în fundal: rândurile se completează pe loc cât timp mesajul e deschis
+            self.refresh_route_info(silent_mode=True)
             QMessageBox.information(self, "Succes", f"S-au încărcat {loaded_count} locații.")
             
-            # Refresh automat
-            QTimer.singleShot(500, lambda: self.refresh_route_info(silent_mode=True))
-            
         except Exception as e:
             log_error(f"Eroare încărcare: {e}")
             QMessageBox.critical(self, "Eroare", f"Nu s-a putut încărca:\n{e}")
@@ -3725,18 +4079,11 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(self, f"Rezumat AI - {place_name}", 
                                        "Nu există recenzii de analizat pentru acest loc.")
             else:
-                summary = get_ai_summary(reviews, place_name)
-                
-                summary_dialog = QDialog(self)
-                summary_dialog.setWindowTitle(f"✨ Rezumat AI - {place_name}")
+                summary_dialog = AiTextDialog(f"✨ Rezumat AI - {place_name}", parent=self)
                 summary_dialog.resize(550, 450)
-                
-                layout = QVBoxLayout(summary_dialog)
-                summary_text = QTextEdit()
-                summary_text.setReadOnly(True)
-                summary_text.setText(summary)
-                layout.addWidget(summary_text)
-                
+                summary_dialog.start(build_summary_prompt(reviews, place_name), **SUMMARY_GENERATION,
+                                     cache_key=summary_cache_key(place_id, place_name, reviews),
+                                     kind="summary", place=place_name)
                 summary_dialog.exec()
                 
         except Exception as e:
@@ -3752,8 +4099,11 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
         
         try:
-            info = get_history_info(place_name, place_address)
-            dialog = HistoryDialog(place_name, info, self)
+            log_info(f"Se solicită info istoric pentru: {place_name}")
+            dialog = HistoryDialog(place_name, self)
+            dialog.start(build_history_prompt(place_name, place_address), **HISTORY_GENERATION,
+                         cache_key=history_cache_key(place_name, place_address),
+                         kind="history", place=place_name)
             dialog.exec()
         except Exception as e:
             log_error(f"Eroare istoric: {e}")
@@ -3763,6 +4113,8 @@ class MainWindow(QMainWindow):
 
     def calculate_simple_driving_route(self):
         """Calculează un traseu auto simplu între A și B."""
+        # Numele de locuri folosite anterior se transformă offline în coordonate
+        self.resolve_route_entries_offline()
         start_str = self.route_start_entry.text().strip()
         end_str = self.route_end_entry.text().strip()
         
@@ -3783,17 +4135,10 @@ class MainWindow(QMainWindow):
             # 1. Curățăm harta
             self.web_view.page().runJavaScript("if(window.routePolyline) { window.routePolyline.setMap(null); }")
             
-            # 2. Apelăm API-ul Google (Mode: DRIVING)
-            directions_result = gmaps_client.directions(
-                origin=start_str,
-                destination=end_str,
-                mode="driving",
-                alternatives=False,
-                language='ro'
-            )
+            # 2. Apelăm API-ul Google (Mode: DRIVING) - tronsonul A->B vine din cache dacă e cunoscut
+            route = route_assembler.assemble([start_str, end_str], mode="driving", language='ro')
             
-            if directions_result:
-                route = directions_result[0]
+            if route:
                 leg = route['legs'][0]
                 
                 dist_txt = leg['distance']['text']
@@ -3843,12 +4188,64 @@ class MainWindow(QMainWindow):
 
 
 
+    def log_route_assembly_stats(self, wanted_optimize):
+        """Raportează câte tronsoane a avut traseul și câte au venit din cache."""
+        stats = route_assembler.last_stats
+        log_info(f"Traseu: {stats['legs']} tronsoane, {stats['cached_legs']} din cache, {stats['fetched']} cereri Directions.")
+        if wanted_optimize and not stats['optimized'] and stats['legs'] > 2:
+            log_warning("Traseul depășește 25 de puncte: optimizarea ordinii e dezactivată, se păstrează ordinea din listă.")
+
+    def route_waypoint_strings(self, ids):
+        """Transformă place_id-urile din listă în puncte pentru Directions (modul activ)."""
+        waypoints = []
+        for pid in ids:
+            c = place_repo.coords(pid)
+            if c:
+                waypoints.append(f"{c[0]},{c[1]}")
+            elif is_linear_mode:
+                if place_repo.in_route(pid, 'linear'):
+                    waypoints.append(place_repo.name(pid))
+            elif not pid.startswith('waypoint_'):
+                waypoints.append(f"place_id:{pid}")
+        return waypoints
+
+    def format_route_total(self, mode, meters, seconds, partial=False):
+        """Textul de total afișat în titlul tab-ului (≈ = estimare parțială din cache)."""
+        approx = "≈ " if partial else ""
+        if mode == "walking":
+            minutes = seconds // 60
+            return f"🚶 Pietonal: {approx}{meters/1000:.1f} km • {minutes//60} h {minutes%60} min"
+        return f"🚗 Auto: {approx}{meters/1000:.1f} km • {seconds // 3600}h {(seconds % 3600) // 60}m"
+
+    def update_route_estimate_from_cache(self):
+        """După reordonare, recalculează imediat totalul din tronsoanele deja cunoscute (fără API)."""
+        route_order = self.get_route_order()
+        if is_linear_mode:
+            start_txt = self.route_start_entry.text().strip()
+            end_txt = self.route_end_entry.text().strip()
+            if not start_txt or not end_txt: return
+            points = [start_txt] + self.route_waypoint_strings(route_order) + [end_txt]
+            mode = "driving"
+        else:
+            c = place_repo.coords(route_order[0]) if len(route_order) >= 2 else None
+            if not c: return
+            start_str = f"{c[0]},{c[1]}"
+            points = [start_str] + self.route_waypoint_strings(route_order[1:]) + [start_str]
+            mode = "walking"
+        
+        meters, seconds, known, total = route_assembler.estimate(points, mode=mode, language='ro')
+        if known == 0:
+            return
+        self.route_total_label.setText(self.format_route_total(mode, meters, seconds, partial=(known < total)))
+        log_debug(f"Total estimat din cache: {known}/{total} tronsoane cunoscute.")
+
+    @profiled("generate_optimized_route")
     def generate_optimized_route(self):
         """Funcție Bipolară: Generează traseu Circular SAU Liniar în funcție de mod."""
-        global selected_places, linear_places, is_linear_mode, route_places_coords, linear_places_coords
         
         # --- RAMURA 1: TRASEU LINIAR (A -> B) ---
         if is_linear_mode:
+            self.resolve_route_entries_offline()
             start_txt = self.route_start_entry.text().strip()
             end_txt = self.route_end_entry.text().strip()
             
@@ -3872,13 +4269,7 @@ class MainWindow(QMainWindow):
             route_order = self.get_route_order()
             
             # Pregătim waypoints
-            waypoints = []
-            for pid in route_order:
-                if pid in linear_places_coords:
-                    c = linear_places_coords[pid]
-                    waypoints.append(f"{c['lat']},{c['lng']}")
-                elif pid in linear_places:
-                    waypoints.append(linear_places[pid]['name'])
+            waypoints = self.route_waypoint_strings(route_order)
             
             locked_count = self.get_locked_count()
             do_optimize = (locked_count == 0) 
@@ -3886,27 +4277,24 @@ class MainWindow(QMainWindow):
             try:
                 log_info(f"Generare Liniar: {start_txt} -> {end_txt} via {len(waypoints)} puncte. Optimizare: {do_optimize}")
                 
-                res = gmaps_client.directions(
-                    origin=start_txt,
-                    destination=end_txt,
-                    waypoints=waypoints,
-                    optimize_waypoints=do_optimize,
-                    mode="driving",
-                    language='ro'
-                )
+                # Traseele cu peste 25 de puncte se cer pe tronsoane (în paralel) și se lipesc
+                with profiler.span("directions"):
+                    route = route_assembler.assemble(
+                        [start_txt] + waypoints + [end_txt],
+                        mode="driving",
+                        language='ro',
+                        optimize=do_optimize
+                    )
+                self.log_route_assembly_stats(do_optimize)
                 
-                if res:
-                    route = res[0]
+                if route:
                     legs = route['legs']
                     
                     total_km = sum(leg['distance']['value'] for leg in legs)
                     total_sec = sum(leg['duration']['value'] for leg in legs)
                     
-                    hours = total_sec // 3600
-                    mins = (total_sec % 3600) // 60
-                    
                     # Actualizăm textul (care se duce automat în titlul Tab-ului)
-                    self.route_total_label.setText(f"🚗 Auto: {total_km/1000:.1f} km • {hours}h {mins}m")
+                    self.route_total_label.setText(self.format_route_total("driving", total_km, total_sec))
                     # --- FIX: AM SCOS setVisible(True) ---
                     
                     # 2. DESENARE LINIE
@@ -3917,10 +4305,10 @@ class MainWindow(QMainWindow):
                     markers_data = []
                     for i, pid in enumerate(route_order):
                         lat = None; lng = None; name = f"Punct {i+1}"
-                        if pid in linear_places_coords:
-                            lat = linear_places_coords[pid]['lat']
-                            lng = linear_places_coords[pid]['lng']
-                            if pid in linear_places: name = linear_places[pid]['name']
+                        c = place_repo.coords(pid)
+                        if c:
+                            lat, lng = c
+                            if place_repo.in_route(pid, 'linear'): name = place_repo.name(pid)
                         
                         if lat is not None:
                             color = None
@@ -3933,7 +4321,8 @@ class MainWindow(QMainWindow):
                             markers_data.append(m)
                     
                     if markers_data:
-                        self.web_view.page().runJavaScript(f"addRouteMarkers({json.dumps(markers_data)});")
+                        with profiler.span("javascript"):
+                            self.web_view.page().runJavaScript(f"addRouteMarkers({json.dumps(markers_data)});")
                     
                     log_success("Traseu Liniar Generat și curățat!")
                 else:
@@ -3951,14 +4340,12 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Eroare", "Selectează cel puțin 2 locuri pentru traseu circular!")
             return
             
-        for pid in selected_places:
-            if 'route_info' in selected_places[pid]: del selected_places[pid]['route_info']
+        for pid in place_repo.route('circular'):
+            place_repo.upsert(pid, route_info=None)
         
         locked_count = self.get_locked_count()
         start_id = route_order[0]
-        start_coords = None
-        if start_id in route_places_coords:
-            start_coords = (route_places_coords[start_id]['lat'], route_places_coords[start_id]['lng'])
+        start_coords = place_repo.coords(start_id)
         
         if not start_coords:
              try:
@@ -3972,26 +4359,20 @@ class MainWindow(QMainWindow):
         start_str = f"{start_coords[0]},{start_coords[1]}"
         
         ids_to_optimize = route_order[1:]
-        waypoints = []
-        for pid in ids_to_optimize:
-            if pid in route_places_coords:
-                c = route_places_coords[pid]
-                waypoints.append(f"{c['lat']},{c['lng']}")
-            elif not pid.startswith('waypoint_'):
-                waypoints.append(f"place_id:{pid}")
+        waypoints = self.route_waypoint_strings(ids_to_optimize)
         
         try:
             log_info("Se calculează traseul PIETONAL (Circular)...")
             do_optimize = (locked_count <= 1)
             
-            res = gmaps_client.directions(
-                origin=start_str, destination=start_str,
-                waypoints=waypoints, optimize_waypoints=do_optimize,
-                mode="walking", language='ro'
-            )
+            with profiler.span("directions"):
+                route = route_assembler.assemble(
+                    [start_str] + waypoints + [start_str],
+                    mode="walking", language='ro', optimize=do_optimize
+                )
+            self.log_route_assembly_stats(do_optimize)
             
-            if res:
-                route = res[0]
+            if route:
                 final_order = [route_order[0]]
                 if do_optimize and 'waypoint_order' in route:
                     for idx in route['waypoint_order']:
@@ -4001,8 +4382,8 @@ class MainWindow(QMainWindow):
                 
                 total_km = 0; total_min = 0
                 
-                if start_id in selected_places:
-                    selected_places[start_id]['route_info'] = "Punct de Plecare"
+                if place_repo.in_route(start_id, 'circular'):
+                    place_repo.upsert(start_id, route_info="Punct de Plecare")
                 
                 legs = route['legs']
                 for i, leg in enumerate(legs):
@@ -4011,10 +4392,10 @@ class MainWindow(QMainWindow):
                     
                     if i < len(final_order) - 1:
                         dest_id = final_order[i+1]
-                        if dest_id in selected_places:
-                            selected_places[dest_id]['route_info'] = f"{leg['distance']['text']}, {leg['duration']['text']}"
+                        if place_repo.in_route(dest_id, 'circular'):
+                            place_repo.upsert(dest_id, route_info=f"{leg['distance']['text']}, {leg['duration']['text']}")
                 
-                self.route_total_label.setText(f"🚶 Pietonal: {total_km/1000:.1f} km • {total_min//60} h {total_min%60} min")
+                self.route_total_label.setText(self.format_route_total("walking", total_km, total_min))
                 # --- FIX: AM SCOS setVisible(True) ---
                 
                 poly = route['overview_polyline']['points'].replace('\\', '\\\\')
@@ -4025,8 +4406,6 @@ class MainWindow(QMainWindow):
                 
                 # Alegem ordinea corectă în funcție de mod
                 target_order = route_order if is_linear_mode else final_order
-                target_places = linear_places if is_linear_mode else selected_places
-                target_coords = linear_places_coords if is_linear_mode else route_places_coords
                 
                 for i, pid in enumerate(target_order):
                     # Găsim widget-ul din listă corespunzător acestui ID
@@ -4048,11 +4427,11 @@ class MainWindow(QMainWindow):
                     # Datele locației
                     lat = None; lng = None; name = f"Punct {i+1}"
                     
-                    if pid in target_coords:
-                        lat = target_coords[pid]['lat']
-                        lng = target_coords[pid]['lng']
-                        if pid in target_places: 
-                            name = target_places[pid].get('name', name)
+                    c = place_repo.coords(pid)
+                    if c:
+                        lat, lng = c
+                        if place_repo.in_route(pid, route_mode()):
+                            name = place_repo.name(pid) or name
                     
                     if lat is not None:
                         m = {
@@ -4066,17 +4445,20 @@ class MainWindow(QMainWindow):
                         markers_data.append(m)
                 
                 if markers_data:
-                    self.web_view.page().runJavaScript(f"addRouteMarkers({json.dumps(markers_data)});")
+                    with profiler.span("javascript"):
+                        self.web_view.page().runJavaScript(f"addRouteMarkers({json.dumps(markers_data)});")
                 
-                self.reorder_route_list(final_order)
+                with profiler.span("widgets"):
+                    self.reorder_route_list(final_order)
                 log_success("Traseu circular generat.")
 
         except Exception as e:
             log_error(f"Eroare API: {e}")
             QMessageBox.critical(self, "Eroare", str(e))
 
+    @profiled("send_request")
     def send_request(self):
-        global current_search_results, current_distance_info, saved_locations
+        global saved_locations
         
         # --- SETUP LOGARE ---
         search_log_file = None
@@ -4087,11 +4469,7 @@ class MainWindow(QMainWindow):
             search_log_file = os.path.join(log_dir, f"Search_{timestamp}.txt")
             
             def log_search_debug(msg):
-                try:
-                    with open(search_log_file, "a", encoding="utf-8") as f:
-                        ts = datetime.datetime.now().strftime("%H:%M:%S")
-                        f.write(f"[{ts}] {str(msg)}\n")
-                except: pass
+                log_writer.write(search_log_file, msg)
             
             print(f"\n>>> [SISTEM] LOG CĂUTARE: {search_log_file}")
             log_search_debug(f"LOG STARTED: {search_log_file}")
@@ -4099,6 +4477,7 @@ class MainWindow(QMainWindow):
             def log_search_debug(msg): pass
 
         self.clear_results()
+        place_repo.prune()  # locurile cardurilor anterioare (fără traseu) nu mai sunt necesare
         log_info("=" * 20 + " CERERE MANUALĂ NOUĂ " + "=" * 20)
         
         search_mode = self.get_search_type()
@@ -4156,22 +4535,26 @@ class MainWindow(QMainWindow):
                 log_search_debug(f"Query: '{query_text}' | Raza: {radius_in_meters}m")
                 log_info(f"Căutare '{query_text}' (Rază: {radius_in_meters}m, Min Voturi: {min_votes_limit})")
                 
-                res = gmaps_client.places_nearby(location=search_coords, radius=radius_in_meters, keyword=query_text, language='ro')
+                with profiler.span("places_api"):
+                    res = gmaps_client.places_nearby(location=search_coords, radius=radius_in_meters, keyword=query_text, language='ro')
                 results = res.get('results', [])
                 
                 token = res.get('next_page_token')
                 pages = 1
                 while token and pages < 3:
-                    time.sleep(2)
+                    with profiler.span("page_token_sleep"):
+                        time.sleep(2)
                     try:
-                        res_next = gmaps_client.places_nearby(page_token=token, language='ro')
+                        with profiler.span("places_api"):
+                            res_next = gmaps_client.places_nearby(page_token=token, language='ro')
                         results.extend(res_next.get('results', []))
                         token = res_next.get('next_page_token')
                         pages += 1
                     except: break
             
             elif search_mode == "text":
-                res = gmaps_client.places(query=query_text, language='ro')
+                with profiler.span("places_api"):
+                    res = gmaps_client.places(query=query_text, language='ro')
                 results = res.get('results', [])
 
             # --- FILTRARE (Rating + VOTURI) ---
@@ -4180,23 +4563,24 @@ class MainWindow(QMainWindow):
             
             log_search_debug(f"Filtrare: Rating {min_rating}, Voturi Min {min_votes_limit}")
             
-            for p in results:
-                p_votes = p.get('user_ratings_total', 0)
-                p_rating = p.get('rating', 0)
-                p_name = p.get('name', 'N/A')
+            with profiler.span("filter"):
+                for p in results:
+                    p_votes = p.get('user_ratings_total', 0)
+                    p_rating = p.get('rating', 0)
+                    p_name = p.get('name', 'N/A')
                 
-                # 1. Filtru Voturi
-                if p_votes < min_votes_limit:
-                    log_search_debug(f"   ❌ Eliminat (Sub {min_votes_limit} voturi): {p_name} ({p_votes})")
-                    continue
-                
-                # 2. Filtru Rating
-                if min_rating != "any":
-                    if p_rating < int(min_rating):
-                        log_search_debug(f"   ❌ Eliminat (Rating mic): {p_name} ({p_rating})")
+                    # 1. Filtru Voturi
+                    if p_votes < min_votes_limit:
+                        log_search_debug(f"   ❌ Eliminat (Sub {min_votes_limit} voturi): {p_name} ({p_votes})")
                         continue
                 
-                filtered_results.append(p)
+                    # 2. Filtru Rating
+                    if min_rating != "any":
+                        if p_rating < int(min_rating):
+                            log_search_debug(f"   ❌ Eliminat (Rating mic): {p_name} ({p_rating})")
+                            continue
+                
+                    filtered_results.append(p)
                 
             results = filtered_results
             
@@ -4230,8 +4614,7 @@ class MainWindow(QMainWindow):
             log_success(f"Rezultate finale manuale: {len(results)}")
             log_search_debug(f"REZULTATE FINALE: {len(results)}")
             
-            current_search_results = results
-            current_distance_info = distance_info
+            place_repo.set_search_results(results, distance_info)
             
             if not results:
                 no_results_label = QLabel("Niciun rezultat găsit.")
@@ -4239,20 +4622,22 @@ class MainWindow(QMainWindow):
             else:
                 self.results_tabs.setTabText(0, f"📋 Rezultate ({len(results)})")
                 self.web_view.page().runJavaScript("clearHotspots();")
-                search_hotspots = []
-                for place in results:
-                    self.create_place_card(place, distance_info)
-                    loc = place.get('geometry', {}).get('location', {})
-                    if loc:
-                        search_hotspots.append({
-                            'place_id': place.get('place_id'), 'name': place.get('name'),
-                            'lat': loc['lat'], 'lng': loc['lng'],
-                            'rating': place.get('rating', 0), 'reviews': place.get('user_ratings_total', 0),
-                            'types': place.get('types', [])
-                        })
+                with profiler.span("widgets"):
+                    search_hotspots = []
+                    for place in results:
+                        self.create_place_card(place, distance_info)
+                        loc = place.get('geometry', {}).get('location', {})
+                        if loc:
+                            search_hotspots.append({
+                                'place_id': place.get('place_id'), 'name': place.get('name'),
+                                'lat': loc['lat'], 'lng': loc['lng'],
+                                'rating': place.get('rating', 0), 'reviews': place.get('user_ratings_total', 0),
+                                'types': place.get('types', [])
+                            })
                 if search_hotspots:
                     js_code = f"addHotspotMarkers({json.dumps(search_hotspots)});"
-                    self.web_view.page().runJavaScript(js_code)
+                    with profiler.span("javascript"):
+                        self.web_view.page().runJavaScript(js_code)
                     self.show_hotspots_checkbox.setChecked(True)
             
         except Exception as e:
@@ -4282,9 +4667,9 @@ class MainWindow(QMainWindow):
                 pid = widget.place_id
                 
                 # Căutăm coordonatele exacte în memoria noastră (fie Google, fie Custom)
-                if pid in route_places_coords:
-                    c = route_places_coords[pid]
-                    coord_str = f"{c['lat']},{c['lng']}"
+                c = place_repo.coords(pid)
+                if c:
+                    coord_str = f"{c[0]},{c[1]}"
                 else:
                     # Fallback (nu ar trebui să se întâmple)
                     coord_str = widget.name
@@ -4323,16 +4708,11 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Eroare", f"Nu s-a putut genera link-ul:\n{e}")
 
 
-    def save_state(self):
+    def save_state(self, quiet=False):
+        """Scrie în STATE_DB secțiunile schimbate (quiet: salvarea automată, fără mesaj în consolă)."""
         global my_coords_full_address, explore_coords_full_address, gemini_model_value, ai_prompt_var, saved_locations
-        global current_map_lat, current_map_lng, current_map_name, current_zoom_level, current_map_place_id, selected_places
-        global route_places_coords, linear_places, linear_places_coords, is_linear_mode
+        global current_map_lat, current_map_lng, current_map_name, current_zoom_level, current_map_place_id
         
-        # 1. Salvăm datele pentru modul curent
-        # (Ca să fim siguri că ce e pe ecran ajunge în variabilele globale înainte de scriere)
-        current_dict = linear_places if is_linear_mode else selected_places
-        # Aici ar fi bine să facem un update rapid, dar ne bazăm pe faptul că add/remove țin variabilele la zi.
-
         # Construim lista pentru JSON (doar modul curent vizual, sau ambele?)
         # De obicei salvăm starea vizuală curentă.
         saved_route_data = []
@@ -4340,14 +4720,8 @@ class MainWindow(QMainWindow):
             item = self.route_list.item(i)
             widget = self.route_list.itemWidget(item)
             if isinstance(widget, RouteItemWidget):
-                # Căutăm coordonatele
-                lat, lng = None, None
-                # Verificăm în ambele surse
-                pid = widget.place_id
-                if pid in route_places_coords:
-                    lat, lng = route_places_coords[pid]['lat'], route_places_coords[pid]['lng']
-                elif pid in linear_places_coords:
-                    lat, lng = linear_places_coords[pid]['lat'], linear_places_coords[pid]['lng']
+                # Coordonatele din depozit
+                lat, lng = place_repo.coords(widget.place_id) or (None, None)
 
                 route_item = {
                     "place_id": widget.place_id,
@@ -4356,7 +4730,14 @@ class MainWindow(QMainWindow):
                     "locked": widget.is_locked(),
                     "initial_color": getattr(widget, 'initial_color', None),
                     "lat": lat,
-                    "lng": lng
+                    "lng": lng,
+                    # Instantaneul cardului: la pornire rândul apare imediat, apoi se reîmprospătează în fundal.
+                    # Starea "Deschis/Închis acum" nu se salvează: ar fi deja veche la următoarea pornire
+                    "rating": widget.rating,
+                    "reviews_count": widget.reviews_count,
+                    "types": widget.place_types,
+                    "website": widget.website,
+                    "route_info": widget.route_info
                 }
                 saved_route_data.append(route_item)
 
@@ -4387,6 +4768,7 @@ class MainWindow(QMainWindow):
                 "prompt": ai_prompt_var
             },
             "diversity_settings": diversity_settings,
+            "ranking_weights": ranking_weights,
             "saved_locations": saved_locations,
             "saved_route": saved_route_data, 
             "route_filter_index": self.route_filter_combo.currentIndex(),
@@ -4405,23 +4787,22 @@ class MainWindow(QMainWindow):
         }
         
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=4)
-            log_success(f"Starea completă salvată în {STATE_FILE}")
+            t0 = time.perf_counter()
+            changed = self.state_store.save(state)
+            if not quiet:
+                log_success(f"Starea salvată în {STATE_DB} ({changed} secțiuni modificate, "
+                            f"{(time.perf_counter() - t0) * 1000:.1f} ms)")
         except Exception as e:
             log_error(f"Nu s-a putut salva starea: {e}")
 
     def load_state(self):
-        global my_coords_full_address, explore_coords_full_address, gemini_model_value, ai_prompt_var, saved_locations, selected_places
+        global my_coords_full_address, explore_coords_full_address, gemini_model_value, ai_prompt_var, saved_locations
         global current_map_lat, current_map_lng, current_map_name, current_zoom_level, current_map_place_id
-        global route_places_coords, linear_places, linear_places_coords
-        
-        if not os.path.exists(STATE_FILE):
-            return
         
         try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
+            state = self.state_store.load()
+            if not state:
+                return
             
             self.prompt_entry.setText(state.get("search_query", ""))
 
@@ -4460,6 +4841,8 @@ class MainWindow(QMainWindow):
             global diversity_settings
             if state.get("diversity_settings"):
                 diversity_settings = state.get("diversity_settings")
+            if state.get("ranking_weights"):
+                ranking_weights.update(state.get("ranking_weights"))
             
             saved_locations = state.get("saved_locations", {})
             self.refresh_location_combo()
@@ -4469,37 +4852,36 @@ class MainWindow(QMainWindow):
             # Implicit considerăm că traseul salvat aparține modului curent (Circular)
             # sau ar trebui să salvăm și is_linear_mode în JSON (ar fi ideal pe viitor)
             saved_route = state.get("saved_route", [])
-            selected_places = {}
+            place_repo.clear_route('circular')
             self.route_list.clear()
             
             if saved_route:
+                # Rândurile apar imediat din instantaneul salvat (o singură redesenare); detaliile
+                # (programul, notele) se reîmprospătează în fundal după afișare (finish_startup)
                 log_info(f"Se restaurează traseul cu {len(saved_route)} puncte...")
-                for item_data in saved_route:
-                    pid = item_data["place_id"]
-                    name = item_data["name"]
-                    addr = item_data.get("address", "") 
-                    locked = item_data.get("locked", False)
-                    initial_color = item_data.get("initial_color")
-                    
-                    # Salvăm în selected_places (implicit circular la start)
-                    selected_places[pid] = {'name': name, 'address': addr}
-                    
-                    if "lat" in item_data and "lng" in item_data:
-                        route_places_coords[pid] = {
-                            'lat': item_data["lat"],
-                            'lng': item_data["lng"],
-                            'name': name
-                        }
-                    
-                    self.add_to_route_list(pid, name, addr, initial_color, update_memory=True)
-                    
-                    last_row = self.route_list.count() - 1
-                    item = self.route_list.item(last_row)
-                    widget = self.route_list.itemWidget(item)
-                    if widget: widget.set_locked(locked)
-                
-                self.update_route_tab_title()
-                self.update_lock_states()
+                with self.batched_route_update():
+                    for item_data in saved_route:
+                        pid = item_data["place_id"]
+                        name = item_data["name"]
+                        addr = item_data.get("address", "") 
+                        locked = item_data.get("locked", False)
+                        initial_color = item_data.get("initial_color")
+                        
+                        if item_data.get("lat") is not None and item_data.get("lng") is not None:
+                            place_repo.upsert(pid, lat=item_data["lat"], lng=item_data["lng"])
+                        if not pid.startswith("waypoint_"):
+                            self.pending_route_refresh.append(pid)
+                        
+                        # Salvăm în traseul circular (implicit la start)
+                        self.add_to_route_list(pid, name, addr, initial_color,
+                                               item_data.get("rating", 'N/A'), item_data.get("reviews_count", 0),
+                                               'Program necunoscut', item_data.get("types"), item_data.get("route_info"),
+                                               website=item_data.get("website"), update_memory=True)
+                        
+                        last_row = self.route_list.count() - 1
+                        item = self.route_list.item(last_row)
+                        widget = self.route_list.itemWidget(item)
+                        if widget: widget.set_locked(locked)
             
             filter_idx = state.get("route_filter_index", 0)
             self.route_filter_combo.setCurrentIndex(filter_idx)
@@ -4519,14 +4901,9 @@ class MainWindow(QMainWindow):
                 self.geo_limit_entry.setText(str(state["geo_limit"]))
             # FIX: NU mai încercăm să punem text în geo_dist_entry (că nu există)
 
-            # --- RESTAURARE DATE CUSTOM ---
+            # --- RESTAURARE DATE CUSTOM (Excel-ul se citește în fundal, după afișare) ---
             if state.get("custom_data_path"):
-                path = state["custom_data_path"]
-                count = custom_manager.load_from_excel(path)
-                if count > 0:
-                    is_visible = state.get("custom_layer_visible", True)
-                    self.show_custom_checkbox.setChecked(is_visible)
-                    log_success(f"S-au restaurat {count} mănăstiri. Strat vizibil: {is_visible}")
+                self.pending_custom_restore = (state["custom_data_path"], state.get("custom_layer_visible", True))
             
             log_success("Starea a fost încărcată complet.")
             
@@ -4534,8 +4911,62 @@ class MainWindow(QMainWindow):
             log_error(f"Eroare la încărcarea stării: {e}")
             traceback.print_exc()
 
+    def load_map_page(self):
+        """Încarcă pagina hărții (template-ul cu cheia API injectată); se termină în on_map_ready."""
+        try:
+            map_path = resource_path("map_template.html")
+
+            with open(map_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+            
+            # Injectare Cheie
+            placeholder = "API_KEY_PLACEHOLDER"
+            if placeholder in html_content:
+                html_content = html_content.replace(placeholder, api_key)
+                log_success("Cheia API a fost injectată.")
+            else:
+                log_warning("Placeholder-ul nu a fost găsit (posibil cheie hardcoded).")
+
+            self.web_view.setHtml(html_content, QUrl.fromLocalFile(map_path))
+            
+        except Exception as e:
+            log_error(f"Nu s-a putut încărca map_template.html: {e}")
+            self.web_view.setHtml(f"<h3>Eroare: {e}</h3>")
+
+    def finish_startup(self):
+        """
+        Inițializările care nu trebuie să întârzie primul cadru al ferestrei, pornite după afișare:
+        harta (WebEngine, asincron), clienții API și stratul custom (Excel), pe fire de fundal.
+        """
+        startup.begin("hartă (WebEngine)")
+        self.load_map_page()
+        startup.background("clienți API (googlemaps, Gemini)", warm_up_clients)
+        google_ids = [pid for pid in self.pending_route_refresh if not pid.startswith("custom_")]
+        if google_ids:
+            log_info(f"Se reîmprospătează în fundal detaliile pentru {len(google_ids)} opriri din traseu...")
+            self.refresh_route_details(google_ids)
+        # Opririle custom așteaptă Excel-ul (on_custom_restored)
+        self.pending_route_refresh = [pid for pid in self.pending_route_refresh if pid.startswith("custom_")]
+        if self.pending_custom_restore:
+            path, visible = self.pending_custom_restore
+            self.pending_custom_restore = None
+            startup.background("strat custom (Excel)", lambda: custom_manager.load_from_excel(path),
+                               on_done=lambda count: self.ui_dispatcher.call(lambda: self.on_custom_restored(count, visible)))
+
+    def on_custom_restored(self, count, visible):
+        if count <= 0: return
+        log_success(f"S-au restaurat {count} mănăstiri. Strat vizibil: {visible}")
+        # Opririle custom restaurate fără detalii își primesc datele din Excel
+        self.refresh_route_details(self.pending_route_refresh)
+        self.pending_route_refresh = []
+        if self.show_custom_checkbox.isChecked() != visible:
+            self.show_custom_checkbox.setChecked(visible)  # stateChanged redesenează stratul
+        else:
+            self.toggle_custom_layer(Qt.Checked.value if visible else Qt.Unchecked.value)
+
     def on_map_ready(self, success):
         """Se apelează automat când pagina HTML s-a încărcat complet."""
+        startup.end("hartă (WebEngine)", None if success else "eșuat")
         if not success:
             log_error("Harta nu s-a putut încărca în WebEngine.")
             return
@@ -4739,12 +5170,8 @@ class MainWindow(QMainWindow):
         
         # Obținem detalii despre loc
         try:
-            details = gmaps_client.place(
-                place_id=place_id, 
-                fields=['name', 'formatted_address', 'rating', 'user_ratings_total', 
-                        'opening_hours', 'formatted_phone_number', 'website', 'types'],
-                language='ro'
-            )
+            # Același set de câmpuri ca scanarea: un click în timpul ei se alătură cererii în zbor
+            details = gmaps_client.place(place_id=place_id, fields=PLACE_CARD_FIELDS, language='ro')
             
             result = details.get('result', {})
             
@@ -4877,43 +5304,19 @@ class MainWindow(QMainWindow):
         # Schimbăm pe tab-ul Rezultate
         self.results_tabs.setCurrentIndex(0)
         
-        try:
-            # Obținem detalii despre loc
-            details = gmaps_client.place(
-                place_id=place_id, 
-                fields=['name', 'formatted_address', 'geometry', 'rating', 'user_ratings_total', 
-                        'opening_hours', 'formatted_phone_number', 'website', 'type', 'price_level', 'vicinity'],
-                language='ro'
-            )
-            
+        if self.use_my_position_for_distance.isChecked():
+            origin_coords = parse_coordinates(self.my_coords_entry.text().strip())
+        else:
+            origin_coords = parse_coordinates(self.explore_coords_entry.text().strip())
+        
+        def fetch():
+            # Rulează în fundal; o cerere identică deja în zbor (ex: din scanare) e refolosită
+            details = gmaps_client.place(place_id=place_id, fields=PLACE_CARD_FIELDS, language='ro')
             result = details.get('result', {})
-            name = result.get('name', 'Loc necunoscut')
-            
-            # Salvăm coordonatele
-            global route_places_coords
             loc = result.get('geometry', {}).get('location', {})
-            if loc:
-                route_places_coords[place_id] = {'lat': loc['lat'], 'lng': loc['lng']}
-            
-            # Golim rezultatele anterioare
-            self.clear_results()
-            
-            # Creăm card-ul cu rezultatul (similar cu rezultatele de căutare)
-            address = result.get('formatted_address', '')
-            rating = result.get('rating', 0)
-            total_reviews = result.get('user_ratings_total', 0)
             
             # Calculăm distanța dacă avem poziția
             distance_info = None
-            origin_coords = None
-            
-            if self.use_my_position_for_distance.isChecked():
-                coords_text = self.my_coords_entry.text().strip()
-                origin_coords = parse_coordinates(coords_text)
-            else:
-                coords_text = self.explore_coords_entry.text().strip()
-                origin_coords = parse_coordinates(coords_text)
-            
             if origin_coords and loc:
                 try:
                     dist_result = gmaps_client.distance_matrix(
@@ -4933,6 +5336,28 @@ class MainWindow(QMainWindow):
                         }
                 except:
                     pass
+            return result, distance_info
+        
+        self.ui_dispatcher.when_done(gmaps_client.submit(fetch),
+                                     lambda fut: self.show_poi_details(place_id, fut))
+    
+    def show_poi_details(self, place_id, fut):
+        try:
+            result, distance_info = fut.result()
+            name = result.get('name', 'Loc necunoscut')
+            
+            # Salvăm coordonatele
+            loc = result.get('geometry', {}).get('location', {})
+            if loc:
+                place_repo.upsert(place_id, lat=loc['lat'], lng=loc['lng'])
+            
+            # Golim rezultatele anterioare
+            self.clear_results()
+            
+            # Creăm card-ul cu rezultatul (similar cu rezultatele de căutare)
+            address = result.get('formatted_address', '')
+            rating = result.get('rating', 0)
+            total_reviews = result.get('user_ratings_total', 0)
             
             # Construim place_data pentru card
             place_data = {
@@ -4947,10 +5372,9 @@ class MainWindow(QMainWindow):
                 'geometry': result.get('geometry', {})
             }
             
-            # Salvăm în current_distance_info pentru card
-            global current_distance_info
+            # Salvăm distanța în înregistrarea locului
             if distance_info:
-                current_distance_info[place_id] = distance_info
+                place_repo.upsert(place_id, distance=distance_info)
             
             # Creăm cardul folosind funcția existentă
             self.create_place_card(place_data, distance_info)
@@ -5010,7 +5434,7 @@ class MainWindow(QMainWindow):
             
         # Checkbox Traseu
         chk_route = QCheckBox("Traseu")
-        if pid in selected_places: chk_route.setChecked(True)
+        if place_repo.in_route(pid, route_mode()): chk_route.setChecked(True)
         
         chk_route.stateChanged.connect(lambda s: self.toggle_custom_selection(pid, data, s))
         h_btns.addWidget(chk_route)
@@ -5020,8 +5444,8 @@ class MainWindow(QMainWindow):
         self.results_layout.addStretch()
 
     def toggle_custom_selection(self, pid, data, state):
-        # Injectăm coordonatele în sistemul global ca să ocolim Google Search
-        route_places_coords[pid] = {'lat': data['lat'], 'lng': data['lng'], 'name': data['name']}
+        # Injectăm coordonatele în depozit ca să ocolim Google Search
+        place_repo.upsert(pid, lat=data['lat'], lng=data['lng'])
         
         # Apelăm funcția veche
         self.toggle_selection(pid, data['name'], "Custom", "N/A", "Deschis", state, ['custom'])
@@ -5029,34 +5453,27 @@ class MainWindow(QMainWindow):
 
     def on_waypoint_add(self, lat, lng):
         """Handler pentru adăugare punct intermediar din click dreapta pe hartă."""
-        global selected_places, route_places_coords
         
         log_info(f"Adăugare waypoint la: {lat}, {lng}")
         
-        # Facem reverse geocoding pentru a obține adresa
         try:
-            address = reverse_geocode(lat, lng)
-            
             # Generăm un place_id unic pentru waypoint
             import hashlib
             waypoint_id = f"waypoint_{hashlib.md5(f'{lat},{lng}'.encode()).hexdigest()[:12]}"
             
-            # Extragem numele scurt din adresă
-            name_parts = address.split(',')
-            short_name = name_parts[0].strip() if name_parts else f"Punct {lat:.4f}, {lng:.4f}"
+            # Numele provizoriu; adresa vine din cache sau în fundal (reverse geocoding)
+            address = geocode_cache.get_cached(lat, lng) or ""
+            short_name = self.waypoint_short_name(address, lat, lng)
             
             # Verificăm dacă nu există deja
-            if waypoint_id in selected_places:
+            if place_repo.in_route(waypoint_id, route_mode()):
                 QMessageBox.information(self, "Info", f"Punctul '{short_name}' este deja în traseu!")
                 return
             
             # Salvăm coordonatele
-            route_places_coords[waypoint_id] = {'lat': lat, 'lng': lng, 'name': short_name}
-            
-            # Adăugăm în dicționarul de locații selectate
-            selected_places[waypoint_id] = {'name': short_name, 'address': address}
+            place_repo.upsert(waypoint_id, lat=lat, lng=lng)
             
-            # Adăugăm în lista de traseu
+            # Adăugăm în lista de traseu (și în traseul modului activ)
             self.add_to_route_list(waypoint_id, short_name, address)
             
             # Actualizăm titlul tab-ului
@@ -5071,11 +5488,39 @@ class MainWindow(QMainWindow):
             js_code = f"addWaypointMarker({lat}, {lng}, 'W');"
             self.web_view.page().runJavaScript(js_code)
             
+            if not address:
+                self.request_address(lat, lng, lambda addr: self.on_waypoint_address(waypoint_id, lat, lng, addr))
+            
         except Exception as e:
             log_error(f"Eroare la adăugarea waypoint: {e}")
             traceback.print_exc()
             QMessageBox.warning(self, "Eroare", f"Nu s-a putut adăuga punctul:\n{e}")
     
+    def waypoint_short_name(self, address, lat, lng):
+        """Numele scurt al unui punct intermediar = prima parte din adresă."""
+        if address and not address.startswith("Eroare"):
+            first = address.split(',')[0].strip()
+            if first: return first
+        return f"Punct {lat:.4f}, {lng:.4f}"
+    
+    def on_waypoint_address(self, waypoint_id, lat, lng, address):
+        """Completează numele/adresa unui waypoint când sosește rezultatul geocodării."""
+        if address.startswith("Eroare"):
+            return
+        short_name = self.waypoint_short_name(address, lat, lng)
+        
+        if waypoint_id in place_repo:
+            place_repo.upsert(waypoint_id, name=short_name, address=address)
+        
+        for i in range(self.route_list.count()):
+            item = self.route_list.item(i)
+            if item.data(Qt.UserRole) == waypoint_id:
+                widget = self.route_list.itemWidget(item)
+                if isinstance(widget, RouteItemWidget):
+                    widget.update_labels(short_name, address)
+                break
+        log_success(f"Waypoint actualizat: {short_name}")
+    
     def on_set_explore_from_map(self, lat, lng):
         """Handler pentru setare zonă de explorare din click dreapta pe hartă."""
         coords_text = f"{lat}, {lng}"
@@ -5123,16 +5568,9 @@ class MainWindow(QMainWindow):
             self.route_start_entry.setText(coords_text)
             
             # Dacă avem și label pentru adresă în Traseu, îl actualizăm și pe el
-            # (update_address_and_center_map a calculat deja my_coords_full_address)
+            # (aceeași celulă de coordonate -> aceeași cerere în zbor / același rezultat din cache)
             if hasattr(self, 'route_start_lbl'):
-                # Reutilizăm adresa deja calculată dacă e disponibilă, altfel o recalculăm
-                if my_coords_full_address:
-                    # Scurtăm adresa
-                    short_addr = my_coords_full_address[:57] + "..." if len(my_coords_full_address) > 60 else my_coords_full_address
-                    self.route_start_lbl.setText(f"📍 {short_addr}")
-                else:
-                    # Facem request separat dacă nu avem adresa
-                    self.update_address_from_coords(self.route_start_entry, self.route_start_lbl)
+                self.update_address_from_coords(self.route_start_entry, self.route_start_lbl)
         # -----------------------------------------------------------
         
         # Actualizăm starea UI (activăm câmpurile)
@@ -5144,21 +5582,20 @@ class MainWindow(QMainWindow):
     
 
 
-    def fetch_details_now(self, place_id):
-        try:
-            d = gmaps_client.place(place_id=place_id, fields=['opening_hours', 'website'], language='ro')
-            res = d.get('result', {})
-            web = res.get('website', "")
-            oh = res.get('opening_hours', {})
-            stat = "Program necunoscut"
-            if 'open_now' in oh:
-                stat = "Deschis acum" if oh['open_now'] else "Închis acum"
-            return web, stat
-        except:
-            return "", "Program necunoscut"
-
+    def confirm_scan_budget(self, estimate):
+        """Afișează costul estimat; respinge scanarea dacă depășește bugetul rămas azi."""
+        remaining = api_governor.remaining()
+        log_info(f"💰 Cost estimat scanare: ~{estimate:.2f} USD (buget rămas azi: {remaining:.2f} USD)")
+        if estimate > remaining:
+            log_warning("Scanare anulată: costul estimat depășește bugetul zilnic.")
+            QMessageBox.warning(self, "Buget API depășit",
+                                f"Scanarea ar costa ~{estimate:.2f} USD, dar din bugetul zilnic "
+                                f"au rămas {remaining:.2f} USD.\n\nMărește bugetul din Setări sau redu parametrii scanării.")
+            return False
+        return True
+    
     def scan_hotspots(self):
-        global route_places_coords, selected_places, diversity_settings, CATEGORIES_MAP, current_log_filename
+        global diversity_settings, CATEGORIES_MAP, current_log_filename
         
         # --- RAMURA 1: MODUL LINIAR ---
         if self.radio_route_mode.isChecked():
@@ -5175,6 +5612,8 @@ class MainWindow(QMainWindow):
             QApplication.processEvents()
 
         use_custom_data = custom_manager.is_enabled and self.show_custom_checkbox.isChecked()
+        # Profilul pe faze al scanării (scris în log la final, vizibil în panoul de diagnostic)
+        prof = profiler.start("scan_hotspots")
 
         # --- LOGGING ---
         try:
@@ -5194,26 +5633,7 @@ class MainWindow(QMainWindow):
             
             self.clear_route() 
             self.clear_results() 
-
-            # --- HELPERE INTERNE ---
-            def get_cat(types):
-                for k, v in CATEGORIES_MAP.items():
-                    if any(t in types for t in v['keywords']): return k
-                return 'other'
-            
-            def is_excluded(types):
-                exclude_list = ['lodging', 'parking', 'gas_station', 'atm', 'funeral_home', 'car_repair']
-                return any(t in exclude_list for t in types)
-
-            def get_inventory():
-                cnts = {k: 0 for k in CATEGORIES_MAP.keys()}
-                cnts['other'] = 0
-                for pid, data in selected_places.items():
-                    pts = data.get('types', [])
-                    c = get_cat(pts)
-                    if c in cnts: cnts[c] += 1
-                    else: cnts['other'] += 1
-                return cnts
+            place_repo.prune()  # locurile cardurilor anterioare (fără traseu) nu mai sunt necesare
 
             # --- INPUTURI ---
             try: min_reviews_threshold = int(self.min_reviews_entry.text().strip())
@@ -5237,202 +5657,82 @@ class MainWindow(QMainWindow):
 
             try: radius_m = int(float(self.radius_entry.text().strip()) * 1000)
             except: radius_m = 1500
-            
-            log_info(f"📍 Centru: {search_coords} | Rază: {radius_m}m")
 
-            candidates_v1 = []; candidates_v2 = []; candidates_v3 = []; seen_ids = set()
-
-            # PAS 0: Custom
-            if use_custom_data:
-                for cid, cdata in custom_manager.places.items():
-                    dist = haversine_distance(search_coords[0], search_coords[1], cdata['lat'], cdata['lng'])
-                    if dist <= radius_m:
-                        candidates_v1.append({
-                            'place_id': cid, 'name': f"[Custom] {cdata['name']}",
-                            'lat': cdata['lat'], 'lng': cdata['lng'],
-                            'rating': 5.0, 'reviews': 99999, 'types': ['custom_place', 'church'], 'is_custom': True
-                        })
-                        seen_ids.add(cid)
-                        route_places_coords[cid] = {'lat': cdata['lat'], 'lng': cdata['lng'], 'name': cdata['name']}
+            params = AreaScanParams(
+                search_coords, radius_m=radius_m, min_reviews=min_reviews_threshold,
+                limit_v1=limit_v1_total, limit_v3=limit_v3_total,
+                use_v1=self.auto_add_hotspots_checkbox.isChecked(),
+                use_v2=self.diversity_checkbox.isChecked(),
+                use_v3=self.geo_coverage_checkbox.isChecked(),
+                diversity_settings=diversity_settings, ranking_weights=ranking_weights,
+                custom_places=custom_manager.places if use_custom_data else None,
+                existing_types=[rec.types for rec in place_repo.route_records(route_mode())]
+            )
+            if not self.confirm_scan_budget(scan_engine.estimate_area_cost(params)):
+                return
 
-            # PAS 1: Google Fetch
-            import time
-            scan_targets = [
-                ('tourist_attraction', 3), ('park', 2), ('museum', 2), ('church', 2),
-                ('restaurant', 3), ('cafe', 2), ('shopping_mall', 2), ('store', 2)
-            ]
+            with profiler.span("engine"):
+                result = scan_engine.scan_area(params)
+            for pid, c in result.coords.items():
+                place_repo.remember_coords(pid, c['lat'], c['lng'], c.get('name'))
+            details = result.details
             
-            log_info("📡 Încep scanarea API (Detalii complete în fișierul LOG)...")
-            for p_type, max_pages in scan_targets:
-                try:
-                    res = gmaps_client.places_nearby(location=search_coords, radius=radius_m, type=p_type, language='ro')
-                    results_list = res.get('results', [])
-                    token = res.get('next_page_token')
-                    pages = 1
-                    while token and pages < max_pages:
-                        time.sleep(2)
-                        try:
-                            res_next = gmaps_client.places_nearby(page_token=token, language='ro')
-                            results_list.extend(res_next.get('results', []))
-                            token = res_next.get('next_page_token')
-                            pages += 1
-                        except: break
-                    
-                    for p in results_list:
-                        pid = p.get('place_id')
-                        if pid in seen_ids: continue
-                        rating = p.get('rating', 0); reviews = p.get('user_ratings_total', 0); types = p.get('types', [])
-                        name = p.get('name', 'N/A')
-                        if rating < 3.0: continue 
-                        if is_excluded(types): continue
-
-                        if use_custom_data:
-                            g_lat = p['geometry']['location']['lat']; g_lng = p['geometry']['location']['lng']
-                            is_dup = False
-                            for c_data in custom_manager.places.values():
-                                if haversine_distance(g_lat, g_lng, c_data['lat'], c_data['lng']) < 50:
-                                    is_dup = True; break
-                            if is_dup: continue
-
-                        seen_ids.add(pid)
-                        loc = p['geometry']['location']
-                        cand = {
-                            'place_id': pid, 'name': name, 'lat': loc['lat'], 'lng': loc['lng'],
-                            'rating': rating, 'reviews': reviews, 'types': types, 'is_custom': False
-                        }
-                        if pid and loc['lat']: route_places_coords[pid] = {'lat': loc['lat'], 'lng': loc['lng'], 'name': name}
-
-                        if rating >= 4.0:
-                            if reviews >= min_reviews_threshold: candidates_v1.append(cand)
-                            else: candidates_v2.append(cand)
-                        elif rating >= 3.0:
-                            if reviews >= min_reviews_threshold: candidates_v3.append(cand)
-                except: pass
-
-            candidates_v1.sort(key=lambda x: x['reviews'], reverse=True) 
-            candidates_v2.sort(key=lambda x: x['reviews'], reverse=True) 
-            candidates_v3.sort(key=lambda x: x['reviews'], reverse=True)
-            
-            # --- RAPORTARE ÎN FIȘIER (NU ÎN CONSOLĂ) ---
-            log_file_only("\n" + "="*95)
-            log_file_only("   🕵️  RAPORT DETALIAT CANDIDAȚI  🕵️")
-            log_file_only("="*95)
-
-            def dump_list(label, lst):
-                log_file_only(f"\n--- {label} ({len(lst)} locuri) ---")
-                if not lst: return
-                log_file_only(f"{'NR':<4} | {'NUME':<40} | {'CATEGORIE':<15} | {'RATING':<6} | {'VOTURI':<8} | {'DIST'}")
-                log_file_only("-" * 95)
-                for i, c in enumerate(lst):
-                    dist = haversine_distance(search_coords[0], search_coords[1], c['lat'], c['lng'])
-                    name_str = (c['name'][:37] + '..') if len(c['name']) > 37 else c['name']
-                    cat_key = get_cat(c['types'])
-                    cat_label = CATEGORIES_MAP.get(cat_key, {}).get('label', cat_key)
-                    cat_label = cat_label.split(' ')[1] if ' ' in cat_label else cat_label
-                    log_file_only(f"{i+1:<4} | {name_str:<40} | {cat_label:<15} | {c['rating']:<6} | {c['reviews']:<8} | {int(dist)}m")
-
-            dump_list("URNA V1", candidates_v1)
-            dump_list("URNA V2", candidates_v2)
-            dump_list("URNA V3", candidates_v3)
-            log_file_only("="*95 + "\n")
-            # ---------------------------------------------------
-
-            # Selecție
-            taken_ids = set(); v1_cat_counts = {k: 0 for k in CATEGORIES_MAP.keys()}
-            count_v1 = 0; count_v2 = 0; count_v3 = 0
-
-            if self.auto_add_hotspots_checkbox.isChecked():
-                log_info(f"🌊 [V1] Selecție Vedete")
-                for cand in candidates_v1:
-                    if count_v1 >= limit_v1_total: break
+            # Lista traseului se actualizează o singură dată, pentru toate selecțiile
+            with profiler.span("route_list"), self.batched_route_update():
+                for tag, cand in result.picks:
                     if cand['is_custom']:
-                        if not use_custom_data: continue
-                        cdata = custom_manager.get_place(cand['place_id'])
-                        self.toggle_custom_selection(cand['place_id'], cdata, Qt.Checked.value)
-                        count_v1 += 1; taken_ids.add(cand['place_id'])
-                        log_success(f"   ✅ [Custom] {cand['name']}")
+                        self.toggle_custom_selection(cand['place_id'], custom_manager.get_place(cand['place_id']), Qt.Checked.value)
                         continue
-                    cat = get_cat(cand['types'])
-                    if cat in diversity_settings:
-                        max_allowed = diversity_settings[cat].get('max', 99)
-                        if v1_cat_counts.get(cat, 0) >= max_allowed:
-                            # LOG DOAR ÎN FIȘIER
-                            log_file_only(f"   ❌ [SKIP] {cand['name']} ({cat}): Plafon atins")
-                            continue
-                    web, stat = self.fetch_details_now(cand['place_id'])
-                    self.toggle_selection(cand['place_id'], f"[V1] {cand['name']}", cand['rating'], cand['reviews'], stat, Qt.Checked.value, cand['types'], web)
-                    count_v1 += 1; taken_ids.add(cand['place_id']); 
-                    if cat in v1_cat_counts: v1_cat_counts[cat] += 1
-
-            if self.diversity_checkbox.isChecked():
-                log_info(f"🌊 [V2] Selecție Diversitate")
-                for cat, rules in diversity_settings.items():
-                    target = rules.get('min', 0); have = get_inventory().get(cat, 0); needed = target - have
-                    if needed <= 0: continue
-                    added = 0
-                    for cand in candidates_v2:
-                        if added >= needed: break
-                        if cand['place_id'] in taken_ids: continue
-                        if get_cat(cand['types']) == cat:
-                            web, stat = self.fetch_details_now(cand['place_id'])
-                            self.toggle_selection(cand['place_id'], f"[V2] {cand['name']}", cand['rating'], cand['reviews'], stat, Qt.Checked.value, cand['types'], web)
-                            count_v2 += 1; taken_ids.add(cand['place_id']); added += 1
-
-            if self.geo_coverage_checkbox.isChecked():
-                log_info(f"🌊 [V3] Selecție Populare")
-                for cand in candidates_v3:
-                    if count_v3 >= limit_v3_total: break
-                    if cand['place_id'] in taken_ids: continue
-                    web, stat = self.fetch_details_now(cand['place_id'])
-                    self.toggle_selection(cand['place_id'], f"[V3] {cand['name']}", cand['rating'], cand['reviews'], stat, Qt.Checked.value, cand['types'], web)
-                    count_v3 += 1; taken_ids.add(cand['place_id'])
+                    web, stat = details.get(cand['place_id'], ("", "Program necunoscut"))
+                    self.toggle_selection(cand['place_id'], f"[{tag}] {cand['name']}", cand['rating'], cand['reviews'], stat, Qt.Checked.value, cand['types'], web)
 
             # Final
             self.results_tabs.setCurrentIndex(1)
             visual_list = []
-            all_found = candidates_v1 + candidates_v2 + candidates_v3
-            for cand in all_found:
+            for cand in result.all_candidates():
                 if cand['is_custom']:
                     if use_custom_data: visual_list.append(cand)
                     continue
                 if cand['reviews'] >= min_reviews_threshold: visual_list.append(cand)
             
             js_code = f"addHotspotMarkers({json.dumps(visual_list)});"
-            self.web_view.page().runJavaScript(js_code)
-            self.show_hotspots_checkbox.setChecked(True)
-            if use_custom_data: self.toggle_custom_layer(Qt.Checked.value)
-            else: self.web_view.page().runJavaScript("clearCustomMarkers();")
-
-            # Header
-            while self.results_layout.count(): 
-                child = self.results_layout.takeAt(0)
-                if child.widget(): child.widget().deleteLater()
-            
-            header = QLabel("🔥 Rezultate Scanare")
-            header.setStyleSheet("font-size: 14pt; font-weight: bold; padding: 10px; color: #2e7d32;")
-            self.results_layout.addWidget(header)
-            
-            # --- AICI E MODIFICAREA: SUMAR DETALIAT ---
-            summary_text = (
-                f"<b>Total Selectate: {count_v1 + count_v2 + count_v3}</b><br>"
-                f"<span style='color:#1565c0;'>[V1] Top: {count_v1}</span> &nbsp;|&nbsp; "
-                f"<span style='color:#2e7d32;'>[V2] Diversitate: {count_v2}</span> &nbsp;|&nbsp; "
-                f"<span style='color:#e65100;'>[V3] Popular: {count_v3}</span>"
-            )
-            summary = QLabel(summary_text)
-            summary.setStyleSheet("font-size: 11pt; padding: 10px; background-color: #f0f0f0; border-radius: 5px;")
-            self.results_layout.addWidget(summary)
-            # ------------------------------------------
+            with profiler.span("javascript"):
+                self.web_view.page().runJavaScript(js_code)
+                self.show_hotspots_checkbox.setChecked(True)
+                if use_custom_data: self.toggle_custom_layer(Qt.Checked.value)
+                else: self.web_view.page().runJavaScript("clearCustomMarkers();")
+
+            with profiler.span("widgets"):
+                # Header
+                while self.results_layout.count(): 
+                    child = self.results_layout.takeAt(0)
+                    if child.widget(): child.widget().deleteLater()
+            
+                header = QLabel("🔥 Rezultate Scanare")
+                header.setStyleSheet("font-size: 14pt; font-weight: bold; padding: 10px; color: #2e7d32;")
+                self.results_layout.addWidget(header)
+            
+                # --- AICI E MODIFICAREA: SUMAR DETALIAT ---
+                counts = result.counts
+                summary_text = (
+                    f"<b>Total Selectate: {sum(counts.values())}</b><br>"
+                    f"<span style='color:#1565c0;'>[V1] Top: {counts['V1']}</span> &nbsp;|&nbsp; "
+                    f"<span style='color:#2e7d32;'>[V2] Diversitate: {counts['V2']}</span> &nbsp;|&nbsp; "
+                    f"<span style='color:#e65100;'>[V3] Popular: {counts['V3']}</span>"
+                )
+                summary = QLabel(summary_text)
+                summary.setStyleSheet("font-size: 11pt; padding: 10px; background-color: #f0f0f0; border-radius: 5px;")
+                self.results_layout.addWidget(summary)
+                # ------------------------------------------
             
-            self.results_layout.addStretch()
+                self.results_layout.addStretch()
 
         except Exception as e:
             log_error(f"Err: {e}")
             traceback.print_exc()
         finally:
-            if current_log_filename:
-                write_to_file("LOG ENDED.")
-                current_log_filename = None
+            profiler.finish(prof)
+            end_log_file()
             if isinstance(sender_btn, QPushButton):
                 sender_btn.setEnabled(True)
                 sender_btn.setText(original_text if original_text else "🔥 Scanează și Generează")
@@ -5441,7 +5741,6 @@ class MainWindow(QMainWindow):
 
     def create_hotspot_card(self, hotspot, rank):
         """Creează un card pentru un hotspot."""
-        global selected_places
         
         card = QFrame()
         card.setFrameShape(QFrame.Box)
@@ -5486,7 +5785,7 @@ class MainWindow(QMainWindow):
         if place_id:
             sel_checkbox = QCheckBox()
             sel_checkbox.setStyleSheet("QCheckBox::indicator { width: 24px; height: 24px; }")
-            if place_id in selected_places:
+            if place_repo.in_route(place_id, route_mode()):
                 sel_checkbox.setChecked(True)
             sel_checkbox.stateChanged.connect(
                 lambda state, pid=place_id, n=hotspot['name'], r=hotspot['rating'], rc=hotspot['reviews'], t=hotspot.get('types', []): self.toggle_selection(pid, n, r, rc, 'Program necunoscut', state, t)
@@ -5546,7 +5845,7 @@ class MainWindow(QMainWindow):
 
     def scan_linear_corridor(self):
         """LOGICA DE SCANARE PE CORIDOR (Traseu A->B) - V65 (Log Detaliat cu Rating/Voturi)."""
-        global current_log_filename, linear_places, linear_places_coords, route_places_coords, selected_places
+        global current_log_filename
         
         sender_btn = self.sender()
         original_text = ""
@@ -5555,6 +5854,7 @@ class MainWindow(QMainWindow):
             sender_btn.setEnabled(False)
             sender_btn.setText("🛣️ Scanez Traseu...")
             QApplication.processEvents()
+        prof = profiler.start("scan_linear_corridor")
 
         # Init Log
         try:
@@ -5568,11 +5868,13 @@ class MainWindow(QMainWindow):
 
         try:
             self.clear_results()
+            place_repo.prune()  # locurile cardurilor anterioare (fără traseu) nu mai sunt necesare
             
             log_info("\n" + "="*60)
             log_info("🚀 START SCANARE LINIARĂ (V65: Detalii Complete)")
             log_info("="*60)
             
+            self.resolve_route_entries_offline()
             start_txt = self.route_start_entry.text().strip()
             end_txt = self.route_end_entry.text().strip()
             keywords_raw = self.route_keywords_entry.text().strip()
@@ -5596,161 +5898,48 @@ class MainWindow(QMainWindow):
                 log_error("Lipsă puncte start/end.")
                 return
 
-            log_info("📡 Solicit traseul de la Google...")
-            directions = gmaps_client.directions(start_txt, end_txt, mode="driving", language='ro')
-            if not directions:
+            params = CorridorScanParams(
+                start_txt, end_txt, keywords, step_km=scan_step_km, radius_km=scan_radius_km,
+                max_deviation_m=dev_google_m, custom_deviation_km=dev_custom_km,
+                custom_places=custom_manager.places if custom_manager.is_enabled and self.show_custom_checkbox.isChecked() else None
+            )
+            with profiler.span("plan"):
+                plan = scan_engine.plan_corridor(params)
+            if plan is None:
                 log_error("Nu s-a găsit traseu.")
                 return
             
-            route = directions[0]
-            overview_poly = route['overview_polyline']['points']
-            path_points = decode_polyline(overview_poly)
-            log_info(f"Traseu decodat: {len(path_points)} puncte de formă.")
-            
-            safe_poly = overview_poly.replace('\\', '\\\\')
-            self.web_view.page().runJavaScript(f"drawPolyline('{safe_poly}');")
-
-            scan_points = []
-            last_scan_dist = 0
-            total_dist = 0
-            scan_points.append(path_points[0])
-            for i in range(1, len(path_points)):
-                p1 = path_points[i-1]; p2 = path_points[i]
-                d = haversine_distance(p1[0], p1[1], p2[0], p2[1]) / 1000
-                total_dist += d
-                if total_dist - last_scan_dist >= scan_step_km:
-                    scan_points.append(p2)
-                    last_scan_dist = total_dist
-            scan_points.append(path_points[-1])
-            
-            log_info(f"📍 Puncte de scanare (Pioneze): {len(scan_points)}")
-
-            found_places = {} 
-            
-            # A. CUSTOM LAYER
-            if custom_manager.is_enabled and self.show_custom_checkbox.isChecked():
-                log_info("\n--- SCANARE CUSTOM LAYER ---")
-                for cid, cdata in custom_manager.places.items():
-                    min_dist = 99999
-                    in_corridor = False
-                    for sp in scan_points:
-                        if haversine_distance(sp[0], sp[1], cdata['lat'], cdata['lng']) < (scan_radius_km + 20):
-                            in_corridor = True; break
-                    if in_corridor:
-                        for pp in path_points[::5]: 
-                            d = haversine_distance(pp[0], pp[1], cdata['lat'], cdata['lng'])
-                            if d < min_dist: min_dist = d
-                        limit_m = dev_custom_km * 1000
-                        if min_dist <= limit_m:
-                            found_places[cid] = {
-                                'place_id': cid, 'name': f"[Custom] {cdata['name']}",
-                                'lat': cdata['lat'], 'lng': cdata['lng'],
-                                'rating': 5.0, 'reviews': 99999,
-                                'types': ['custom_place'], 'is_custom': True,
-                                'vicinity': f"Abatere: {int(min_dist)}m",
-                                'opening_hours': {}, 'user_ratings_total': 99999,
-                                'geometry': {'location': {'lat': cdata['lat'], 'lng': cdata['lng']}}
-                            }
-                            log_success(f"   ✅ Găsit Custom: {cdata['name']} (Abatere {int(min_dist)}m)")
+            safe_poly = plan.overview_polyline.replace('\\', '\\\\')
+            with profiler.span("javascript"):
+                self.web_view.page().runJavaScript(f"drawPolyline('{safe_poly}');")
 
-            # B. GOOGLE SCAN
-            import time
-            radius_m = int(scan_radius_km * 1000)
-            food_types = ['restaurant', 'cafe', 'bar', 'bakery', 'meal_takeaway', 'meal_delivery', 'food']
-            
-            log_info(f"📡 Scanez Google în {len(scan_points)} puncte (Detalii în Fișier Log)...")
-            
-            # --- LOG DOAR ÎN FIȘIER ---
-            log_file_only(f"\n--- SCANARE GOOGLE ({len(scan_points)} puncte) ---")
-            
-            for sp_idx, sp in enumerate(scan_points):
-                log_file_only(f"\n📍 PUNCT SCANARE {sp_idx+1}/{len(scan_points)} ({sp})")
-                
-                for kw in keywords:
-                    try:
-                        res = gmaps_client.places_nearby(location=sp, radius=radius_m, keyword=kw, language='ro')
-                        results = res.get('results', [])
-                        
-                        if not results:
-                            log_file_only(f"   ❓ Keyword '{kw}': 0 rezultate.")
-                            continue
-                            
-                        log_file_only(f"   🔎 Keyword '{kw}': {len(results)} candidați brut.")
-                        # --- HEADER TABEL ACTUALIZAT ---
-                        log_file_only(f"      {'NUME':<32} | {'RAT.':<4} | {'VOTURI':<6} | {'ABATERE':<10} | {'STATUS'}")
-                        log_file_only("      " + "-"*90)
-                        
-                        for p in results:
-                            pid = p['place_id']
-                            if pid in found_places: continue
-                            
-                            lat = p['geometry']['location']['lat']; lng = p['geometry']['location']['lng']
-                            rating = p.get('rating', 0)
-                            reviews = p.get('user_ratings_total', 0)
-                            types = p.get('types', [])
-                            name_str = (p['name'][:30] + '..') if len(p['name']) > 30 else p['name']
-                            
-                            # Calculăm ABATEREA FAȚĂ DE DRUM
-                            min_dev = 99999
-                            for pp in path_points[::10]: 
-                                d = haversine_distance(pp[0], pp[1], lat, lng)
-                                if d < min_dev: min_dev = d
-
-                            # Determinare Status
-                            status = ""
-                            
-                            # 1. Filtru Calitate
-                            is_food = any(t in types for t in food_types)
-                            if is_food and rating < 4.0:
-                                status = f"❌ SKIP CALITATE ({rating}<4.0)"
-                                # Scriem în log chiar dacă e skip
-                                log_file_only(f"      {name_str:<32} | {rating:<4} | {reviews:<6} | {int(min_dev)}m{' ':<8} | {status}")
-                                continue
-                            
-                            # 2. Filtru Distanță
-                            if min_dev <= dev_google_m:
-                                status = "✅ ACCEPTAT"
-                                found_places[pid] = {
-                                    'place_id': pid, 'name': p['name'], 'lat': lat, 'lng': lng,
-                                    'rating': rating, 'user_ratings_total': reviews,
-                                    'types': types, 'is_custom': False,
-                                    'vicinity': p.get('vicinity', ''),
-                                    'opening_hours': p.get('opening_hours', {}),
-                                    'geometry': p['geometry'] 
-                                }
-                            else:
-                                status = f"❌ SKIP DIST. (> {int(dev_google_m)}m)"
-                            
-                            # Scriem rândul în tabel
-                            log_file_only(f"      {name_str:<32} | {rating:<4} | {reviews:<6} | {int(min_dev)}m{' ':<8} | {status}")
-
-                    except Exception as e:
-                        log_error(f"Err scan '{kw}': {e}")
-                
-                time.sleep(0.5)
+            if not self.confirm_scan_budget(scan_engine.estimate_corridor_cost(params, plan)):
+                return
 
-            log_info(f"\n📊 TOTAL ACCEPTATE: {len(found_places)}")
+            with profiler.span("engine"):
+                found_places = scan_engine.scan_corridor(params, plan).places
             self.results_tabs.setCurrentIndex(0) 
             self.results_tabs.setTabText(0, f"📋 Rezultate ({len(found_places)})")
             
             visual_list = []
-            for pid, data in found_places.items():
-                if is_linear_mode:
-                    linear_places_coords[pid] = {'lat': data['lat'], 'lng': data['lng'], 'name': data['name']}
-                self.create_place_card(data, distance_info=None)
-                visual_list.append(data)
+            with profiler.span("widgets"):
+                for pid, data in found_places.items():
+                    if is_linear_mode:
+                        place_repo.remember_coords(pid, data['lat'], data['lng'], data['name'])
+                    self.create_place_card(data, distance_info=None)
+                    visual_list.append(data)
 
             js_code = f"addHotspotMarkers({json.dumps(visual_list)});"
-            self.web_view.page().runJavaScript(js_code)
+            with profiler.span("javascript"):
+                self.web_view.page().runJavaScript(js_code)
             self.show_hotspots_checkbox.setChecked(True)
 
         except Exception as e:
             log_error(f"CRASH LINIAR: {e}")
             traceback.print_exc()
         finally:
-            if current_log_filename:
-                write_to_file("LOG ENDED.")
-                current_log_filename = None
+            profiler.finish(prof)
+            end_log_file()
             if isinstance(sender_btn, QPushButton):
                 sender_btn.setEnabled(True)
                 sender_btn.setText(original_text)
@@ -5760,43 +5949,69 @@ class MainWindow(QMainWindow):
     def on_results_tab_clicked(self, index):
         # Index 0 este tab-ul de Rezultate
         if index == 0:
-            global current_search_results, current_distance_info
-            
             # Dacă avem rezultate stocate în memorie (cele 17), le redesenăm
-            if current_search_results:
+            results = place_repo.search_results()
+            if results:
                 log_info("[V46] Restaurare listă completă de rezultate...")
                 self.clear_results()
                 
                 # Reconstruim lista
-                for place in current_search_results:
-                    self.create_place_card(place, current_distance_info)
+                distance_info = place_repo.distance_info()
+                for place in results:
+                    self.create_place_card(place, distance_info)
                     
                 # Re-adăugăm eventualele headere dacă a fost o scanare (Opțional, dar cardurile sunt baza)
                 # Dacă lista a venit din scanare, ea conține deja tot ce trebuie.
 
     def closeEvent(self, event):
+        if getattr(self, 'history_batch_cancel', None):
+            self.history_batch_cancel.set()
+        self.state_save_timer.stop()
         self.save_state()
+        self.state_store.close()
+        geocode_cache.save()
+        ai_cache.flush()
+        api_governor.flush()
+        summary = http_transport.summary()
+        if summary:
+            log_file_only(f"Latențe HTTP pe endpoint:\n{summary}")
+        if metrics.totals()['calls']:
+            try:
+                metrics.export(os.path.join(application_path, "Logs", "metrics_last_session.csv"))
+            except OSError as e:
+                print(f"Eroare export metrici: {e}")
+        log_writer.flush()
         event.accept()
 
 
+startup.checkpoint("configurare, clienți, cache-uri")
+
+
+def report_pruned_logs(removed):
+    if removed:
+        print(f"[INIT] {removed} loguri mai vechi de {LOG_RETENTION_DAYS} zile au fost șterse.")
+
+
 def main():
-    # --- CURĂȚARE LOGURI VECHI ---
     log_dir = os.path.join(application_path, "Logs")
-    if os.path.exists(log_dir):
-        try:
-            shutil.rmtree(log_dir) # Șterge tot folderul
-            print(f"[INIT] Folderul Logs a fost golit.")
-        except Exception as e:
-            print(f"[INIT] Nu s-a putut goli folderul Logs: {e}")
-    
-    # Recreăm folderul gol
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    # -----------------------------
+    os.makedirs(log_dir, exist_ok=True)
+    # --- CURĂȚARE LOGURI VECHI (retenție, nu golire), în fundal: logurile noi nu sunt atinse ---
+    startup.background("curățare loguri vechi",
+                       lambda: prune_logs(log_dir, retention_days=LOG_RETENTION_DAYS), on_done=report_pruned_logs)
 
     app = QApplication(sys.argv)
+    startup.checkpoint("QApplication")
+    ensure_api_key()
+    startup.checkpoint("cheie API")
     window = MainWindow()
+    startup.checkpoint("construire fereastră (widget-uri, stare)")
     window.show()
+    # Primul cadru se desenează înainte de inițializările amânate (hartă, clienți, strat custom)
+    app.processEvents()
+    startup.checkpoint("afișare fereastră")
+    startup.window_visible()
+    window.finish_startup()
+    startup.arm()
     sys.exit(app.exec())
 
 
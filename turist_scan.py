@@ -0,0 +1,409 @@
+"""
+turist-scan: scanări fără interfață grafică, pentru mai multe orașe/trasee în paralel.
+
+Exemple:
+    python turist_scan.py area "Brașov" "Sibiu" "45.7489,21.2087" --radius-km 2 --workers 3
+    python turist_scan.py corridor "București" "Brașov" --keywords "castel,mănăstire,muzeu"
+    python turist_scan.py batch destinatii.json --workers 4
+
+Fiecare țintă rulează într-un proces separat, cu clientul și guvernatorul de cotă proprii;
+răspunsurile Google se păstrează într-un cache SQLite comun tuturor proceselor.
+Pentru fiecare țintă se scriu în directorul --out: rezultatul scanării (<nume>.json),
+traseul gata de încărcat în aplicație (<nume>.route.json), logul (<nume>.log)
+și deciziile pe candidați (<nume>.events.jsonl, vezi scan_query.py).
+
+Fișierul pentru 'batch' e o listă JSON de ținte; câmpurile lipsă iau valorile din linia de comandă:
+    [
+      {"center": "Brașov", "radius_km": 2},
+      {"name": "timisoara", "center": "45.7489,21.2087", "v1": 10},
+      {"start": "București", "end": "Sibiu", "keywords": ["castel", "mănăstire"]}
+    ]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import concurrent.futures
+
+import googlemaps
+from dotenv import load_dotenv
+
+from app_logging import log_writer
+from http_transport import HttpTransport
+from api_governor import QuotaGovernor, DEFAULT_QPS
+from maps_gateway import MapsGateway
+from response_cache import ResponseCache
+from categories import CATEGORIES_MAP, CategoryIndex
+from scan_engine import ScanEngine, ScanLog, AreaScanParams, CorridorScanParams
+from scan_log import ScanEventLog
+from route_io import route_payload, place_entry, write_route_file
+from place_lookup import normalize_name
+from replay_transport import ApiMode
+from state_store import StateStore
+from profiler import profiler
+from metrics import metrics
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Parametrii care pot fi dați per țintă în fișierul de lot (altfel vin din linia de comandă)
+AREA_OPTIONS = ('radius_km', 'min_reviews', 'v1', 'v3', 'no_v1', 'no_v2', 'no_v3')
+CORRIDOR_OPTIONS = ('keywords', 'step_km', 'corridor_radius_km', 'max_deviation_m')
+
+
+class FileScanLog(ScanLog):
+    """
+    Mesajele scurte în consolă (cu numele țintei), totul în fișierul de log al țintei;
+    deciziile pe candidați în <nume>.events.jsonl (interogabil cu scan_query.py).
+    """
+    def __init__(self, label, path, events):
+        self.label = label
+        self.path = path
+        self.events = events
+
+    def _write(self, tag, message):
+        log_writer.write(self.path, message, tag)
+
+    def close(self):
+        # Procesele din pool se termină fără atexit: logul se golește explicit
+        log_writer.close_file(self.path)
+        log_writer.flush()
+
+    def _both(self, tag, message):
+        print(f"[{self.label}] [{tag}] {str(message).strip()}", flush=True)
+        self._write(tag, message)
+
+    def info(self, message): self._both("INFO", message)
+    def success(self, message): self._both("SUCCESS", message)
+    def warning(self, message): self._both("WARNING", message)
+    def error(self, message): self._both("ERROR", message)
+    def detail(self, message): self._write("DATA", message)
+    def begin(self, mode, **fields): self.events.begin(mode, target=self.label, **fields)
+    def event(self, event, **fields): self.events.record(event, **fields)
+    def end(self, **fields): self.events.end(**fields)
+
+
+def slugify(text):
+    """Nume de fișier din numele țintei: 'Brașov' -> 'brasov'."""
+    return re.sub(r'[^a-z0-9]+', '_', normalize_name(text)).strip('_')[:60] or "scan"
+
+
+def parse_coordinates(text):
+    try:
+        lat, lng = [float(x.strip()) for x in text.split(',')]
+        return lat, lng
+    except ValueError:
+        return None
+
+
+# Fișierul vechi de stare (un JSON rescris la închidere), citit doar dacă aplicația nu are încă app_state.db
+LEGACY_STATE_FILE = "app_state.json"
+
+
+def read_state(state_path):
+    """Starea salvată de aplicație: din app_state.db (StateStore) sau, ca rezervă, din vechiul app_state.json."""
+    if state_path.endswith(".json"):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f), state_path
+    if os.path.exists(state_path):
+        store = StateStore(state_path)
+        try:
+            return store.load(), state_path
+        finally:
+            store.close()
+    legacy = os.path.join(os.path.dirname(state_path), LEGACY_STATE_FILE)
+    if os.path.exists(legacy):
+        print(f"⚠️ {state_path} lipsește; setările vin din formatul vechi {legacy} (pot fi depășite).")
+        with open(legacy, 'r', encoding='utf-8') as f:
+            return json.load(f), legacy
+    return None, None
+
+
+def load_app_settings(state_path):
+    """Setările de diversitate și ponderile scorului salvate de aplicație (dacă există)."""
+    if not state_path:
+        return {}
+    try:
+        state, source = read_state(state_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Starea aplicației nu se poate citi ({state_path}): {e}; folosesc setările implicite.")
+        return {}
+    if not state:
+        print(f"⚠️ Nu există stare salvată a aplicației ({state_path}); folosesc setările implicite.")
+        return {}
+    settings = {k: state[k] for k in ('diversity_settings', 'ranking_weights') if state.get(k)}
+    print(f"Setări de scanare din {source}: {', '.join(settings) or 'implicite'}")
+    return settings
+
+
+def build_engine(opts, log):
+    """Client + guvernator proprii procesului: QPS-ul e împărțit între procese, bugetul între ținte."""
+    transport = HttpTransport()
+    transport.add_observer(profiler.record_io)
+    governor = QuotaGovernor(None, qps={k: max(1, v * opts['qps_share']) for k, v in DEFAULT_QPS.items()},
+                             daily_cap_usd=opts['budget_usd'])
+    # TURIST_API_MODE=record/replay: vezi replay_transport.py
+    client = ApiMode(APP_DIR).maps_client(
+        lambda: googlemaps.Client(key=opts['api_key'], requests_session=transport.session,
+                                  retry_timeout=30, retry_over_query_limit=True))
+    cache = ResponseCache(opts['cache']) if opts.get('cache') else None
+    gateway = MapsGateway(client, governor, cache=cache, metrics=metrics)
+    if cache is not None:
+        metrics.register_cache("response_cache", cache.stats)
+    return ScanEngine(gateway, CategoryIndex(CATEGORIES_MAP), log=log), governor
+
+
+def area_route(result):
+    """Traseul circular: selecțiile în ordinea în care le-ar adăuga aplicația, cu aceleași etichete."""
+    places = []
+    for tag, cand in result.picks:
+        pid = cand['place_id']
+        if cand['is_custom']:
+            name = result.coords[pid]['name']
+            website = None
+        else:
+            name = f"[{tag}] {cand['name']}"
+            website = result.details.get(pid, ("", ""))[0] or None
+        places.append(place_entry(pid, name, website=website, lat=cand['lat'], lng=cand['lng']))
+    return route_payload("circular", places)
+
+
+def corridor_route(result):
+    """Traseul liniar: locurile acceptate, în ordinea de pe drum."""
+    places = [place_entry(p['place_id'], p['name'], p.get('vicinity', ''), lat=p['lat'], lng=p['lng'])
+              for p in result.ordered_places()]
+    return route_payload("linear", places)
+
+
+def run_job(job):
+    """Rulează într-un proces separat: scanarea unei ținte + fișierele ei de rezultat."""
+    out = job['opts']['out']
+    events = ScanEventLog(out, filename=f"{job['name']}.events.jsonl")
+    log = FileScanLog(job['label'], os.path.join(out, f"{job['name']}.log"), events)
+    # Procesele din pool se refolosesc între ținte: metricile pornesc de la zero pentru fiecare
+    metrics.reset()
+    try:
+        # Profilul pe faze al țintei ajunge la finalul logului ei
+        with profiler.session(job['name']) as prof:
+            outcome = scan_job(job, log)
+        log.detail("\n" + prof.summary())
+        return outcome
+    finally:
+        log.close()
+
+
+def scan_job(job, log):
+    opts = job['opts']
+    engine, governor = build_engine(opts, log)
+    base = os.path.join(opts['out'], job['name'])
+
+    if job['kind'] == 'area':
+        center = parse_coordinates(job['center'])
+        if center is None:
+            found = engine.gmaps.geocode(job['center'], language=opts['language'])
+            if not found:
+                log.error(f"Locație negăsită: {job['center']}")
+                return job['label'], None, governor.stats()
+            loc = found[0]['geometry']['location']
+            center = (loc['lat'], loc['lng'])
+
+        params = AreaScanParams(center, radius_m=int(job['radius_km'] * 1000), min_reviews=job['min_reviews'],
+                                limit_v1=job['v1'], limit_v3=job['v3'],
+                                use_v1=not job['no_v1'], use_v2=not job['no_v2'], use_v3=not job['no_v3'],
+                                diversity_settings=opts.get('diversity_settings'),
+                                ranking_weights=opts.get('ranking_weights'), language=opts['language'])
+        result = engine.scan_area(params)
+        write_route_file(base + ".json", dict(result.to_dict(), target=job['center'], center=center, radius_m=params.radius_m))
+        route = area_route(result)
+    else:
+        params = CorridorScanParams(job['start'], job['end'], job['keywords'], step_km=job['step_km'],
+                                    radius_km=job['corridor_radius_km'], max_deviation_m=job['max_deviation_m'],
+                                    language=opts['language'])
+        plan = engine.plan_corridor(params)
+        if plan is None:
+            log.error("Nu s-a găsit traseu.")
+            return job['label'], None, governor.stats()
+        result = engine.scan_corridor(params, plan)
+        write_route_file(base + ".json", dict(result.to_dict(), start=job['start'], end=job['end']))
+        route = corridor_route(result)
+
+    write_route_file(base + ".route.json", route)
+    metrics.export(base + ".metrics.prom")
+    if engine.gmaps.cache is not None:
+        log.detail(f"Cache răspunsuri: {engine.gmaps.cache.stats()}")
+    return job['label'], base + ".route.json", governor.stats()
+
+
+def parse_keywords(value):
+    if isinstance(value, (list, tuple)):
+        return [k.strip() for k in value if k.strip()]
+    return [k.strip() for k in (value or "").split(',') if k.strip()]
+
+
+def area_job(center, defaults, overrides=None):
+    job = {'kind': 'area', 'center': center, 'label': center, 'name': slugify(center)}
+    job.update({k: defaults[k] for k in AREA_OPTIONS})
+    job.update(overrides or {})
+    return job
+
+
+def corridor_job(start, end, defaults, overrides=None):
+    label = f"{start} -> {end}"
+    job = {'kind': 'corridor', 'start': start, 'end': end, 'label': label, 'name': slugify(f"{start}_{end}")}
+    job.update({k: defaults[k] for k in CORRIDOR_OPTIONS})
+    job.update(overrides or {})
+    job['keywords'] = parse_keywords(job['keywords'])
+    return job
+
+
+def load_batch_file(path, defaults):
+    """Țintele din fișierul de lot: 'center' -> scanare circulară, 'start' + 'end' -> coridor."""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("Fișierul de lot trebuie să conțină o listă JSON de ținte.")
+
+    jobs = []
+    for i, entry in enumerate(entries):
+        overrides = {k: v for k, v in entry.items() if k in AREA_OPTIONS + CORRIDOR_OPTIONS}
+        if 'name' in entry:
+            overrides['name'] = slugify(str(entry['name']))
+        # În fișier, raza coridorului se poate da simplu ca 'radius_km'
+        if 'start' in entry and 'radius_km' in entry:
+            overrides['corridor_radius_km'] = overrides.pop('radius_km')
+        if 'center' in entry:
+            jobs.append(area_job(str(entry['center']), defaults, overrides))
+        elif 'start' in entry and 'end' in entry:
+            jobs.append(corridor_job(str(entry['start']), str(entry['end']), defaults, overrides))
+        else:
+            raise ValueError(f"Ținta {i + 1} nu are nici 'center', nici 'start' + 'end'.")
+
+    # Nume unice (două ținte cu același nume și-ar suprascrie fișierele)
+    seen = {}
+    for job in jobs:
+        n = seen.get(job['name'], 0)
+        seen[job['name']] = n + 1
+        if n:
+            job['name'] = f"{job['name']}_{n + 1}"
+    return jobs
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--out", default=os.path.join(APP_DIR, "Scans"), help="directorul pentru rezultate și loguri")
+    common.add_argument("--workers", type=int, default=4, help="procese în paralel (implicit 4)")
+    common.add_argument("--budget", type=float, default=5.0, help="buget total în USD, împărțit egal între ținte")
+    common.add_argument("--language", default="ro")
+    common.add_argument("--state", default=os.path.join(APP_DIR, "app_state.db"),
+                        help="starea aplicației (app_state.db; un .json e citit în formatul vechi) din care "
+                             "se iau setările de diversitate și ponderile scorului")
+    common.add_argument("--cache", default=os.path.join(APP_DIR, "response_cache.sqlite"),
+                        help="cache-ul SQLite de răspunsuri, comun tuturor proceselor")
+    common.add_argument("--no-cache", action="store_true", help="fără cache de răspunsuri")
+
+    area_opts = argparse.ArgumentParser(add_help=False)
+    area_opts.add_argument("--radius-km", type=float, default=1.5)
+    area_opts.add_argument("--min-reviews", type=int, default=500)
+    area_opts.add_argument("--v1", type=int, default=15, help="limita pentru vedete (V1)")
+    area_opts.add_argument("--v3", type=int, default=3, help="limita pentru populare (V3)")
+    area_opts.add_argument("--no-v1", action="store_true")
+    area_opts.add_argument("--no-v2", action="store_true")
+    area_opts.add_argument("--no-v3", action="store_true")
+
+    corridor_opts = argparse.ArgumentParser(add_help=False)
+    corridor_opts.add_argument("--keywords", default="", help="cuvinte cheie separate prin virgulă")
+    corridor_opts.add_argument("--step-km", type=float, default=10.0)
+    corridor_opts.add_argument("--corridor-radius-km", type=float, default=7.0)
+    corridor_opts.add_argument("--max-deviation-m", type=float, default=100.0)
+
+    parser = argparse.ArgumentParser(prog="turist-scan", description="Scanări Turist Pro fără interfață grafică.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    area = sub.add_parser("area", parents=[common, area_opts], help="scanare circulară în jurul unor orașe sau coordonate")
+    area.add_argument("targets", nargs="+", help="nume de locații sau coordonate 'lat,lng'")
+
+    corridor = sub.add_parser("corridor", parents=[common, corridor_opts],
+                              help="scanare pe coridor (traseu A -> B); se pot da mai multe perechi")
+    corridor.add_argument("points", nargs="+", help="START END [START END ...]")
+
+    batch = sub.add_parser("batch", parents=[common, area_opts, corridor_opts],
+                           help="ținte mixte (circular/coridor) dintr-un fișier JSON")
+    batch.add_argument("file", help="lista JSON de ținte")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    defaults = vars(args)
+
+    load_dotenv(dotenv_path=os.path.join(APP_DIR, '.env'))
+    api_mode = ApiMode(APP_DIR)
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key and api_mode.mode != 'replay':
+        print("Lipsește GOOGLE_API_KEY (în mediu sau în .env).", file=sys.stderr)
+        return 2
+    if api_mode.mode != 'live':
+        print(f"Mod API: {api_mode.describe()}")
+
+    if args.command == "area":
+        jobs = [area_job(target, defaults) for target in args.targets]
+    elif args.command == "corridor":
+        if len(args.points) % 2:
+            print("Punctele de coridor se dau în perechi START END.", file=sys.stderr)
+            return 2
+        jobs = [corridor_job(start, end, defaults) for start, end in zip(args.points[::2], args.points[1::2])]
+    else:
+        try:
+            jobs = load_batch_file(args.file, defaults)
+        except (OSError, ValueError) as e:
+            print(f"Fișier de lot invalid: {e}", file=sys.stderr)
+            return 2
+
+    for job in jobs:
+        if job['kind'] == 'corridor' and not job['keywords']:
+            print(f"{job['label']}: lipsesc cuvintele cheie (--keywords).", file=sys.stderr)
+            return 2
+    if not jobs:
+        print("Nicio țintă de scanat.", file=sys.stderr)
+        return 2
+
+    workers = max(1, min(args.workers, len(jobs)))
+    if api_mode.mode == 'record' and workers > 1:
+        # Un singur proces scrie în fixture store (adăugările din procese diferite s-ar putea amesteca)
+        print("Mod record: scanez cu un singur proces.")
+        workers = 1
+    os.makedirs(args.out, exist_ok=True)
+    opts = {'api_key': api_key, 'out': args.out, 'language': args.language,
+            'qps_share': 1.0 / workers, 'budget_usd': args.budget / len(jobs),
+            # La înregistrare fiecare cerere trebuie să ajungă în fixture store (un hit din cache
+            # n-ar fi înregistrat), iar la redare răspunsurile vin din fixture-uri
+            'cache': None if args.no_cache or api_mode.mode != 'live' else args.cache}
+    opts.update(load_app_settings(args.state))
+    if opts['cache']:
+        ResponseCache(opts['cache']).purge()  # creează schema o dată, înainte de procese
+    for job in jobs:
+        job['opts'] = opts
+
+    failed = 0
+    spent = 0.0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for fut in concurrent.futures.as_completed(futures):
+            try:
+                label, path, usage = fut.result()
+            except Exception as e:
+                print(f"[EROARE] {e}", file=sys.stderr)
+                failed += 1
+                continue
+            spent += usage['spent_usd']
+            if path is None:
+                failed += 1
+            else:
+                print(f"✅ {label}: {path}")
+
+    print(f"Gata: {len(jobs) - failed}/{len(jobs)} reușite, cost estimat {spent:.2f} USD.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())